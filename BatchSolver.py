@@ -0,0 +1,147 @@
+'''
+This module solves many problems in one run, instead of starting PegSolitaireSolver.py once for every problem. The problems are read one at a time from a
+directory (every .txt file), from a file that holds several problems separated by empty lines or from the standard input, and are solved by a pool of worker
+processes that each keep one warm Solver. A JSON line with the moves, the status, the time and the nodes of every problem is written as soon as it is solved
+(in the order the problems were read), and only a few problems per worker are read ahead, so the memory does not grow with the size of the batch.
+'''
+
+import json
+import multiprocessing
+import os
+import sys
+from collections import deque
+from BitBoard import Board, parseBoard, boardLines
+from BinaryFormat import BoardFile, fileKind
+
+#The Solver, strategy and limits of each worker process, set once by initWorker.
+worker = {}
+
+'''
+This function splits a stream of lines into problems. Problems are separated by one or more empty lines.
+
+Input:  [lines] Iterable of the lines of the stream.
+
+Output: Generator of the lists of lines of each problem.
+'''
+
+def splitProblems(lines):
+    problem = []
+    for line in lines:
+        if line.strip():
+            problem.append(line.rstrip('\r\n') + '\n')
+        elif problem:
+            yield problem
+            problem = []
+    if problem:
+        yield problem
+
+'''
+This function reads the problems of a source one at a time.
+
+Input:  [source] Path of a directory, of a file with one or more problems (in text or in a file of boards, see BinaryFormat.py), or - for the
+                 standard input.
+
+Output: Generator of (name, lines) tuples, where name is the file name (followed by the number of the problem in the file when it holds more than one).
+'''
+
+def readProblems(source):
+    if source == '-':
+        for index, problem in enumerate(splitProblems(sys.stdin)):
+            yield 'stdin:' + str(index + 1), problem
+    elif os.path.isdir(source):
+        for name in sorted(os.listdir(source)):
+            if name.endswith('.txt'):
+                with open(os.path.join(source, name)) as f:
+                    for index, problem in enumerate(splitProblems(f)):
+                        yield (name if index == 0 else name + ':' + str(index + 1)), problem
+    elif fileKind(source) == 'boards':
+        for index, board in enumerate(BoardFile(source)):
+            yield os.path.basename(source) + ':' + str(index + 1), boardLines(board)
+    else:
+        with open(source) as f:
+            for index, problem in enumerate(splitProblems(f)):
+                yield os.path.basename(source) + ':' + str(index + 1), problem
+
+'''
+This function initializes a worker process of the pool.
+
+Input:  [solver] The Solver of the batch.
+        [strategy] Name of the solver (depth, area, manhattan or rating).
+        [limits] Limits of each solve.
+'''
+
+def initWorker(solver,strategy,limits):
+    worker['solver'] = solver
+    worker['strategy'] = strategy
+    worker['limits'] = limits
+
+'''
+This function solves one problem of the batch.
+
+Input:  [task] Tuple (name, lines) of the problem.
+
+Output: Dictionary with the name, the status (solved, unsolvable, exhausted, stopped or error), the moves, the time and the nodes of the solve, or with
+        the error when the problem cannot be read or the solve fails.
+'''
+
+def solveProblem(task):
+    name,lines = task
+    try:
+        board = Board(*parseBoard(lines))
+    except ValueError as error:
+        return {'name': name, 'status': 'error', 'error': "Invalid problem: " + str(error)}
+    #A problem the solver fails on gets an error record too, so it does not stop the rest of the batch.
+    try:
+        result = worker['solver'].solve(board, worker['strategy'], worker['limits'])
+    except Exception as error:
+        return {'name': name, 'status': 'error', 'error': "%s: %s" % (type(error).__name__, error)}
+    record = {'name': name, 'status': result.status, 'moves': result.moves, 'seconds': result.seconds, 'nodes': result.stats['misses']}
+    if result.prunes is not None:
+        record['prunes'] = result.prunes
+    if result.status in ('stopped', 'exhausted'):
+        record['reason'] = result.reason
+        record['partial'] = result.partial
+        record['pegsLeft'] = result.pegsLeft
+    return record
+
+'''
+This function solves all the problems of a source and writes a JSON line for each of them.
+
+Input:  [source] Path of a directory, of a file with one or more problems, or - for the standard input.
+        [output] File object where the JSON lines are written.
+        [solver] The Solver of the batch.
+        [strategy] Name of the solver (depth, area, manhattan or rating).
+        [limits] Limits of each solve.
+        [workers] Number of worker processes (1 solves the problems in this process).
+
+Output: Dictionary with the number of problems of each status.
+'''
+
+def solveBatch(source,output,solver,strategy,limits=None,workers=1):
+    counts = {}
+
+    def write(record):
+        output.write(json.dumps(record) + '\n')
+        output.flush()
+        counts[record['status']] = counts.get(record['status'], 0) + 1
+
+    if workers <= 1:
+        initWorker(solver,strategy,limits)
+        for task in readProblems(source):
+            write(solveProblem(task))
+        return counts
+
+    pool = multiprocessing.Pool(workers, initializer=initWorker, initargs=(solver,strategy,limits))
+    try:
+        #Keep every worker busy with one more problem waiting for each of them, and write the results in the order the problems were read.
+        pending = deque()
+        for task in readProblems(source):
+            pending.append(pool.apply_async(solveProblem, (task,)))
+            if len(pending) >= 2*workers:
+                write(pending.popleft().get())
+        while pending:
+            write(pending.popleft().get())
+    finally:
+        pool.terminate()
+        pool.join()
+    return counts
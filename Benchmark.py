@@ -0,0 +1,207 @@
+'''
+This program benchmarks the solvers on the corpus of boards in the boards directory (or on the given problem files). Every problem is solved by every given
+algorithm in a separate process, first a number of warmup runs that are not recorded and then a number of measured runs. For each problem and algorithm it
+records the wall time of the runs, the time the solver itself reports, the nodes it expanded (the new boards stored in its memory), the nodes per second, the
+peak memory of the solver process and whether a solution was found, and writes them to a JSON file. The file is written with sorted keys and one value per
+line, so the files of two commits can be compared with diff, or with the --baseline option which prints the results that got worse.
+
+The corpus holds the English (33 holes) and French (37 holes) boards, a triangular board drawn on the square grid and the 13 puzzles of the presentation
+(Cross, Triangle, Pointer, Flag, Ring, Square 6x6, English, Target, Letter X, French, German, Asymmetrical and Diamond). The presentation only shows the
+puzzles as pictures, so the smaller ones were redrawn on the English board with the same names and a starting position that can be solved.
+
+Usage: python Benchmark.py [--algorithms depth,area,...] [--warmup 1] [--repeats 3] [--timeout 60] [--output benchmark.json] [--baseline old.json]
+                           [--solver-args "--prune"] [problem1.txt ...]
+'''
+
+import argparse
+import json
+import os
+import platform
+import re
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+#The arguments of PegSolitaireSolver.py for each algorithm.
+ALGORITHMS = {'depth': ['depth'],
+              'area': ['best'],
+              'manhattan': ['best', 'manhattan'],
+              'rating': ['best', 'rating'],
+              'learned': ['best', 'learned'],
+              'portfolio': ['portfolio'],
+              'area-best-first': ['best', '--search', 'best-first'],
+              'manhattan-best-first': ['best', 'manhattan', '--search', 'best-first'],
+              'rating-best-first': ['best', 'rating', '--search', 'best-first'],
+              'area-astar': ['best', '--search', 'astar'],
+              'manhattan-astar': ['best', 'manhattan', '--search', 'astar'],
+              'rating-astar': ['best', 'rating', '--search', 'astar']}
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+SOLVER = os.path.join(ROOT, 'PegSolitaireSolver.py')
+CORPUS = os.path.join(ROOT, 'boards')
+
+'''
+This function solves a problem with PegSolitaireSolver.py in a separate process and collects its statistics.
+
+Input:  [inputFile] Path of the file that contains the problem.
+        [algorithm] Name of the algorithm (one of the keys of ALGORITHMS).
+        [solverArgs] List of extra arguments for the solver.
+        [timeout] Number of seconds after which the solver is stopped.
+
+Output: Dictionary with the wall time, the time reported by the solver, the nodes, the peak memory (in KB), whether a solution was found and whether
+        the solver was stopped.
+'''
+
+def runSolver(inputFile, algorithm, solverArgs, timeout):
+    handle, outputFile = tempfile.mkstemp(suffix='.txt')
+    os.close(handle)
+    command = [sys.executable, SOLVER] + ALGORITHMS[algorithm][:1] + [inputFile, outputFile] + ALGORITHMS[algorithm][1:] + solverArgs
+    with tempfile.TemporaryFile(mode='w+') as log:
+        start = time.perf_counter()
+        process = subprocess.Popen(command, stdout=log, stderr=subprocess.DEVNULL, universal_newlines=True)
+        #wait4 returns the resource usage of this process alone, so the peak memory of each solve is measured separately.
+        timedOut = False
+        while True:
+            pid, status, usage = os.wait4(process.pid, os.WNOHANG)
+            if pid:
+                break
+            if time.perf_counter() - start > timeout:
+                process.kill()
+                _, status, usage = os.wait4(process.pid, 0)
+                timedOut = True
+                break
+            time.sleep(0.005)
+        wallTime = time.perf_counter() - start
+        process.returncode = status
+        log.seek(0)
+        output = log.read()
+    os.remove(outputFile)
+
+    #A solver that is stopped by a limit writes its best partial solution, so only the status line tells a solution apart.
+    solved = re.search(r'^Status: solved', output, re.M)
+    result = {'wallTime': wallTime, 'peakKB': usage.ru_maxrss, 'solved': solved is not None and not timedOut, 'timeout': timedOut}
+    seconds = re.search(r'^([0-9.e-]+) seconds', output, re.M)
+    memory = re.search(r'Memory: (\d+) hits, (\d+) misses, (\d+) evictions, (\d+) boards stored', output)
+    result['solveTime'] = float(seconds.group(1)) if seconds and not timedOut else None
+    result['nodes'] = int(memory.group(2)) if memory and not timedOut else None
+    return result
+
+'''
+This function runs the warmup and the measured runs of a problem and summarizes them.
+
+Input:  [inputFile] Path of the file that contains the problem.
+        [algorithm] Name of the algorithm (one of the keys of ALGORITHMS).
+        [args] The arguments of the program.
+
+Output: Dictionary with the median and the smallest wall time, the median solver time, the nodes, the nodes per second, the largest peak memory,
+        whether every run found a solution and the measured runs.
+'''
+
+def benchmark(inputFile, algorithm, args):
+    solverArgs = args.solver_args.split()
+    for _ in range(args.warmup):
+        runSolver(inputFile, algorithm, solverArgs, args.timeout)
+    runs = [runSolver(inputFile, algorithm, solverArgs, args.timeout) for _ in range(args.repeats)]
+
+    summary = {'wallTime': statistics.median(run['wallTime'] for run in runs),
+               'minWallTime': min(run['wallTime'] for run in runs),
+               'peakKB': max(run['peakKB'] for run in runs),
+               'solved': all(run['solved'] for run in runs),
+               'timeout': any(run['timeout'] for run in runs),
+               'nodes': runs[-1]['nodes'],
+               'solveTime': None,
+               'nodesPerSecond': None,
+               'runs': runs}
+    if not summary['timeout']:
+        summary['solveTime'] = statistics.median(run['solveTime'] for run in runs)
+        if summary['solveTime'] > 0:
+            summary['nodesPerSecond'] = summary['nodes'] / summary['solveTime']
+    return summary
+
+'''
+This function compares the results with the ones of a previous benchmark file and returns a line for every result that got worse: a problem that is not
+solved any more, a different number of nodes or a median wall time that grew by more than the tolerance.
+
+Input:  [results] Dictionary of the results (problem --> algorithm --> summary).
+        [baseline] Dictionary of the results of the previous file.
+        [tolerance] Allowed growth of the wall time (0.2 for 20%).
+
+Output: List of strings.
+'''
+
+def regressions(results, baseline, tolerance):
+    lines = []
+    for problem in sorted(results):
+        for algorithm in sorted(results[problem]):
+            old = baseline.get(problem, {}).get(algorithm)
+            new = results[problem][algorithm]
+            if old is None:
+                continue
+            if old['solved'] and not new['solved']:
+                lines.append("%s %s: not solved any more" % (problem, algorithm))
+            if old['nodes'] is not None and new['nodes'] is not None and old['nodes'] != new['nodes']:
+                lines.append("%s %s: %d nodes instead of %d" % (problem, algorithm, new['nodes'], old['nodes']))
+            if new['wallTime'] > old['wallTime'] * (1 + tolerance):
+                lines.append("%s %s: %.3f seconds instead of %.3f" % (problem, algorithm, new['wallTime'], old['wallTime']))
+    return lines
+
+'''
+This function returns the commit of the repository the solvers are run from, or None if it is not a git repository.
+'''
+
+def gitCommit():
+    try:
+        return subprocess.run(['git', 'rev-parse', 'HEAD'], cwd=ROOT, capture_output=True, universal_newlines=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Benchmarks the solvers on a corpus of boards and writes the results to a JSON file.")
+    parser.add_argument("problems", nargs="*", help="files that contain the problems (every file of the boards directory if omitted)")
+    parser.add_argument("--algorithms", default=",".join(ALGORITHMS), help="comma separated list of the algorithms (" + ", ".join(ALGORITHMS) + ")")
+    parser.add_argument("--warmup", type=int, default=1, help="number of runs of each problem that are not measured")
+    parser.add_argument("--repeats", type=int, default=3, help="number of measured runs of each problem")
+    parser.add_argument("--timeout", type=float, default=60, help="number of seconds after which a run is stopped")
+    parser.add_argument("--solver-args", default="", help="extra arguments for every run of the solver (e.g. \"--prune --symmetry\")")
+    parser.add_argument("--output", default="benchmark.json", help="file where the results are written")
+    parser.add_argument("--baseline", default=None, help="results of a previous benchmark to compare with")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="allowed growth of the wall time before it is reported as a regression")
+    args = parser.parse_args()
+    if args.repeats < 1:
+        parser.error("--repeats must be at least 1")
+    algorithms = args.algorithms.split(',')
+    for algorithm in algorithms:
+        if algorithm not in ALGORITHMS:
+            parser.error("unknown algorithm: " + algorithm)
+    problems = args.problems or sorted(os.path.join(CORPUS, name) for name in os.listdir(CORPUS) if name.endswith('.txt'))
+
+    results = {}
+    print("%-20s %-22s %10s %10s %12s %12s %10s %7s" % ("problem", "algorithm", "wall", "solver", "nodes", "nodes/s", "peak KB", "solved"))
+    for problem in problems:
+        name = os.path.splitext(os.path.basename(problem))[0]
+        results[name] = {}
+        for algorithm in algorithms:
+            summary = benchmark(problem, algorithm, args)
+            results[name][algorithm] = summary
+            print("%-20s %-22s %10.3f %10s %12s %12s %10d %7s" % (name, algorithm, summary['wallTime'],
+                  "timeout" if summary['timeout'] else "%.3f" % summary['solveTime'],
+                  "-" if summary['nodes'] is None else summary['nodes'],
+                  "-" if summary['nodesPerSecond'] is None else "%.0f" % summary['nodesPerSecond'],
+                  summary['peakKB'], "yes" if summary['solved'] else "no"), flush=True)
+
+    report = {'commit': gitCommit(), 'python': platform.python_version(), 'platform': platform.platform(), 'warmup': args.warmup,
+              'repeats': args.repeats, 'timeout': args.timeout, 'solverArgs': args.solver_args, 'results': results}
+    with open(args.output, 'w') as f:
+        json.dump(report, f, indent=1, sort_keys=True)
+        f.write('\n')
+
+    if args.baseline is not None:
+        with open(args.baseline) as f:
+            lines = regressions(results, json.load(f)['results'], args.tolerance)
+        for line in lines:
+            print(line)
+        if lines:
+            sys.exit(1)
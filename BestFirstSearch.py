@@ -0,0 +1,146 @@
+'''
+This module implements a global Best-First search and A* for the heuristics of the Best-First solvers. The solvers of PegSolitaireSolver.py sort the moves of
+each board and go down the best one, so a bad early choice is only revisited after its whole subtree is searched. Here every board that was generated but not
+yet expanded waits in one priority queue (a heapq), so the search always expands the best board found so far, wherever it is in the tree.
+
+The priority of a board is computed from the heuristic score h of the board and the number of moves g that led to it:
+    best-first --> h
+    astar      --> g + weight*h (weighted A* when weight is not 1)
+The area and manhattan scores are smaller for better boards and are used as they are. The rating is larger for better boards, so h is the negated rating.
+Ties are broken in favour of the deeper board, which is closer to a solution, and then in the order the boards were generated.
+
+Instead of copying the list of moves into every board of the queue, each board only stores its parent and the jump that led to it (the parents dictionary,
+which is also the memory of the search), and the solution is rebuilt by following the parents back to the starting board. The queue can be limited to a
+maximum number of boards. When it grows past it, the worst quarter of the boards is dropped, which bounds its memory but means the search may miss a
+solution that only a dropped board led to. The parents are counted against the same limit: when they grow past twice the limit times the number of pegs
+of the starting board, only the boards of the queue, the deepest board and their ancestors are kept. A board reaches the start in fewer moves than there
+are pegs, so that is about half of it, and the memory of the whole search stays within a number of boards proportional to the limit. A board whose
+parent entry was dropped is no longer known as a repeated board, so it may be searched again.
+'''
+
+import heapq
+from BitBoard import pegCount
+from Heuristics import scoreChildren
+from Budget import STOP_NODES
+
+SEARCH_MODES = ('best-first', 'astar')
+
+'''
+This function solves a problem with the global Best-First search or A*.
+
+Input:  [board] BoardGeometry of the problem.
+        [pegs] Integer bitmask of the pegs of the starting board.
+        [heuristic] Name of the heuristic (area, manhattan or rating).
+        [path] List of strings where the moves of the solution are stored.
+        [stats] Dictionary that is filled with the counters of the search (hits: repeated boards, misses: new boards, evictions: boards dropped from
+                the queue, size: boards stored).
+        [mode] best-first or astar.
+        [weight] Weight of the heuristic score for astar.
+        [frontierCap] Maximum number of boards in the queue (None for no limit). It also bounds the parents (see above).
+        [pruner] Pruner that cuts the boards that cannot be solved (None for no pruning).
+        [maxNodes] Maximum number of boards that are expanded before the search stops (None for no limit).
+        [stop] Watchdog that is checked every STOP_NODES boards, the search stops when it returns True (None for no time or memory budget, see Budget.py).
+        [partial] List that is filled with the jump ids that lead to the deepest board that was generated when the search fails or stops (None if not needed).
+
+Output: 1--> if a solution was found (its moves are in path)
+        0--> if there is no solution (or it was only reachable through dropped boards)
+        -1--> if the search stopped because of maxNodes or stop.
+'''
+
+def best_first_solver(board,pegs,heuristic,path,stats,mode='best-first',weight=1.0,frontierCap=None,pruner=None,maxNodes=None,stop=None,partial=None):
+    if mode not in SEARCH_MODES:
+        raise ValueError("Unknown search mode: " + str(mode))
+    if frontierCap is not None and frontierCap < 4:
+        raise ValueError("The queue must be able to hold at least 4 boards")
+    sign = -1 if heuristic == 'rating' else 1
+    jumps = board.jumps
+
+    #The parent key and the jump that led to each board that was generated, None for the starting board.
+    parents = {board.canonical(pegs): None}
+    parentsCap = 2 * frontierCap * pegCount(pegs) if frontierCap is not None else None
+    #The queue holds (priority, -depth, order, pegs, key, parent legal, jump) entries. The legal jumps of a board are only found when it is expanded,
+    #from the bitmask of the legal jumps of its parent and the jump that led to it (see BoardGeometry.updateLegalMask).
+    queue = [(0, 0, 0, pegs, board.canonical(pegs), board.legalMask(pegs), None)]
+    if pruner is not None and pruner.prune(pegs):
+        queue = []
+    order = 1
+    hits = 0
+    misses = 0
+    dropped = 0
+    nodes = 0
+    #The deepest board that was generated, the one with the fewest pegs.
+    deepest = (0, board.canonical(pegs))
+
+    #Follow the parents of a board back to the starting board.
+    def movesTo(key):
+        moves = []
+        while parents[key] is not None:
+            key,k = parents[key]
+            moves.append(k)
+        moves.reverse()
+        return moves
+
+    #Keep the parents of the boards of the queue and of the deepest board, and of their ancestors.
+    def keepAncestors():
+        kept = {}
+        for key in [entry[4] for entry in queue] + [deepest[1]]:
+            while key not in kept:
+                parent = kept[key] = parents[key]
+                if parent is None:
+                    break
+                key = parent[0]
+        return kept
+
+    while queue:
+        if nodes == maxNodes or (stop is not None and nodes % STOP_NODES == 0 and stop()):
+            stats.update({'hits': hits, 'misses': misses, 'evictions': dropped, 'size': len(parents)})
+            if partial is not None:
+                partial[:] = movesTo(deepest[1])
+            return -1
+        nodes += 1
+        priority,depth,_,pegs,key,legal,k = heapq.heappop(queue)
+        depth = -depth
+        if k is not None:
+            legal = board.updateLegalMask(legal,pegs,k)
+        jumpIds = board.jumpIds(legal)
+        for k,score in zip(jumpIds,scoreChildren(heuristic,board,pegs,jumpIds)):
+            nextPegs = pegs ^ jumps[k][2]
+            nextKey = board.canonical(nextPegs)
+            if nextKey in parents:
+                hits += 1
+                continue
+            parents[nextKey] = (key,k)
+            misses += 1
+            if depth + 1 > deepest[0]:
+                deepest = (depth + 1, nextKey)
+
+            if pegCount(nextPegs) == 1:
+                path.extend(board.jumpMoves[k] for k in movesTo(nextKey))
+                stats.update({'hits': hits, 'misses': misses, 'evictions': dropped, 'size': len(parents)})
+                return 1
+
+            #Boards that cannot be solved are remembered but never put in the queue.
+            if pruner is not None and pruner.prune(nextPegs):
+                continue
+
+            h = sign * score
+            if mode == 'astar':
+                nextPriority = (depth + 1) + weight * h
+            else:
+                nextPriority = h
+            heapq.heappush(queue, (nextPriority, -(depth + 1), order, nextPegs, nextKey, legal, k))
+            order += 1
+
+        #Keep the best three quarters of the queue when it grows past its limit.
+        if frontierCap is not None and len(queue) > frontierCap:
+            keep = frontierCap * 3 // 4
+            dropped += len(queue) - keep
+            queue = heapq.nsmallest(keep, queue)
+            heapq.heapify(queue)
+        if parentsCap is not None and len(parents) > parentsCap:
+            parents = keepAncestors()
+
+    stats.update({'hits': hits, 'misses': misses, 'evictions': dropped, 'size': len(parents)})
+    if partial is not None:
+        partial[:] = movesTo(deepest[1])
+    return 0
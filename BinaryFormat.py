@@ -0,0 +1,339 @@
+'''
+This module holds a binary format for large corpora of boards and of solutions, which are much smaller than the text files and are read with mmap, so
+any board or solution of a file is read without reading the ones before it. Every file starts with a header with the magic bytes of its kind, the version
+of the format, the number of bytes of the pegs of the boards, the number of records and the offsets of the tables at the end of the file. The shapes of the
+boards (their lines, columns and holes) are stored once in a table, and each record holds the index of its shape:
+
+    boards    --> one record of fixed size for each board: the shape and the bitmask of its pegs, in the same number of bytes for every board of the file.
+    solutions --> one record for each solution: the shape, the number of moves and the jump ids of the moves (see BoardGeometry), packed in as many bits
+                  as the largest jump id of the shape needs. An index with the offset of every record follows them.
+
+The jump ids are the order in which BoardGeometry finds the jumps of a shape, so a solution file is only read by the version of the solvers that wrote it.
+The files are written as a stream, with the tables at the end and the header written last, and a file of another version is rejected when it is opened.
+
+The text formats are converted with:
+
+    python BinaryFormat.py boards boards -o corpus.psb                      (every problem of a directory, a file or - for the standard input)
+    python BinaryFormat.py solutions boards results.jsonl -o solutions.pss (the moves of the JSON lines of BatchSolver.py, one solution per problem)
+    python BinaryFormat.py text corpus.psb                                  (either kind back to text, the records separated by empty lines)
+'''
+
+import argparse
+import os
+import struct
+import sys
+from array import array
+import numpy as np
+from BitBoard import Board, BoardGeometry, boardLines
+
+BOARDS_MAGIC = b'PSBB'
+SOLUTIONS_MAGIC = b'PSBS'
+VERSION = 1
+#Magic bytes, version, bytes of the pegs, number of records, offset of the table of shapes and offset of the index.
+HEADER = struct.Struct('<4sHHQQQ')
+#Lines, columns and number of bytes of the holes of a shape.
+SHAPE = struct.Struct('<HHH')
+#Shape and number of moves of a solution.
+SOLUTION = struct.Struct('<HH')
+
+'''
+This class keeps the shapes of the boards of a file and their BoardGeometries.
+
+Attributes: [shapes] List of the (lines, columns, holes) tuples of the shapes.
+'''
+
+class ShapeTable:
+    def __init__(self, shapes=()):
+        self.shapes = list(shapes)
+        self.ids = {shape: index for index, shape in enumerate(self.shapes)}
+        self.geometries = {}
+
+    '''
+    This function returns the index of a shape, which is added to the table if it is not in it yet.
+    '''
+
+    def index(self, layout):
+        index = self.ids.get(layout)
+        if index is None:
+            if len(self.shapes) == 1 << 16:
+                raise ValueError("A file holds at most 65536 shapes of boards")
+            index = self.ids[layout] = len(self.shapes)
+            self.shapes.append(layout)
+        return index
+
+    def geometry(self, index):
+        geometry = self.geometries.get(index)
+        if geometry is None:
+            geometry = self.geometries[index] = BoardGeometry(*self.shapes[index])
+            #Number of bits of a jump id of the shape.
+            geometry.jumpBits = max(1, (len(geometry.jumps) - 1).bit_length())
+            geometry.jumpIds = {move: k for k, move in enumerate(geometry.jumpMoves)}
+        return geometry
+
+    def pack(self):
+        data = [struct.pack('<I', len(self.shapes))]
+        for lines, columns, holes in self.shapes:
+            holesBytes = holes.to_bytes((holes.bit_length() + 7) // 8, 'little')
+            data.append(SHAPE.pack(lines, columns, len(holesBytes)) + holesBytes)
+        return b''.join(data)
+
+    @classmethod
+    def unpack(cls, data, offset):
+        (count,) = struct.unpack_from('<I', data, offset)
+        offset += 4
+        shapes = []
+        for index in range(count):
+            lines, columns, holesSize = SHAPE.unpack_from(data, offset)
+            offset += SHAPE.size
+            shapes.append((lines, columns, int.from_bytes(bytes(data[offset:offset + holesSize]), 'little')))
+            offset += holesSize
+        return cls(shapes)
+
+'''
+This function opens a file of the format and reads its header and its table of shapes.
+
+Input:  [path] Path of the file.
+        [magic] Magic bytes of the kind of file that is expected.
+
+Output: [data] Memory map (numpy memmap of bytes) of the file.
+        [pegBytes] Number of bytes of the pegs of the boards.
+        [count] Number of records.
+        [shapes] ShapeTable of the file.
+        [indexOffset] Offset of the index of the records.
+'''
+
+def openFile(path, magic):
+    data = np.memmap(path, dtype=np.uint8, mode='r')
+    if len(data) < HEADER.size:
+        raise ValueError(path + " is not a file of boards or solutions")
+    fileMagic, version, pegBytes, count, shapesOffset, indexOffset = HEADER.unpack_from(data)
+    if fileMagic != magic:
+        raise ValueError(path + " is not a file of " + ("boards" if magic == BOARDS_MAGIC else "solutions"))
+    if version != VERSION:
+        raise ValueError(path + " is a file of version %d, not %d" % (version, VERSION))
+    return data, pegBytes, count, ShapeTable.unpack(data, shapesOffset), indexOffset
+
+'''
+This function tells the kind of a file.
+
+Input:  [path] Path of the file.
+
+Output: boards or solutions if the file is a file of the format, None otherwise.
+'''
+
+def fileKind(path):
+    if not os.path.isfile(path):
+        return None
+    with open(path, 'rb') as f:
+        magic = f.read(len(BOARDS_MAGIC))
+    return {BOARDS_MAGIC: 'boards', SOLUTIONS_MAGIC: 'solutions'}.get(magic)
+
+'''
+This class writes a file of boards. The pegs of every board are stored in the same number of bytes, a power of 2 that starts with the bytes the first board
+needs. When a board needs more, the records written so far are widened to twice as many bytes (as many times as needed), which happens at most a few
+times in a file.
+
+Input:  [path] Path of the file.
+'''
+
+class BoardWriter:
+    def __init__(self, path):
+        self.file = open(path, 'w+b')
+        #The magic bytes are written when the file is closed, so a file that was not finished is not read.
+        self.file.write(HEADER.pack(bytes(len(BOARDS_MAGIC)), VERSION, 0, 0, 0, 0))
+        self.pegBytes = 1
+        self.shapes = ShapeTable()
+        self.count = 0
+
+    def write(self, board):
+        size = (board.lines*board.columns + 7) // 8
+        if size > self.pegBytes:
+            pegBytes = self.pegBytes
+            while pegBytes < size:
+                pegBytes *= 2
+            self.widen(pegBytes)
+        self.file.write(struct.pack('<H', self.shapes.index(board.layout())) + board.pegs.to_bytes(self.pegBytes, 'little'))
+        self.count += 1
+
+    def widen(self, pegBytes):
+        if self.count:
+            self.file.seek(HEADER.size)
+            records = np.fromfile(self.file, dtype=np.uint8, count=self.count*(2 + self.pegBytes)).reshape(self.count, 2 + self.pegBytes)
+            #The pegs are little-endian, so the new bytes are the highest ones.
+            wider = np.zeros((self.count, 2 + pegBytes), dtype=np.uint8)
+            wider[:, :2 + self.pegBytes] = records
+            self.file.seek(HEADER.size)
+            wider.tofile(self.file)
+        self.pegBytes = pegBytes
+
+    def close(self):
+        shapesOffset = self.file.tell()
+        self.file.write(self.shapes.pack())
+        self.file.seek(0)
+        self.file.write(HEADER.pack(BOARDS_MAGIC, VERSION, self.pegBytes, self.count, shapesOffset, 0))
+        self.file.close()
+
+'''
+This class reads a file of boards with mmap. It is a sequence of Boards.
+
+Input:  [path] Path of the file.
+
+Attributes: [records] Numpy array of the records, with the index of the shape (field shape) and the bytes of the pegs (field pegs) of each board, for
+                      the code that works on the whole file at once.
+'''
+
+class BoardFile:
+    def __init__(self, path):
+        data, pegBytes, count, self.shapes, indexOffset = openFile(path, BOARDS_MAGIC)
+        recordType = np.dtype([('shape', '<u2'), ('pegs', np.uint8, (pegBytes,))])
+        self.records = data[HEADER.size:HEADER.size + count*recordType.itemsize].view(recordType)
+
+    def __len__(self):
+        return len(self.records)
+
+    def __getitem__(self, index):
+        record = self.records[index]
+        lines, columns, holes = self.shapes.shapes[int(record['shape'])]
+        return Board(lines, columns, holes, int.from_bytes(record['pegs'].tobytes(), 'little'))
+
+    def __iter__(self):
+        for index in range(len(self)):
+            yield self[index]
+
+'''
+This class writes a file of solutions.
+
+Input:  [path] Path of the file.
+'''
+
+class SolutionWriter:
+    def __init__(self, path):
+        self.file = open(path, 'wb')
+        self.file.write(HEADER.pack(bytes(len(SOLUTIONS_MAGIC)), VERSION, 0, 0, 0, 0))
+        self.shapes = ShapeTable()
+        self.offsets = array('Q', [HEADER.size])
+
+    '''
+    This function writes the solution of a board.
+
+    Input:  [board] The Board of the problem (only its shape is stored).
+            [moves] List of the moves of the solution, as the strings the solvers write.
+    '''
+
+    def write(self, board, moves):
+        shape = self.shapes.index(board.layout())
+        geometry = self.shapes.geometry(shape)
+        packed = 0
+        for index, move in enumerate(moves):
+            k = geometry.jumpIds.get(move)
+            if k is None:
+                raise ValueError("%s is not a jump of a %dx%d board" % (move, board.lines, board.columns))
+            packed |= k << (index*geometry.jumpBits)
+        data = SOLUTION.pack(shape, len(moves)) + packed.to_bytes((len(moves)*geometry.jumpBits + 7) // 8, 'little')
+        self.file.write(data)
+        self.offsets.append(self.offsets[-1] + len(data))
+
+    def close(self):
+        shapesOffset = self.file.tell()
+        self.file.write(self.shapes.pack())
+        indexOffset = self.file.tell()
+        self.file.write(self.offsets.tobytes())
+        self.file.seek(0)
+        self.file.write(HEADER.pack(SOLUTIONS_MAGIC, VERSION, 0, len(self.offsets) - 1, shapesOffset, indexOffset))
+        self.file.close()
+
+'''
+This class reads a file of solutions with mmap. It is a sequence of the lists of the moves of the solutions, as the strings the solvers write.
+
+Input:  [path] Path of the file.
+'''
+
+class SolutionFile:
+    def __init__(self, path):
+        self.data, pegBytes, count, self.shapes, indexOffset = openFile(path, SOLUTIONS_MAGIC)
+        self.offsets = self.data[indexOffset:indexOffset + 8*(count + 1)].view('<u8')
+
+    def __len__(self):
+        return len(self.offsets) - 1
+
+    '''
+    This function returns the shape and the jump ids of a solution.
+
+    Input:  [index] Index of the solution.
+
+    Output: [layout] (lines, columns, holes) tuple of the shape of the board.
+            [jumpIds] List of the jump ids of the moves.
+    '''
+
+    def jumpIds(self, index):
+        if not 0 <= index < len(self):
+            raise IndexError("solution index out of range")
+        start, end = int(self.offsets[index]), int(self.offsets[index + 1])
+        shape, moves = SOLUTION.unpack_from(self.data, start)
+        bits = self.shapes.geometry(shape).jumpBits
+        packed = int.from_bytes(self.data[start + SOLUTION.size:end].tobytes(), 'little')
+        mask = (1 << bits) - 1
+        return self.shapes.shapes[shape], [packed >> (move*bits) & mask for move in range(moves)]
+
+    def __getitem__(self, index):
+        layout, jumpIds = self.jumpIds(index)
+        jumpMoves = self.shapes.geometry(self.shapes.ids[layout]).jumpMoves
+        return [jumpMoves[k] for k in jumpIds]
+
+    def __iter__(self):
+        for index in range(len(self)):
+            yield self[index]
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Converts boards and solutions between the text files and the binary format.")
+    commands = parser.add_subparsers(dest="command", required=True)
+    boards = commands.add_parser("boards", help="convert the problems of a directory, a file or - (the standard input) to a file of boards")
+    boards.add_argument("source")
+    boards.add_argument("-o", "--output", required=True)
+    solutions = commands.add_parser("solutions", help="convert the results of BatchSolver.py to a file of solutions, one for each problem")
+    solutions.add_argument("source", help="the problems that were solved (a directory, a file or -)")
+    solutions.add_argument("results", help="the JSON lines of the results (- for the standard input)")
+    solutions.add_argument("-o", "--output", required=True)
+    text = commands.add_parser("text", help="convert a file of boards or solutions back to text")
+    text.add_argument("input")
+    text.add_argument("-o", "--output", default="-", help="file of the text (- for the standard output)")
+    args = parser.parse_args()
+
+    if args.command == 'boards':
+        from BatchSolver import readProblems
+        from BitBoard import parseBoard
+        writer = BoardWriter(args.output)
+        for name, lines in readProblems(args.source):
+            writer.write(Board(*parseBoard(lines)))
+        writer.close()
+        print(writer.count, "boards written to", args.output, file=sys.stderr)
+    elif args.command == 'solutions':
+        import json
+        from BatchSolver import readProblems
+        from BitBoard import parseBoard
+        writer = SolutionWriter(args.output)
+        results = sys.stdin if args.results == '-' else open(args.results, "r")
+        records = (json.loads(line) for line in results if line.strip())
+        for (name, lines), record in zip(readProblems(args.source), records):
+            if record['name'] != name:
+                raise ValueError("The result of %s is not in the order of the problems (found %s)" % (name, record['name']))
+            #A problem without a solution gets its partial solution or no moves (and a problem that could not be read an empty board), so the
+            #solutions keep the order of the problems.
+            if record['status'] == 'error':
+                writer.write(Board(0, 0, 0, 0), [])
+            else:
+                writer.write(Board(*parseBoard(lines)), record['partial'] if record['status'] in ('stopped', 'exhausted') else record['moves'])
+        writer.close()
+        print(len(writer.offsets) - 1, "solutions written to", args.output, file=sys.stderr)
+    else:
+        kind = fileKind(args.input)
+        if kind is None:
+            parser.error(args.input + " is not a file of boards or solutions")
+        output = sys.stdout if args.output == '-' else open(args.output, "w")
+        for index, record in enumerate(BoardFile(args.input) if kind == 'boards' else SolutionFile(args.input)):
+            if index:
+                output.write("\n")
+            output.writelines(boardLines(record) if kind == 'boards' else (move + "\n" for move in record))
+        if output is not sys.stdout:
+            output.close()
@@ -0,0 +1,489 @@
+'''
+This module implements the bitboard engine that is used by the solvers. Instead of a numpy matrix, a board state is stored as a single Python integer
+(the peg bitmask) where bit (i*totalColumns + j) is set when there is a peg on line i and column j. Everything that never changes while a problem is solved
+(the valid holes, the possible jumps and the move strings that are written to the output file) is precomputed once in a BoardGeometry object. This way
+move generation, move application and peg counting become a handful of bitwise operations.
+'''
+
+#The 4 possible move directions, in the order the solvers have always examined them.
+DIRECTIONS = ('up', 'down', 'left', 'right')
+
+#Line and column offsets for each of the 4 directions.
+OFFSETS = {'up': (-1, 0), 'down': (1, 0), 'left': (0, -1), 'right': (0, 1)}
+
+'''
+This class stores everything about a board that does not change while a problem is solved. Cells are numbered line by line (cell = i*columns + j).
+For each cell the legal jumps are precomputed as (from, over, to) triples and are kept in the same order the solvers scan the board, first by cell
+and then by direction (up, down, left, right).
+
+Input:  [lines] Number of lines of the board.
+        [columns] Number of columns of the board.
+        [holes] Integer bitmask of the valid holes of the board (every cell that is not a 0 in the input file).
+
+Attributes: [jumps] List of (fromOver, to, flip) bitmask tuples, one per jump. A jump is legal on a board when all the bits of fromOver are pegs
+                    and the bit of 'to' is empty. Applying it is a single xor with flip.
+            [jumpCells] List of (from, over, to) cell triples, one per jump.
+            [jumpDirections] List that stores the direction of each jump.
+            [jumpMoves] List that stores each jump as the string that is written to the output file (e.g. '4 2 4 4').
+            [jumpsByCell] List of (cellBit, jump ids) tuples for every cell that has at least one jump starting from it, in scan order.
+            [scanOrder] Tuple of (jump id, skip) pairs with every jump in scan order, where skip is the position of the first jump of the next cell.
+            [cellJumps] List with the ids of the jumps that use each cell (as the peg that jumps, the peg that is removed or the landing hole).
+            [affectedJumps] List with the ids of the jumps whose legality a jump can change (the jumps of its 3 cells), in scan order.
+            [affectedMasks] List with the same jumps of each jump as a bitmask of jump ids.
+
+The jump ids are given in scan order, so the legal jumps of a board can also be kept as a bitmask of jump ids (bit k is set when jump k is legal, see
+legalMask) and the lowest set bit is always the next jump of the scan.
+'''
+
+class BoardGeometry:
+    def __init__(self, lines, columns, holes):
+        self.lines = lines
+        self.columns = columns
+        self.cells = lines * columns
+        self.holes = holes
+        self.cellLine = [cell // columns for cell in range(self.cells)]
+        self.cellColumn = [cell % columns for cell in range(self.cells)]
+
+        self.jumps = []
+        self.jumpCells = []
+        self.jumpDirections = []
+        self.jumpMoves = []
+        self.jumpsByCell = []
+        for i in range(lines):
+            for j in range(columns):
+                cell = i*columns + j
+                if not holes >> cell & 1:
+                    continue
+                cellJumps = []
+                for direction in DIRECTIONS:
+                    dL, dC = OFFSETS[direction]
+                    #The cell that is jumped over and the landing cell must both be valid holes inside the board.
+                    if not (0 <= i + 2*dL < lines and 0 <= j + 2*dC < columns):
+                        continue
+                    fromCell = cell
+                    overCell = (i + dL)*columns + (j + dC)
+                    toCell = (i + 2*dL)*columns + (j + 2*dC)
+                    if not (holes >> overCell & 1 and holes >> toCell & 1):
+                        continue
+                    fromOver = (1 << fromCell) | (1 << overCell)
+                    cellJumps.append(len(self.jumps))
+                    self.jumps.append((fromOver, 1 << toCell, fromOver | (1 << toCell)))
+                    self.jumpCells.append((fromCell, overCell, toCell))
+                    self.jumpDirections.append(direction)
+                    self.jumpMoves.append(str(i+1) + " " + str(j+1) + " " + str(i + 2*dL + 1) + " " + str(j + 2*dC + 1))
+                if cellJumps:
+                    self.jumpsByCell.append((1 << cell, cellJumps))
+
+        #Every jump paired with the first jump of the next cell, the scan order of the Depth-First solver (see PegSolitaireSolver.search).
+        self.scanOrder = []
+        for cellBit, cellJumps in self.jumpsByCell:
+            skip = len(self.scanOrder) + len(cellJumps)
+            for k in cellJumps:
+                self.scanOrder.append((k, skip))
+        self.scanOrder = tuple(self.scanOrder)
+        self.jumpFromCell = [cells[0] for cells in self.jumpCells]
+
+        #The index of the jumps of each cell. A jump only changes its 3 cells, so only the jumps that use one of them can become legal or illegal.
+        self.cellJumps = [[] for cell in range(self.cells)]
+        for k, cells in enumerate(self.jumpCells):
+            for cell in cells:
+                self.cellJumps[cell].append(k)
+        self.affectedJumps = [tuple(sorted(set(self.cellJumps[f] + self.cellJumps[o] + self.cellJumps[t]))) for f, o, t in self.jumpCells]
+        self.affectedMasks = [sum(1 << j for j in affected) for affected in self.affectedJumps]
+
+        #Masks used by the bitwise neighbour tests of the rating heuristic.
+        full = (1 << self.cells) - 1
+        notFirstColumn = 0
+        notLastColumn = 0
+        for cell in range(self.cells):
+            if self.cellColumn[cell] != 0:
+                notFirstColumn |= 1 << cell
+            if self.cellColumn[cell] != columns - 1:
+                notLastColumn |= 1 << cell
+        self.full = full
+        self.notFirstColumn = notFirstColumn
+        self.notLastColumn = notLastColumn
+
+        #The cells of each line and of each column, used to count the pegs on them.
+        self.lineMasks = [((1 << columns) - 1) << (i*columns) for i in range(lines)]
+        self.columnMasks = [sum(1 << (i*columns + j) for i in range(lines)) for j in range(columns)]
+
+        #The symmetries of the layout of the holes. They are only used for the board keys after enableSymmetries is called.
+        self.symmetries = findSymmetries(lines, columns, holes)
+        self.symmetryTables = []
+
+        #True if the heuristics score the moves with their NumPy batch versions (see Heuristics.py).
+        self.batchScoring = False
+
+        #The learned move-ordering table of the shape (see MoveOrdering.py), None if there is none.
+        self.moveOrdering = None
+
+    '''
+    This function makes canonical return the same key for all the boards that are rotations or mirror images of each other. For each symmetry of the
+    layout a lookup table is built for every 8 cells of the board, so transforming a board costs one table lookup per 8 cells instead of one step per cell.
+    '''
+
+    def enableSymmetries(self):
+        self.symmetryTables = []
+        for name, permutation in self.symmetries:
+            tables = []
+            for shift in range(0, self.cells, 8):
+                table = [0] * 256
+                for value in range(1, 256):
+                    lowest = value & -value
+                    cell = shift + lowest.bit_length() - 1
+                    image = 1 << permutation[cell] if cell in permutation else 0
+                    table[value] = table[value ^ lowest] | image
+                tables.append(table)
+            self.symmetryTables.append(tables)
+
+    '''
+    This function returns the key under which a board is stored in the memory of the solvers. Without symmetries the key is the peg bitmask itself, otherwise
+    it is the smallest peg bitmask among the board and its rotations and mirror images, so all of them share the same key.
+
+    Input:  [pegs] Integer bitmask of the pegs of the current board.
+
+    Output: The integer key of the board.
+    '''
+
+    def canonical(self, pegs):
+        best = pegs
+        for tables in self.symmetryTables:
+            image = 0
+            shift = 0
+            for table in tables:
+                image |= table[pegs >> shift & 255]
+                shift += 8
+            if image < best:
+                best = image
+        return best
+
+    '''
+    This function returns the ids of the legal jumps on the given board, in the order the solvers scan the board.
+
+    Input:  [pegs] Integer bitmask of the pegs of the current board.
+
+    Output: List of jump ids.
+    '''
+
+    def legalJumps(self, pegs, legal=None):
+        if legal is not None:
+            return self.jumpIds(legal)
+        return [k for k, (fromOver, to, flip) in enumerate(self.jumps) if pegs & fromOver == fromOver and not pegs & to]
+
+    '''
+    This function returns the legal jumps of a board as a bitmask of jump ids, by testing every jump. The searches compute it once for the starting board
+    and then keep it up to date with updateLegalMask.
+
+    Input:  [pegs] Integer bitmask of the pegs of the current board.
+
+    Output: Integer bitmask where bit k is set when jump k is legal.
+    '''
+
+    def legalMask(self, pegs):
+        legal = 0
+        for k, (fromOver, to, flip) in enumerate(self.jumps):
+            if pegs & fromOver == fromOver and not pegs & to:
+                legal |= 1 << k
+        return legal
+
+    '''
+    This function returns the legal jumps of the board a jump leads to (or comes back from, since making and undoing a jump change the same 3 cells) from
+    the legal jumps of the other board. Only the jumps that use one of the 3 cells are tested again, so the cost depends on the jump and not on the size
+    of the board.
+
+    Input:  [legal] Bitmask of the legal jumps of the board before the jump.
+            [pegs] Integer bitmask of the pegs of the board after the jump.
+            [k] Id of the jump.
+
+    Output: Bitmask of the legal jumps of the board after the jump.
+    '''
+
+    def updateLegalMask(self, legal, pegs, k):
+        jumps = self.jumps
+        legal &= ~self.affectedMasks[k]
+        for j in self.affectedJumps[k]:
+            fromOver, to, flip = jumps[j]
+            if pegs & fromOver == fromOver and not pegs & to:
+                legal |= 1 << j
+        return legal
+
+    '''
+    This function returns the ids of the jumps of a bitmask of jump ids, in scan order.
+    '''
+
+    def jumpIds(self, legal):
+        jumpIds = []
+        while legal:
+            lowest = legal & -legal
+            jumpIds.append(lowest.bit_length() - 1)
+            legal ^= lowest
+        return jumpIds
+
+    '''
+    This function returns the legal moves of a board in the scan order of the Depth-First solver as (jump id, skip) pairs, where skip is the position of
+    the first legal jump of the next cell. The Depth-First solver tries the same jumps in the same order as with scanOrder, since the illegal jumps of
+    scanOrder are never made, but without testing every jump of the board.
+
+    Input:  [legal] Bitmask of the legal jumps of the board.
+
+    Output: List of (jump id, skip) pairs.
+    '''
+
+    def scanMoves(self, legal):
+        jumpIds = self.jumpIds(legal)
+        fromCell = self.jumpFromCell
+        moves = [None] * len(jumpIds)
+        skip = len(jumpIds)
+        for position in range(len(jumpIds) - 1, -1, -1):
+            k = jumpIds[position]
+            moves[position] = (k, skip)
+            if position and fromCell[jumpIds[position - 1]] != fromCell[k]:
+                skip = position
+        return moves
+
+    '''
+    This function returns the ids of the jumps that can be undone on the given board (the reverse moves): the landing hole holds a peg and the two
+    holes it came from and over are empty. Undoing a jump is the same xor with flip as making it.
+
+    Input:  [pegs] Integer bitmask of the pegs of the current board.
+
+    Output: List of jump ids.
+    '''
+
+    def legalUnjumps(self, pegs):
+        return [k for k, (fromOver, to, flip) in enumerate(self.jumps) if not pegs & fromOver and pegs & to]
+
+    '''
+    This function counts the legal jumps on the given board using whole-board shifts instead of going through each jump.
+
+    Input:  [pegs] Integer bitmask of the pegs of the current board.
+
+    Output: The number of legal jumps.
+    '''
+
+    def countLegalJumps(self, pegs):
+        columns = self.columns
+        empty = self.holes & ~pegs
+        #A peg that jumps to the right needs a peg on its right and an empty hole 2 cells to the right, without wrapping to the next line.
+        right = pegs & (pegs >> 1) & (empty >> 2) & self.notLastColumn & (self.notLastColumn >> 1)
+        left = pegs & (pegs << 1) & (empty << 2) & self.notFirstColumn & (self.notFirstColumn << 1)
+        down = pegs & (pegs >> columns) & (empty >> 2*columns)
+        up = pegs & (pegs << columns) & (empty << 2*columns)
+        return right.bit_count() + left.bit_count() + down.bit_count() + up.bit_count()
+
+    '''
+    This function counts the pegs that have at least one other peg next to them (up, down, left or right).
+
+    Input:  [pegs] Integer bitmask of the pegs of the current board.
+
+    Output: The number of pegs that are not isolated.
+    '''
+
+    def countNonIsolated(self, pegs):
+        neighbours = ((pegs >> 1) & self.notLastColumn) | ((pegs << 1) & self.notFirstColumn) | (pegs >> self.columns) | (pegs << self.columns)
+        return (pegs & neighbours).bit_count()
+
+    '''
+    This function returns the cells that hold a peg, in scan order.
+
+    Input:  [pegs] Integer bitmask of the pegs of the current board.
+
+    Output: List of cell numbers.
+    '''
+
+    def pegCells(self, pegs):
+        cells = []
+        while pegs:
+            lowest = pegs & -pegs
+            cells.append(lowest.bit_length() - 1)
+            pegs ^= lowest
+        return cells
+
+'''
+This function finds the rotations and mirror images that map the layout of the holes onto itself. The transformations are applied to the smallest rectangle
+that contains all the holes, so a board padded with 0s is treated like the same board without them. Rotations by 90 degrees are only possible when that
+rectangle is a square. English and French boards have all 8 symmetries, while an irregular board may have none apart from the identity.
+
+Input:  [lines] Number of lines of the board.
+        [columns] Number of columns of the board.
+        [holes] Integer bitmask of the valid holes of the board.
+
+Output: List of (name, permutation) tuples, one for each symmetry apart from the identity, where permutation is a dictionary that maps each hole to its image.
+'''
+
+def findSymmetries(lines, columns, holes):
+    cells = [cell for cell in range(lines*columns) if holes >> cell & 1]
+    if not cells:
+        return []
+    minL = min(cell // columns for cell in cells)
+    maxL = max(cell // columns for cell in cells)
+    minC = min(cell % columns for cell in cells)
+    maxC = max(cell % columns for cell in cells)
+    h = maxL - minL
+    w = maxC - minC
+
+    transformations = [('mirror-lines', lambda a, b: (h - a, b)),
+                       ('mirror-columns', lambda a, b: (a, w - b)),
+                       ('rotate-180', lambda a, b: (h - a, w - b))]
+    if h == w:
+        transformations += [('transpose', lambda a, b: (b, a)),
+                            ('anti-transpose', lambda a, b: (w - b, h - a)),
+                            ('rotate-90', lambda a, b: (b, h - a)),
+                            ('rotate-270', lambda a, b: (w - b, a))]
+
+    symmetries = []
+    for name, transformation in transformations:
+        permutation = {}
+        for cell in cells:
+            a, b = transformation(cell // columns - minL, cell % columns - minC)
+            permutation[cell] = (a + minL)*columns + (b + minC)
+        #A transformation is a symmetry of the board if every hole is mapped onto a hole.
+        if all(holes >> image & 1 for image in permutation.values()):
+            symmetries.append((name, permutation))
+    return symmetries
+
+'''
+This function counts the pegs on the board.
+
+Input:  [pegs] Integer bitmask of the pegs of the current board.
+
+Output: The number of pegs.
+'''
+
+def pegCount(pegs):
+    return pegs.bit_count()
+
+'''
+This class is a board of a problem as a plain value: the size and the holes of its layout and the pegs of its starting position. It is what the Solver of
+PegSolitaireSolver.py takes, and the Solver builds (and keeps) the BoardGeometry of each layout itself, so boards can be passed around, compared and used as
+dictionary keys without carrying any state of a search.
+
+Input:  [lines] Number of lines of the board.
+        [columns] Number of columns of the board.
+        [holes] Integer bitmask of the valid holes of the board.
+        [pegs] Integer bitmask of the pegs of the board.
+'''
+
+class Board:
+    def __init__(self, lines, columns, holes, pegs):
+        if pegs & ~holes:
+            raise ValueError("Every peg must be on a hole of the board")
+        self.lines = lines
+        self.columns = columns
+        self.holes = holes
+        self.pegs = pegs
+
+    '''
+    This function reads a board from a file in the format of readBoard.
+    '''
+
+    @classmethod
+    def fromFile(cls, inputFile):
+        with open(inputFile, "r") as f:
+            return cls(*parseBoard(f))
+
+    '''
+    This function reads a board from a string in the format of readBoard.
+    '''
+
+    @classmethod
+    def fromString(cls, text):
+        return cls(*parseBoard(text.splitlines(True)))
+
+    '''
+    This function builds the BoardGeometry of the layout of the board.
+    '''
+
+    def geometry(self):
+        return BoardGeometry(self.lines, self.columns, self.holes)
+
+    def layout(self):
+        return (self.lines, self.columns, self.holes)
+
+    def __eq__(self, other):
+        return isinstance(other, Board) and self.layout() == other.layout() and self.pegs == other.pegs
+
+    def __hash__(self):
+        return hash((self.lines, self.columns, self.holes, self.pegs))
+
+    def __repr__(self):
+        return "Board(%d, %d, %#x, %#x)" % (self.lines, self.columns, self.holes, self.pegs)
+
+'''
+This function parses the lines of a problem. The first line holds the number of lines and columns of the board and each following line holds one line
+of the board, where 0 is a cell that does not belong to the board, 1 is a peg and 2 is an empty hole.
+
+Input:  [text] Iterable of the lines of the problem (an open file or a list of strings).
+
+Output: [totalLines] Number of lines of the board.
+        [totalColumns] Number of columns of the board.
+        [holes] Integer bitmask of the valid holes of the board.
+        [pegs] Integer bitmask of the pegs of the starting board.
+'''
+
+def parseBoard(text):
+    totalLines = None
+    lineIndex = 0
+    holes = 0
+    pegs = 0
+    for line in text:
+        #The first line holds the size of the board, whose numbers may have any number of digits.
+        if totalLines is None:
+            if line.strip():
+                fields = line.split()
+                if len(fields) != 2:
+                    raise ValueError("The first line of the problem must hold the number of lines and columns of the board")
+                totalLines, totalColumns = int(fields[0]), int(fields[1])
+            continue
+        cells = line.rstrip('\r\n').replace(' ', '')
+        if cells and lineIndex >= totalLines:
+            raise ValueError("The board has more than %d lines" % totalLines)
+        if len(cells) > totalColumns:
+            raise ValueError("A line of the board has more than %d columns" % totalColumns)
+        #Read backwards as binary numbers, the cells of a line give the bits of its holes and of its pegs at once.
+        if cells:
+            shift = lineIndex*totalColumns
+            holes |= int(cells[::-1].translate(HOLE_DIGITS), 2) << shift
+            pegs |= int(cells[::-1].translate(PEG_DIGITS), 2) << shift
+        lineIndex += 1
+    if totalLines is None:
+        raise ValueError("The problem is empty")
+    return totalLines, totalColumns, holes, pegs
+
+#Tables that turn the cells of a line of a problem into the binary digits of its holes and of its pegs.
+HOLE_DIGITS = str.maketrans('012', '011')
+PEG_DIGITS = str.maketrans('012', '010')
+
+'''
+This function converts a board back to the lines of a problem (see parseBoard).
+
+Input:  [board] The Board.
+
+Output: List of the lines of the problem.
+'''
+
+def boardLines(board):
+    lines = ["%d %d\n" % (board.lines, board.columns)]
+    for line in range(board.lines):
+        cells = []
+        for column in range(board.columns):
+            cell = line*board.columns + column
+            cells.append('1' if board.pegs >> cell & 1 else '2' if board.holes >> cell & 1 else '0')
+        lines.append(" ".join(cells) + "\n")
+    return lines
+
+'''
+This function reads the file that contains the problem's starting board (see parseBoard for the format).
+
+Input:  [inputFile] Path of the file that contains the problem.
+
+Output: [geometry] The BoardGeometry of the problem.
+        [pegs] Integer bitmask of the pegs of the starting board.
+'''
+
+def readBoard(inputFile):
+    f = open(inputFile, "r")
+    totalLines, totalColumns, holes, pegs = parseBoard(f)
+    f.close()
+    return BoardGeometry(totalLines, totalColumns, holes), pegs
@@ -0,0 +1,63 @@
+'''
+This module holds the budgets of a solve that are not counted in boards: the wall-clock time and the memory of the process. A hard problem can search for
+hours or grow its memory until the system kills it, so the solve is given a budget instead and stops cleanly when it is spent, with the best partial
+solution it has found so far (the moves to the board with the fewest pegs) instead of nothing.
+
+Looking at the clock and at the memory of the process for every board would slow the searches down, so they only call the Watchdog every STOP_NODES boards
+and the budgets may be overrun by the time those boards take.
+'''
+
+import os
+import sys
+import time
+
+try:
+    import resource
+except ImportError:
+    resource = None
+
+#The searches check the budgets every this many boards.
+STOP_NODES = 1024
+
+'''
+This function returns the resident memory of the process in megabytes. Linux reports the current one, which goes down again when a solve frees its
+memory, so a process that solves many boards (see BatchSolver.py) is not stopped by the peak of an earlier solve. Other systems only report the peak.
+'''
+
+def residentMemory():
+    try:
+        with open('/proc/self/statm') as f:
+            return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE') / (1 << 20)
+    except (OSError, ValueError, IndexError):
+        pass
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    #Linux reports kilobytes and macOS bytes.
+    return peak / (1 << 20) if sys.platform == 'darwin' else peak / 1024
+
+'''
+This class tells the searches when a budget is spent. It is called without arguments and returns True once the time or the memory of the process is over
+its budget, and from then on, so every part of a search that checks it stops.
+
+Input:  [maxSeconds] Number of seconds the solve may run (None for no limit).
+        [maxMemory] Number of megabytes of resident memory the process may use (None for no limit). Only the memory of this process is measured,
+                    not the memory of the worker processes of the parallel search.
+
+Attributes: [reason] time or memory, the budget that was spent (None while both are left).
+'''
+
+class Watchdog:
+    def __init__(self, maxSeconds=None, maxMemory=None):
+        if maxMemory is not None and resource is None:
+            raise ValueError("The memory limit needs the resource module of a Unix system")
+        self.deadline = time.time() + maxSeconds if maxSeconds is not None else None
+        self.maxMemory = maxMemory
+        self.reason = None
+
+    def __call__(self):
+        if self.reason is not None:
+            return True
+        if self.deadline is not None and time.time() >= self.deadline:
+            self.reason = 'time'
+        elif self.maxMemory is not None and residentMemory() >= self.maxMemory:
+            self.reason = 'memory'
+        return self.reason is not None
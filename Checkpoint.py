@@ -0,0 +1,123 @@
+'''
+This module saves the state of a backtracking search (see PegSolitaireSolver.search) to a file and reads it back, so a long solve that is killed can go on
+from where it was instead of starting again. The state of the search is all in the frames of its explicit stack, its memory and its counters:
+
+    stack    --> the board and the cursor of every frame. The ordered moves of a frame are not saved, since the move ordering of a solver only depends on
+                 the board and they are computed again when the checkpoint is read.
+    memory   --> the keys of the TranspositionTable in the order they were stored (which is the order its fifo and lru policies evict them in) and its
+                 hit, miss and eviction counters.
+    counters --> the number of boards searched so far and the number of boards cut by each pruning rule.
+    partial  --> the jump ids to the deepest board stored so far, so a search that is stopped again after it goes on still reports the best partial
+                 solution of all its runs.
+
+A search that goes on from a checkpoint is in exactly the same state as the search that saved it, so it makes the same moves and finds the same solution as
+a search that was never interrupted.
+
+The file is binary: a header with the magic bytes, the version of the format and the problem (the layout, the starting board and the options of the solver
+that change the search), followed by the counters, the keys of the memory, the frames and the partial solution as arrays of 64 bit words. It is written to a temporary file that
+replaces the old checkpoint at once, so a process that is killed while it writes never leaves a broken checkpoint behind.
+'''
+
+import os
+import struct
+from array import array
+from Pruning import PRUNE_RULES
+
+MAGIC = b'PSCK'
+VERSION = 3
+MASK64 = (1 << 64) - 1
+
+'''
+This function returns the problem a checkpoint belongs to as bytes, so the checkpoint of another problem (or of the same problem with other options) is
+never resumed.
+
+Input:  [board] BoardGeometry of the problem.
+        [pegs] Integer bitmask of the pegs of the starting board.
+        [options] List of the names and values of the options of the solver that change the search (e.g. the strategy and symmetry).
+
+Output: Bytes that identify the problem.
+'''
+
+def problemKey(board,pegs,options):
+    return ("%dx%d:%x:%x:" % (board.lines, board.columns, board.holes, pegs) + ",".join("%s=%s" % option for option in options)).encode()
+
+'''
+This function packs integers into an array of 64 bit words, the given number of words for each of them.
+'''
+
+def packWords(values,words):
+    if words == 1:
+        return array('Q', values)
+    return array('Q', (value >> (64 * w) & MASK64 for value in values for w in range(words)))
+
+def unpackWords(data,words):
+    if words == 1:
+        return list(data)
+    return [sum(data[i + w] << (64 * w) for w in range(words)) for i in range(0, len(data), words)]
+
+'''
+This function saves the state of a search.
+
+Input:  [path] Path of the checkpoint file.
+        [problem] Bytes that identify the problem (see problemKey).
+        [board] BoardGeometry of the problem.
+        [stack] List of the frames of the search.
+        [memory] TranspositionTable of the search.
+        [nodes] Number of boards searched so far.
+        [prunes] Dictionary with the number of boards cut by each pruning rule (None if pruning is off).
+        [partial] List of the jump ids to the deepest board stored so far (None if it is not kept).
+'''
+
+def saveCheckpoint(path,problem,board,stack,memory,nodes,prunes=None,partial=None):
+    words = max(1, (board.cells + 63) // 64)
+    keys = packWords(memory.table, words)
+    frames = packWords([frame[0] for frame in stack], words)
+    cursors = array('Q', [frame[1] for frame in stack])
+    deepest = array('Q', partial if partial is not None else [])
+    temporary = path + '.tmp'
+    with open(temporary, 'wb') as f:
+        f.write(struct.pack('<4sHI', MAGIC, VERSION, len(problem)))
+        f.write(problem)
+        f.write(struct.pack('<QQQQH', nodes, memory.hits, memory.misses, memory.evictions, words))
+        f.write(array('Q', [prunes[rule] if prunes is not None else 0 for rule in PRUNE_RULES]).tobytes())
+        f.write(struct.pack('<QQQ', len(memory.table), len(stack), len(deepest)))
+        f.write(keys.tobytes())
+        f.write(frames.tobytes())
+        f.write(cursors.tobytes())
+        f.write(deepest.tobytes())
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(temporary, path)
+
+'''
+This function reads the state of a search back. The keys and counters are put back into the given memory.
+
+Input:  [path] Path of the checkpoint file.
+        [problem] Bytes that identify the problem (see problemKey).
+        [memory] Empty TranspositionTable of the search.
+
+Output: [frames] List of the (board, cursor) pairs of the frames of the stack.
+        [nodes] Number of boards searched so far.
+        [prunes] Dictionary with the number of boards cut by each pruning rule.
+        [partial] List of the jump ids to the deepest board stored so far.
+'''
+
+def loadCheckpoint(path,problem,memory):
+    with open(path, 'rb') as f:
+        magic, version, length = struct.unpack('<4sHI', f.read(struct.calcsize('<4sHI')))
+        if magic != MAGIC or version != VERSION:
+            raise ValueError(path + " is not a checkpoint of this version of the solvers")
+        if f.read(length) != problem:
+            raise ValueError(path + " is the checkpoint of another problem or of other options")
+        nodes, memory.hits, memory.misses, memory.evictions, words = struct.unpack('<QQQQH', f.read(struct.calcsize('<QQQQH')))
+        counts = array('Q')
+        counts.frombytes(f.read(8 * len(PRUNE_RULES)))
+        prunes = dict(zip(PRUNE_RULES, counts))
+        size, depth, length = struct.unpack('<QQQ', f.read(24))
+        data = array('Q')
+        data.frombytes(f.read(8 * words * (size + depth) + 8 * (depth + length)))
+    memory.table = dict.fromkeys(unpackWords(data[:words * size], words))
+    boards = unpackWords(data[words * size:words * (size + depth)], words)
+    cursors = data[words * (size + depth):words * (size + depth) + depth]
+    partial = list(data[words * (size + depth) + depth:])
+    return list(zip(boards, cursors)), nodes, prunes, partial
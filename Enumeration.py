@@ -0,0 +1,347 @@
+'''
+This program goes through every board that can be reached from a starting board, instead of stopping at the first solution like the solvers. It counts the
+solutions (the different sequences of jumps that leave a single peg), the distinct boards that can be reached with each number of pegs and the final holes
+that can be reached, which is what is needed to design new problems.
+
+Every jump removes one peg, so the boards are enumerated level by level: level k holds the boards with k pegs fewer than the starting board, and the
+children of a level are exactly the next level. A level is a sorted NumPy array of the boards (packed into 64 bits, see packBoard) with the number of
+sequences of jumps that reach each of them, the children of a whole level are built with a few vectorized operations for each jump, and the duplicates are
+merged with a sort. Only the current and the next level are kept, so the memory is bounded by the widest level.
+
+When a maximum number of boards in memory is given, a level that is larger is split into partitions by the value of the board, and the partitions are
+spilled to files in a directory and read back with mmap. Each partition is sorted and merged on its own, so the memory is bounded by the size of a
+partition instead of the size of the level. The number of partitions is guessed from the growth of the last level, and when the guess keeps a level in
+memory but its children turn out to be more than the budget, they are merged as they come and spilled to partitions once merging does not keep them small.
+
+Usage: python Enumeration.py input.txt [--max-boards 10000000] [--spill-dir DIR] [--output counts.json]
+'''
+
+import argparse
+import json
+import os
+import shutil
+import tempfile
+import time
+import numpy as np
+from BitBoard import Board
+
+#A level is read in chunks of boards of this size, so the children of a chunk (at most one for each jump of each board) stay small.
+CHUNK = 1 << 16
+
+#The number of sequences of jumps is stored with 64 bits, so the counts are also added as floats to find out when they no longer fit.
+MAX_COUNT = float(2 ** 64)
+
+'''
+This function packs a board into the bits of the holes of its layout, so every layout with at most 64 holes fits in a 64 bit integer.
+
+Input:  [board] BoardGeometry of the problem.
+        [pegs] Integer bitmask of the pegs of the board.
+
+Output: Integer with bit i set if the i-th hole of the layout (counted line by line) has a peg.
+'''
+
+def packBoard(board,pegs):
+    return sum(1 << index for index, cell in enumerate(board.pegCells(board.holes)) if pegs >> cell & 1)
+
+'''
+This function unpacks a board packed by packBoard.
+
+Input:  [board] BoardGeometry of the problem.
+        [packed] Integer of the packed board.
+
+Output: Integer bitmask of the pegs of the board.
+'''
+
+def unpackBoard(board,packed):
+    return sum(1 << cell for index, cell in enumerate(board.pegCells(board.holes)) if packed >> index & 1)
+
+'''
+This function packs the jumps of a board the same way as its boards.
+
+Input:  [board] BoardGeometry of the problem.
+
+Output: Tuple of 3 uint64 arrays: the from and over holes, the to hole and all 3 holes of every jump.
+'''
+
+def packJumps(board):
+    holeCells = board.pegCells(board.holes)
+    if len(holeCells) > 64:
+        raise ValueError("The enumeration packs the boards into 64 bits, so it needs a layout with at most 64 holes")
+    index = {cell: i for i, cell in enumerate(holeCells)}
+    fromOver = [(1 << index[fromCell]) | (1 << index[overCell]) for fromCell, overCell, toCell in board.jumpCells]
+    to = [1 << index[toCell] for fromCell, overCell, toCell in board.jumpCells]
+    flip = [a | b for a, b in zip(fromOver, to)]
+    return np.array(fromOver, dtype=np.uint64), np.array(to, dtype=np.uint64), np.array(flip, dtype=np.uint64)
+
+'''
+This function merges the duplicates of an array of boards.
+
+Input:  [boards] uint64 array of packed boards.
+        [counts] uint64 array of the number of sequences of jumps that reach each of them.
+
+Output: Tuple (boards, counts) of the sorted distinct boards and the sums of their counts.
+'''
+
+def mergeDuplicates(boards,counts):
+    if len(boards) == 0:
+        return boards, counts
+    order = np.argsort(boards, kind='stable')
+    boards = boards[order]
+    counts = counts[order]
+    starts = np.concatenate(([0], np.flatnonzero(boards[1:] != boards[:-1]) + 1))
+    if np.add.reduceat(counts.astype(np.float64), starts).max() >= MAX_COUNT:
+        raise OverflowError("The number of solutions does not fit in 64 bits")
+    return boards[starts], np.add.reduceat(counts, starts)
+
+'''
+This function builds the children of some boards. Each jump is applied with one vectorized operation to all the boards where it is legal.
+
+Input:  [boards] uint64 array of packed boards.
+        [counts] uint64 array of the number of sequences of jumps that reach each of them.
+        [jumps] The jumps of the layout (see packJumps).
+
+Output: Tuple (boards, counts) of the sorted distinct children and the number of sequences of jumps that reach them.
+'''
+
+def expandBoards(boards,counts,jumps):
+    children = []
+    childCounts = []
+    for fromOver, to, flip in zip(*jumps):
+        legal = ((boards & fromOver) == fromOver) & ((boards & to) == 0)
+        children.append(boards[legal] ^ flip)
+        childCounts.append(counts[legal])
+    return mergeDuplicates(np.concatenate(children), np.concatenate(childCounts))
+
+'''
+This class enumerates the boards that can be reached from a starting board.
+
+Input:  [board] BoardGeometry of the problem.
+        [pegs] Integer bitmask of the pegs of the starting board.
+        [maxBoards] Maximum number of boards of a partition kept in memory (None to keep every level in memory).
+        [spillDir] Directory where the partitions are spilled (None for a temporary directory).
+
+Attributes: [levels] List of (pegs, boards, seconds) tuples with the number of distinct boards of each level and the time it took to build it.
+            [solutions] Number of sequences of jumps that leave a single peg.
+            [finalHoles] Dictionary with the number of solutions that end on each final hole (cell --> solutions).
+            [spilled] Number of partitions that were written to disk.
+'''
+
+class Enumerator:
+    def __init__(self, board, pegs, maxBoards=None, spillDir=None):
+        if maxBoards is not None and maxBoards < 1:
+            raise ValueError("A partition must hold at least 1 board")
+        self.board = board
+        self.pegs = pegs
+        self.maxBoards = maxBoards
+        self.spillDir = spillDir
+        self.jumps = packJumps(board)
+        self.levels = []
+        self.solutions = 0
+        self.finalHoles = {}
+        self.spilled = 0
+
+    '''
+    This function enumerates every level, from the starting board down to the boards where no jump is left.
+
+    Output: The Enumerator itself.
+    '''
+
+    def run(self):
+        directory = self.spillDir if self.spillDir is not None else tempfile.mkdtemp(prefix='enumeration')
+        os.makedirs(directory, exist_ok=True)
+        try:
+            pegs = self.pegs.bit_count()
+            #A partition is either a (boards, counts) tuple of arrays or the name of its files on disk.
+            level = [(np.array([packBoard(self.board, self.pegs)], dtype=np.uint64), np.ones(1, dtype=np.uint64))]
+            self.levels.append((pegs, 1, 0.0))
+            growth = 1
+            while True:
+                start = time.time()
+                size = self.levelSize(level)
+                if pegs == 1:
+                    self.countSolutions(level)
+                    self.freeLevel(level)
+                    break
+                partitions = 1
+                if self.maxBoards is not None:
+                    #The size of the next level is not known before it is built, so it is guessed from how much the last level grew.
+                    partitions = max(1, -(-size * max(growth, 1) // self.maxBoards))
+                nextLevel = self.expandLevel(level, partitions, directory, len(self.levels))
+                self.freeLevel(level)
+                level = nextLevel
+                pegs -= 1
+                nextSize = self.levelSize(level)
+                if nextSize == 0:
+                    self.freeLevel(level)
+                    break
+                growth = -(-nextSize // size)
+                self.levels.append((pegs, nextSize, time.time() - start))
+        finally:
+            if self.spillDir is None:
+                shutil.rmtree(directory, ignore_errors=True)
+        return self
+
+    '''
+    This function builds the next level from the partitions of a level. The children of every chunk of boards are merged and split by their value into
+    the partitions of the next level, which are merged again once every chunk is done.
+
+    Input:  [level] List of the partitions of the level.
+            [partitions] Number of partitions of the next level (1 keeps it in memory, unless its children do not fit in maxBoards).
+            [directory] Directory where the partitions are spilled.
+            [depth] Number of the next level, used to name its files.
+
+    Output: List of the partitions of the next level.
+    '''
+
+    def expandLevel(self, level, partitions, directory, depth):
+        names = self.partitionNames(directory, depth, partitions)
+        #The children that are kept in memory while the level has a single partition.
+        pieces = []
+        held = 0
+        total = self.levelSize(level)
+        done = 0
+        for boards, counts in self.readLevel(level):
+            children, childCounts = expandBoards(boards, counts, self.jumps)
+            done += len(boards)
+            if partitions == 1:
+                pieces.append((children, childCounts))
+                held += len(children)
+                if self.maxBoards is None or held <= self.maxBoards:
+                    continue
+                #The level was guessed to fit in memory but its children do not, so the duplicates are merged, and if that leaves more than half of
+                #the budget the children are spilled to as many partitions as the level now looks like it needs.
+                children, childCounts = mergeDuplicates(np.concatenate([boards for boards, counts in pieces]),
+                                                        np.concatenate([counts for boards, counts in pieces]))
+                if len(children) <= self.maxBoards // 2:
+                    pieces = [(children, childCounts)]
+                    held = len(children)
+                    continue
+                pieces = []
+                partitions = max(2, -(-len(children) * total // (done * self.maxBoards)))
+                names = self.partitionNames(directory, depth, partitions)
+            #Boards are split by their value, so the partitions are also sorted between them and the whole level is one sorted array.
+            bounds = np.searchsorted(children, self.partitionBounds(partitions))
+            for p, (low, high) in enumerate(zip(np.concatenate(([0], bounds)), np.concatenate((bounds, [len(children)])))):
+                with open(names[p] + '.boards', 'ab') as f:
+                    children[low:high].tofile(f)
+                with open(names[p] + '.counts', 'ab') as f:
+                    childCounts[low:high].tofile(f)
+
+        if partitions == 1:
+            return [mergeDuplicates(np.concatenate([boards for boards, counts in pieces] or [np.zeros(0, dtype=np.uint64)]),
+                                    np.concatenate([counts for boards, counts in pieces] or [np.zeros(0, dtype=np.uint64)]))]
+        nextLevel = []
+        for name in names:
+            if not os.path.exists(name + '.boards'):
+                continue
+            boards, counts = mergeDuplicates(np.fromfile(name + '.boards', dtype=np.uint64), np.fromfile(name + '.counts', dtype=np.uint64))
+            boards.tofile(name + '.boards')
+            counts.tofile(name + '.counts')
+            self.spilled += 1
+            nextLevel.append(name)
+        return nextLevel
+
+    '''
+    This function returns the names of the files of the partitions of a level, and removes the files a previous run may have left with those names.
+    '''
+
+    def partitionNames(self, directory, depth, partitions):
+        names = [os.path.join(directory, "level%d.%d" % (depth, p)) for p in range(partitions)]
+        for name in names:
+            for suffix in ('.boards', '.counts'):
+                if os.path.exists(name + suffix):
+                    os.remove(name + suffix)
+        return names
+
+    '''
+    This function returns the values that split the packed boards into partitions of the same range.
+    '''
+
+    def partitionBounds(self, partitions):
+        top = 1 << len(self.board.pegCells(self.board.holes))
+        return np.array([top * p // partitions for p in range(1, partitions)], dtype=np.uint64)
+
+    '''
+    This function reads the boards of a level in chunks. Spilled partitions are mapped to memory, so only the chunk that is used is read.
+
+    Input:  [level] List of the partitions of the level.
+
+    Output: Generator of (boards, counts) tuples of arrays.
+    '''
+
+    def readLevel(self, level):
+        for partition in level:
+            if isinstance(partition, str):
+                if os.path.getsize(partition + '.boards') == 0:
+                    continue
+                boards = np.memmap(partition + '.boards', dtype=np.uint64, mode='r')
+                counts = np.memmap(partition + '.counts', dtype=np.uint64, mode='r')
+            else:
+                boards, counts = partition
+            for start in range(0, len(boards), CHUNK):
+                yield np.array(boards[start:start + CHUNK]), np.array(counts[start:start + CHUNK])
+
+    def levelSize(self, level):
+        return sum(os.path.getsize(partition + '.boards') // 8 if isinstance(partition, str) else len(partition[0]) for partition in level)
+
+    '''
+    This function removes the files of the spilled partitions of a level once the next level is built.
+    '''
+
+    def freeLevel(self, level):
+        for partition in level:
+            if isinstance(partition, str):
+                os.remove(partition + '.boards')
+                os.remove(partition + '.counts')
+
+    '''
+    This function counts the solutions that end on each final hole from the last level, where a single peg is left.
+    '''
+
+    def countSolutions(self, level):
+        holeCells = self.board.pegCells(self.board.holes)
+        for boards, counts in self.readLevel(level):
+            for packed, count in zip(boards.tolist(), counts.tolist()):
+                cell = holeCells[packed.bit_length() - 1]
+                self.finalHoles[cell] = self.finalHoles.get(cell, 0) + count
+                self.solutions += count
+
+    '''
+    This function returns the results as a dictionary that can be written as JSON. Cells are given as [line, column], counted from 1 like the moves.
+    '''
+
+    def summary(self):
+        columns = self.board.columns
+        return {'solutions': self.solutions,
+                'levels': [{'pegs': pegs, 'boards': boards, 'seconds': seconds} for pegs, boards, seconds in self.levels],
+                'reachable': sum(boards for pegs, boards, seconds in self.levels),
+                'finalHoles': [{'hole': [cell // columns + 1, cell % columns + 1], 'solutions': count} for cell, count in sorted(self.finalHoles.items())],
+                'spilled': self.spilled}
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Counts the solutions and the reachable boards of a Peg Solitaire problem.")
+    parser.add_argument("input", help="file that contains the problem")
+    parser.add_argument("--max-boards", type=int, default=None, help="maximum number of boards of a level kept in memory before it is spilled to disk")
+    parser.add_argument("--spill-dir", default=None, help="directory where the levels are spilled (a temporary directory if omitted)")
+    parser.add_argument("--output", default=None, help="file where the results are written as JSON")
+    args = parser.parse_args()
+
+    board = Board.fromFile(args.input)
+    start = time.time()
+    enumerator = Enumerator(board.geometry(), board.pegs, args.max_boards, args.spill_dir).run()
+    print(time.time() - start, "seconds")
+    print("%6s %14s %10s" % ("pegs", "boards", "seconds"))
+    for pegs, boards, seconds in enumerator.levels:
+        print("%6d %14d %10.3f" % (pegs, boards, seconds))
+    summary = enumerator.summary()
+    print("Reachable:", summary['reachable'], "boards")
+    print("Solutions:", summary['solutions'])
+    for hole in summary['finalHoles']:
+        print("Final hole (%d, %d): %d solutions" % (hole['hole'][0], hole['hole'][1], hole['solutions']))
+    if enumerator.spilled:
+        print("Spilled:", enumerator.spilled, "partitions")
+    if args.output is not None:
+        with open(args.output, 'w') as f:
+            json.dump(summary, f, indent=1)
+            f.write('\n')
@@ -0,0 +1,433 @@
+'''
+This module implements a breadth-first search whose boards are kept on disk instead of in memory, for the boards that are too large for the memory of the
+other solvers. Every jump removes one peg, so the boards of the search are split into levels by their number of pegs and a board can only be reached again
+inside its own level: each level is both the frontier of the search and its set of visited boards, and the levels before it never have to be checked.
+
+A level is a file of the boards (packed into fixed-width keys, see packKey) sorted in ascending order. The children of a level are built in chunks, the
+children of a few chunks are sorted in memory and written as a sorted run, and the runs are merged into the next level by a streaming merge that removes the
+duplicates, so the memory never holds more than the given budget. The levels stay on disk, so once a board with a single peg is reached the solution is
+rebuilt by going back up the levels and looking up the parents of each board with a binary search in the memory mapped files.
+
+After every level the directory holds a checkpoint, so a search that was interrupted (or stopped by a limit) goes on from the last complete level when it is
+started again with the same directory.
+'''
+
+import json
+import os
+import numpy as np
+from Pruning import EPSILON, PRUNE_RULES
+
+CHECKPOINT = 'checkpoint.json'
+
+#Maximum number of runs merged at once. When there are more, they are merged in several passes, so the blocks of the runs never get too small.
+FAN_IN = 32
+
+#Version of the files of the directory, so a checkpoint of an older format is not resumed.
+VERSION = 1
+
+'''
+This function packs a board into a fixed-width key: bit i of the key is set if the i-th hole of the layout (counted line by line) has a peg, and the key is
+stored big-endian, so comparing keys byte by byte is the same as comparing them as numbers.
+
+Input:  [holeCells] List of the cells of the holes of the layout.
+        [width] Number of bytes of a key.
+        [pegs] Integer bitmask of the pegs of the board.
+
+Output: The key as bytes.
+'''
+
+def packKey(holeCells,width,pegs):
+    packed = 0
+    for index, cell in enumerate(holeCells):
+        if pegs >> cell & 1:
+            packed |= 1 << index
+    return packed.to_bytes(width, 'big')
+
+'''
+This function unpacks a key packed by packKey.
+
+Input:  [holeCells] List of the cells of the holes of the layout.
+        [key] The key as bytes.
+
+Output: Integer bitmask of the pegs of the board.
+'''
+
+def unpackKey(holeCells,key):
+    packed = int.from_bytes(key, 'big')
+    return sum(1 << cell for index, cell in enumerate(holeCells) if packed >> index & 1)
+
+'''
+This class implements the search. Keys are handled as 2 dimensional arrays of bytes (one line for each board) for the jumps and the pruning rules, and as
+arrays of fixed-width byte strings for sorting and merging.
+
+Input:  [board] BoardGeometry of the problem.
+        [pegs] Integer bitmask of the pegs of the starting board.
+        [directory] Directory of the level files and of the checkpoint.
+        [ramBudget] Number of bytes of memory the boards of the search may use.
+        [pruner] Pruner whose rules are applied to the children (None for no pruning).
+
+Attributes: [levels] List of the number of boards of each level.
+            [stats] Dictionary with the number of boards stored (misses), of repeated boards that were merged (hits), of sorted runs that were written
+                    (runs) and of the boards cut by each pruning rule (prunes).
+'''
+
+class ExternalSearch:
+    def __init__(self, board, pegs, directory, ramBudget, pruner=None):
+        self.board = board
+        self.pegs = pegs
+        self.directory = directory
+        self.holeCells = board.pegCells(board.holes)
+        self.width = (len(self.holeCells) + 7) // 8
+        self.dtype = np.dtype('S%d' % self.width)
+        self.levels = []
+        self.stats = {'hits': 0, 'misses': 0, 'runs': 0, 'prunes': dict.fromkeys(PRUNE_RULES, 0)}
+
+        #Each jump only touches the bytes of its 3 holes, so only those columns of the keys are checked and flipped.
+        self.jumps = []
+        for cells in board.jumpCells:
+            fromOver, to = self.maskBytes(1 << cells[0] | 1 << cells[1]), self.maskBytes(1 << cells[2])
+            columns = np.flatnonzero(fromOver | to)
+            self.jumps.append((columns, fromOver[columns], to[columns], (fromOver | to)[columns]))
+
+        #The rules of the Pruner as the columns of a matrix with a line for each bit of a key, so all the rules of a block of boards are a single
+        #matrix product: for each final hole, the number of pegs that can reach it, the number of pegs on each pagoda it needs and the value of the
+        #distance pagoda.
+        self.rules = None
+        self.prune = pruner is not None
+        if pruner is not None:
+            self.rules = []
+            columns = []
+            for reaching, pagodas, rings in pruner.rules:
+                first = len(columns)
+                columns.append(reaching)
+                columns.extend(pagodas)
+                columns.append(rings)
+                self.rules.append((first, first + 1 + len(pagodas)))
+            self.ruleMatrix = np.zeros((8 * self.width, len(columns)))
+            for column, rule in enumerate(columns):
+                for value, mask in (rule if isinstance(rule, list) else [(1.0, rule)]):
+                    for index, cell in enumerate(self.holeCells):
+                        if mask >> cell & 1:
+                            #unpackbits puts the highest bit of the first byte first.
+                            self.ruleMatrix[8 * self.width - 1 - index, column] = value
+
+        #The budget is split so that a chunk of a level and all its children fit in it, and so does a run while it is sorted, which takes about 6
+        #copies of its keys padded to whole 64 bit words.
+        self.chunkRows = max(1, ramBudget // (4 * self.width * (len(self.jumps) + 1)))
+        self.runRows = max(1, ramBudget // (48 * ((self.width + 7) // 8)))
+
+    '''
+    This function returns the bytes of the key of a bitmask of cells as an array.
+    '''
+
+    def maskBytes(self, cells):
+        return np.frombuffer(packKey(self.holeCells, self.width, cells), dtype=np.uint8)
+
+    def levelFile(self, level):
+        return os.path.join(self.directory, "level%03d.keys" % level)
+
+    '''
+    This function returns the values that identify the problem in the checkpoint.
+    '''
+
+    def problem(self):
+        return {'version': VERSION, 'lines': self.board.lines, 'columns': self.board.columns, 'holes': "%x" % self.board.holes, 'pegs': "%x" % self.pegs,
+                'prune': self.prune}
+
+    '''
+    This function writes the checkpoint after a level is complete. It is written to a temporary file first, so an interruption never leaves half of it.
+    '''
+
+    def saveCheckpoint(self):
+        checkpoint = dict(self.problem(), levels=self.levels, stats=self.stats)
+        temporary = os.path.join(self.directory, CHECKPOINT + '.tmp')
+        with open(temporary, 'w') as f:
+            json.dump(checkpoint, f)
+        os.replace(temporary, os.path.join(self.directory, CHECKPOINT))
+
+    '''
+    This function reads the checkpoint of the directory, or writes the first level if there is none.
+
+    Output: True--> if the search goes on from a checkpoint
+            False--> if it starts from the starting board.
+    '''
+
+    def loadCheckpoint(self):
+        os.makedirs(self.directory, exist_ok=True)
+        path = os.path.join(self.directory, CHECKPOINT)
+        if os.path.exists(path):
+            with open(path) as f:
+                checkpoint = json.load(f)
+            if {name: checkpoint.get(name) for name in self.problem()} != self.problem():
+                raise ValueError("The directory " + self.directory + " holds the search of another problem")
+            self.levels = checkpoint['levels']
+            self.stats = checkpoint['stats']
+            return True
+        with open(self.levelFile(0), 'wb') as f:
+            f.write(packKey(self.holeCells, self.width, self.pegs))
+        self.levels = [1]
+        self.stats['misses'] = 1
+        self.saveCheckpoint()
+        return False
+
+    '''
+    This function maps a level file to memory as an array of keys.
+    '''
+
+    def readLevel(self, level):
+        if self.levels[level] == 0:
+            return np.zeros(0, dtype=self.dtype)
+        return np.memmap(self.levelFile(level), dtype=self.dtype, mode='r')
+
+    '''
+    This function builds the children of some boards.
+
+    Input:  [keys] Array of the keys of the boards.
+
+    Output: Array of the keys of the children (with the duplicates).
+    '''
+
+    def expand(self, keys):
+        rows = np.frombuffer(keys.tobytes(), dtype=np.uint8).reshape(-1, self.width)
+        children = []
+        for columns, fromOver, to, flip in self.jumps:
+            touched = rows[:, columns]
+            legal = np.all((touched & fromOver) == fromOver, axis=1) & ~np.any(touched & to, axis=1)
+            child = rows[legal]
+            child[:, columns] ^= flip
+            children.append(child)
+        return np.ascontiguousarray(np.concatenate(children)).view(self.dtype).ravel()
+
+    '''
+    This function applies the rules of the Pruner to a 2 dimensional array of keys, like Pruner.prune does to a single board.
+
+    Output: Boolean array that is True for the boards that may still be solved.
+    '''
+
+    def survivors(self, rows):
+        prunes = self.stats['prunes']
+        if not self.rules:
+            prunes['parity'] += len(rows)
+            return np.zeros(len(rows), dtype=bool)
+        alive = np.zeros(len(rows), dtype=bool)
+        #The bits of the keys take 64 times the memory of the keys as floats, so they are unpacked a block at a time.
+        block = max(1, self.runRows // 64)
+        for start in range(0, len(rows), block):
+            values = np.unpackbits(rows[start:start + block], axis=1) @ self.ruleMatrix
+            #The rule that cut each board for the last final hole is the one that is counted, as in Pruner.prune.
+            for first, distance in self.rules:
+                reached = values[:, first] > 0
+                covered = np.all(values[:, first:distance] > 0, axis=1)
+                alive[start:start + block] |= covered & (values[:, distance] >= 1 - EPSILON)
+            cut = ~alive[start:start + block]
+            prunes['class'] += int(np.count_nonzero(cut & ~reached))
+            prunes['pagoda'] += int(np.count_nonzero(cut & reached & ~covered))
+            prunes['distance'] += int(np.count_nonzero(cut & covered))
+        return alive
+
+    '''
+    This function builds the next level: the children of the level are sorted in runs that fit in the budget and the runs are merged.
+
+    Input:  [level] Number of the level.
+            [stop] Watchdog that is checked after each chunk (None for no time or memory budget).
+
+    Output: Number of boards of the next level, or None if stop said the budget was spent (the runs of the level are removed).
+    '''
+
+    def expandLevel(self, level, stop=None):
+        keys = self.readLevel(level)
+        runs = []
+        buffer = []
+        buffered = 0
+        generated = 0
+        pruned = sum(self.stats['prunes'].values())
+        for start in range(0, len(keys), self.chunkRows):
+            children = self.expand(keys[start:start + self.chunkRows])
+            generated += len(children)
+            buffer.append(children)
+            buffered += len(children)
+            if buffered >= self.runRows:
+                runs.append(self.writeRun(buffer, level + 1, len(runs)))
+                buffer = []
+                buffered = 0
+            if stop is not None and stop():
+                for run in runs:
+                    os.remove(run)
+                return None
+        if buffer or not runs:
+            runs.append(self.writeRun(buffer, level + 1, len(runs)))
+        del keys
+        self.stats['runs'] += len(runs)
+        merges = 0
+        while len(runs) > FAN_IN:
+            merged = []
+            for start in range(0, len(runs), FAN_IN):
+                group = runs[start:start + FAN_IN]
+                merged.append(os.path.join(self.directory, "level%03d.merge%d" % (level + 1, merges)))
+                merges += 1
+                self.mergeRuns(group, merged[-1])
+                for run in group:
+                    os.remove(run)
+            runs = merged
+        size = self.mergeRuns(runs, self.levelFile(level + 1))
+        for run in runs:
+            os.remove(run)
+        self.stats['hits'] += generated - size - (sum(self.stats['prunes'].values()) - pruned)
+        self.stats['misses'] += size
+        return size
+
+    '''
+    This function sorts the buffered children, removes their duplicates, cuts the ones the pruning rules reject and writes the rest as a run.
+    '''
+
+    def writeRun(self, buffer, level, index):
+        name = os.path.join(self.directory, "level%03d.run%d" % (level, index))
+        keys = self.sortUnique(np.concatenate(buffer)) if buffer else np.zeros(0, dtype=self.dtype)
+        if self.rules is not None and len(keys):
+            keys = keys[self.survivors(np.frombuffer(keys.tobytes(), dtype=np.uint8).reshape(-1, self.width))]
+        keys.tofile(name)
+        return name
+
+    '''
+    This function sorts an array of keys and removes its duplicates. Keys of up to 8 bytes are sorted as 64 bit integers, which is much faster than
+    sorting byte strings.
+    '''
+
+    def sortUnique(self, keys):
+        if len(keys) == 0:
+            return keys
+        if self.width <= 8:
+            rows = np.zeros((len(keys), 8), dtype=np.uint8)
+            rows[:, 8 - self.width:] = np.frombuffer(keys.tobytes(), dtype=np.uint8).reshape(-1, self.width)
+            numbers = np.sort(rows.view('>u8').ravel().astype(np.uint64))
+            numbers = numbers[np.concatenate(([True], numbers[1:] != numbers[:-1]))]
+            rows = numbers.astype('>u8').view(np.uint8).reshape(-1, 8)[:, 8 - self.width:]
+            return np.ascontiguousarray(rows).view(self.dtype).ravel()
+        keys = np.sort(keys)
+        return keys[np.concatenate(([True], keys[1:] != keys[:-1]))]
+
+    '''
+    This function merges sorted runs into a level file and removes the duplicates between them. Each step takes a block of every run, cuts the blocks at the
+    smallest of their last keys and merges what comes before the cut, so every key that is merged is smaller than the keys that are left in every run.
+
+    Input:  [runs] List of the names of the run files.
+            [output] Name of the level file.
+
+    Output: Number of keys of the level.
+    '''
+
+    def mergeRuns(self, runs, output):
+        sources = [np.memmap(run, dtype=self.dtype, mode='r') for run in runs if os.path.getsize(run) > 0]
+        positions = [0] * len(sources)
+        block = max(1, self.runRows // (2 * FAN_IN))
+        size = 0
+        temporary = output + '.tmp'
+        with open(temporary, 'wb') as f:
+            while True:
+                active = [i for i in range(len(sources)) if positions[i] < len(sources[i])]
+                if not active:
+                    break
+                heads = {i: sources[i][positions[i]:positions[i] + block] for i in active}
+                cut = min(head[-1] for head in heads.values())
+                parts = []
+                for i, head in heads.items():
+                    count = int(np.searchsorted(head, cut, side='right'))
+                    parts.append(np.array(head[:count]))
+                    positions[i] += count
+                merged = self.sortUnique(np.concatenate(parts))
+                merged.tofile(f)
+                size += len(merged)
+        del sources
+        os.replace(temporary, output)
+        return size
+
+    '''
+    This function finds the moves that lead from the starting board to a board of a level, going back up the levels.
+
+    Input:  [level] Number of the level of the board.
+            [key] Key of the board.
+
+    Output: List of jump ids.
+    '''
+
+    def rebuild(self, level, key):
+        jumps = self.board.jumps
+        pegs = unpackKey(self.holeCells, key)
+        moves = []
+        for parentLevel in range(level - 1, -1, -1):
+            parents = self.readLevel(parentLevel)
+            for k in self.board.legalUnjumps(pegs):
+                parentKey = packKey(self.holeCells, self.width, pegs ^ jumps[k][2])
+                index = int(np.searchsorted(parents, parentKey))
+                if index < len(parents) and parents[index:index + 1].tobytes() == parentKey:
+                    moves.append(k)
+                    pegs ^= jumps[k][2]
+                    break
+        moves.reverse()
+        return moves
+
+    '''
+    This function runs the search, starting from the checkpoint of the directory if there is one.
+
+    Input:  [maxNodes] Maximum number of boards stored by this run before the search stops (None for no limit). The boards of the levels that were
+                       stored before the checkpoint do not count, so a search that goes on from a checkpoint gets the whole limit again.
+            [stop] Watchdog of the time and memory budget (None for no budget). A level that is stopped is searched again when the search goes on.
+
+    Output: Tuple (status, moves) where status is 1 if a solution was found, 0 if the board cannot be solved and -1 if the search stopped at the limit,
+            and moves is the list of the jump ids of the solution or, if there is none, to a board of the deepest level that is not empty.
+    '''
+
+    def run(self, maxNodes=None, stop=None):
+        #The stats of a checkpoint hold the boards of the runs before it, which are not counted against the limit of this run.
+        stored = self.stats['misses'] if self.loadCheckpoint() else 0
+        start = self.pegs.bit_count()
+        while True:
+            level = len(self.levels) - 1
+            if self.levels[level] == 0:
+                return 0, self.rebuild(level - 1, self.readLevel(level - 1)[:1].tobytes()) if level > 0 else []
+            if start - level == 1:
+                key = self.readLevel(level)[:1].tobytes()
+                return 1, self.rebuild(level, key)
+            if maxNodes is not None and self.stats['misses'] - stored >= maxNodes:
+                return -1, self.rebuild(level, self.readLevel(level)[:1].tobytes())
+            size = self.expandLevel(level, stop)
+            if size is None:
+                return -1, self.rebuild(level, self.readLevel(level)[:1].tobytes())
+            self.levels.append(size)
+            self.saveCheckpoint()
+
+'''
+This function solves a board with the disk-backed breadth-first search.
+
+Input:  [board] BoardGeometry of the problem.
+        [pegs] Integer bitmask of the pegs of the starting board.
+        [path] List where the moves of the solution are stored.
+        [stats] Dictionary where the counters of the search are stored.
+        [directory] Directory of the level files and of the checkpoint.
+        [ramBudget] Number of bytes of memory the boards of the search may use.
+        [pruner] Pruner whose rules are applied to the children (None for no pruning).
+        [maxNodes] Maximum number of boards stored by this call before the search stops (None for no limit).
+        [stop] Watchdog of the time and memory budget (None for no budget, see Budget.py).
+        [partial] List that is filled with the jump ids to a board of the deepest level when there is no solution (None if not needed).
+
+Output: 1--> if a solution was found
+        0--> if the board cannot be solved
+        -1--> if the search stopped at a limit (it goes on from there when it is run again with the same directory).
+'''
+
+def external_solver(board,pegs,path,stats,directory,ramBudget,pruner=None,maxNodes=None,stop=None,partial=None):
+    search = ExternalSearch(board, pegs, directory, ramBudget, pruner)
+    if pruner is not None and pruner.prune(pegs):
+        status, moves = 0, []
+    else:
+        status, moves = search.run(maxNodes, stop)
+    if status == 1:
+        path.extend(board.jumpMoves[k] for k in moves)
+    elif partial is not None:
+        partial[:] = moves
+    stats.update(hits=search.stats['hits'], misses=search.stats['misses'], evictions=0, size=sum(search.levels), levels=len(search.levels),
+                 runs=search.stats['runs'])
+    if pruner is not None:
+        for rule, count in search.stats['prunes'].items():
+            pruner.prunes[rule] += count
+    return status
@@ -0,0 +1,266 @@
+'''
+This module computes the heuristic values the Best-First solvers use in order to order the moves of a board. All the functions score every child (the
+board that results from each legal move) of a board in one call, and there are two versions of each heuristic:
+
+    The incremental versions compute a few sums of the current board once and then score each child from them in constant time, since a move only changes
+    three cells (the peg that jumps, the peg that is removed and the hole the peg lands on).
+    The batch versions build a NumPy matrix with one row for each child and score all the rows at once with vectorized operations (coordinate sums,
+    bounding-box reductions and neighbour shifts), so their cost does not depend on the number of Python steps per peg.
+
+Both versions give exactly the same (integer) values as the original heuristics, so the order of the moves never changes. The solvers use the incremental
+versions unless board.batchScoring is set: on the boards we solve (up to about 20x20 cells) the cost of building the arrays for each board is still larger
+than the Python steps the incremental versions need.
+'''
+
+import numpy as np
+
+'''
+This function returns the number of pegs on each line and each column of the board.
+
+Input:  [board] BoardGeometry of the problem.
+        [pegs] Integer bitmask of the pegs of the current board.
+
+Output: [lineCounts] List with the number of pegs of each line.
+        [columnCounts] List with the number of pegs of each column.
+'''
+
+def lineColumnCounts(board,pegs):
+    lineCounts = [(pegs & mask).bit_count() for mask in board.lineMasks]
+    columnCounts = [(pegs & mask).bit_count() for mask in board.columnMasks]
+    return lineCounts,columnCounts
+
+'''
+This function computes, for every coordinate value x (a line or a column), the sum of the distances |x-y| to the coordinates y of all the pegs, given how many
+pegs there are at each coordinate. Going through the coordinates in increasing order, the pegs before x add x*before-sumBefore and the pegs after it add
+sumAfter-x*after, where before/after and sumBefore/sumAfter are their number and the sum of their coordinates.
+
+Input:  [counts] List with the number of pegs at each coordinate.
+
+Output: List with the sum of distances for each coordinate.
+'''
+
+def distanceSums(counts):
+    total = sum(counts)
+    totalSum = sum(x * count for x, count in enumerate(counts))
+    before = 0
+    sumBefore = 0
+    sums = []
+    for x, count in enumerate(counts):
+        sums.append(x*before - sumBefore + (totalSum - sumBefore) - x*(total - before))
+        before += count
+        sumBefore += x * count
+    return sums
+
+'''
+This function is the incremental version of the Manhattan heuristic. The total distance of a board counts the Manhattan Distance of each peg with every
+other peg (each pair twice), so it is twice the sum D over all the pairs of pegs. For the current board the sum of distances of every line and column to
+all the pegs is computed once. When a move removes the pegs f (from) and o (over) and adds a peg at t (to), the sum of the pairs of the child is
+
+    D - dist(f, pegs) - (dist(o, pegs) - |o-f|) + (dist(t, pegs) - |t-f| - |t-o|)
+
+where dist(x, pegs) is the sum of distances of cell x to all the pegs of the current board, the sum of the distance sums of its line and its column.
+
+Input:  [board] BoardGeometry of the problem.
+        [pegs] Integer bitmask of the pegs of the current board.
+        [jumpIds] List of the legal jumps of the current board.
+
+Output: List with the total distance of the child of each jump.
+'''
+
+def manhattanScores(board,pegs,jumpIds):
+    lineCounts,columnCounts = lineColumnCounts(board,pegs)
+    lineSums = distanceSums(lineCounts)
+    columnSums = distanceSums(columnCounts)
+    cellLine = board.cellLine
+    cellColumn = board.cellColumn
+    #Each pair of pegs appears twice in the sums of all the pegs.
+    pairs = (sum(c * s for c, s in zip(lineCounts, lineSums)) + sum(c * s for c, s in zip(columnCounts, columnSums))) // 2
+
+    scores = []
+    for k in jumpIds:
+        f, o, t = board.jumpCells[k]
+        fL, fC, oL, oC, tL, tC = cellLine[f], cellColumn[f], cellLine[o], cellColumn[o], cellLine[t], cellColumn[t]
+        childPairs = (pairs - (lineSums[fL] + columnSums[fC])
+                      - (lineSums[oL] + columnSums[oC] - abs(oL - fL) - abs(oC - fC))
+                      + (lineSums[tL] + columnSums[tC] - abs(tL - fL) - abs(tC - fC) - abs(tL - oL) - abs(tC - oC)))
+        scores.append(2 * childPairs)
+    return scores
+
+'''
+This function is used by areaScores in order to find the extent (max-min+1) of the pegs of a child along the lines or the columns. The counts of the
+current board are changed for the 3 cells of the move, the bounds of the current board are moved only as far as needed and the counts are restored.
+
+Input:  [counts] List with the number of pegs at each coordinate of the current board.
+        [low] Smallest coordinate with a peg on the current board.
+        [high] Largest coordinate with a peg on the current board.
+        [f], [o], [t] The coordinates of the from, over and to cells of the move.
+
+Output: The extent of the pegs of the child.
+'''
+
+def childExtent(counts,low,high,f,o,t):
+    counts[f] -= 1
+    counts[o] -= 1
+    counts[t] += 1
+    if t < low:
+        low = t
+    if t > high:
+        high = t
+    #The child always has at least one peg, so both loops stop.
+    while not counts[low]:
+        low += 1
+    while not counts[high]:
+        high -= 1
+    counts[f] += 1
+    counts[o] += 1
+    counts[t] -= 1
+    return high - low + 1
+
+'''
+This function is the incremental version of the Area heuristic. The lines and columns of the bounding box of the current board are found once, and the
+bounding box of each child is found by updating the line and column counts for the 3 cells of its move.
+
+Input:  [board] BoardGeometry of the problem.
+        [pegs] Integer bitmask of the pegs of the current board.
+        [jumpIds] List of the legal jumps of the current board.
+
+Output: List with the Total Square Area covered by the pegs of the child of each jump.
+'''
+
+def areaScores(board,pegs,jumpIds):
+    lineCounts,columnCounts = lineColumnCounts(board,pegs)
+    lines = [line for line, count in enumerate(lineCounts) if count]
+    columns = [column for column, count in enumerate(columnCounts) if count]
+    minLine,maxLine,minColumn,maxColumn = lines[0],lines[-1],columns[0],columns[-1]
+    cellLine = board.cellLine
+    cellColumn = board.cellColumn
+
+    scores = []
+    for k in jumpIds:
+        f, o, t = board.jumpCells[k]
+        height = childExtent(lineCounts,minLine,maxLine,cellLine[f],cellLine[o],cellLine[t])
+        width = childExtent(columnCounts,minColumn,maxColumn,cellColumn[f],cellColumn[o],cellColumn[t])
+        scores.append(height * width)
+    return scores
+
+'''
+This function computes the Rating heuristic of each child: the number of available moves plus the number of pegs that are not isolated. Both counts are
+computed with a constant number of whole-board shifts and masks on the peg bitmask (see BoardGeometry.countLegalJumps and countNonIsolated), so they
+already cost the same few integer operations whatever the number of pegs, and an incremental update over the cells near the move would only add steps.
+
+Input:  [board] BoardGeometry of the problem.
+        [pegs] Integer bitmask of the pegs of the current board.
+        [jumpIds] List of the legal jumps of the current board.
+
+Output: List with the rating of the child of each jump.
+'''
+
+def ratingScores(board,pegs,jumpIds):
+    jumps = board.jumps
+    scores = []
+    for k in jumpIds:
+        nextPegs = pegs ^ jumps[k][2]
+        scores.append(board.countNonIsolated(nextPegs) + board.countLegalJumps(nextPegs))
+    return scores
+
+'''
+This function builds the NumPy matrix of the children of a board, with one row of 0/1 cells for each child. The rows of the jumps (a matrix with the 3 cells
+of each jump set) are built once per board and kept on the BoardGeometry.
+
+Input:  [board] BoardGeometry of the problem.
+        [pegs] Integer bitmask of the pegs of the current board.
+        [jumpIds] List of the legal jumps of the current board.
+
+Output: Boolean NumPy array of shape (children, lines, columns).
+'''
+
+def childMatrix(board,pegs,jumpIds):
+    if getattr(board, 'jumpMatrix', None) is None:
+        jumpMatrix = np.zeros((len(board.jumps), board.cells), dtype=bool)
+        for k, cells in enumerate(board.jumpCells):
+            jumpMatrix[k, list(cells)] = True
+        holeRow = np.array([board.holes >> cell & 1 for cell in range(board.cells)], dtype=bool)
+        board.jumpMatrix = jumpMatrix
+        board.holeMatrix = holeRow.reshape(board.lines, board.columns)
+    size = (board.cells + 7) // 8
+    parent = np.unpackbits(np.frombuffer(pegs.to_bytes(size, 'little'), dtype=np.uint8), bitorder='little')[:board.cells].astype(bool)
+    children = parent ^ board.jumpMatrix[jumpIds]
+    return children.reshape(len(jumpIds), board.lines, board.columns)
+
+'''
+This function returns, for each row of counts (the number of pegs at each coordinate), the sum of the distances of all the pairs of pegs along that axis.
+For the coordinates in increasing order, each peg at x is farther than all the pegs before it by x minus their coordinate, so the sum is
+sum(count[x] * (x*before[x] - sumBefore[x])) where before and sumBefore are the number and the sum of the coordinates of the pegs before x.
+'''
+
+def pairDistanceSums(counts):
+    coordinates = np.arange(counts.shape[1])
+    before = np.cumsum(counts, axis=1) - counts
+    sumBefore = np.cumsum(counts * coordinates, axis=1) - counts * coordinates
+    return (counts * (coordinates * before - sumBefore)).sum(axis=1)
+
+'''
+This function is the batch version of manhattanScores.
+'''
+
+def manhattanScoresBatch(board,pegs,jumpIds):
+    children = childMatrix(board,pegs,jumpIds).astype(np.int64)
+    pairs = pairDistanceSums(children.sum(axis=2)) + pairDistanceSums(children.sum(axis=1))
+    return (2 * pairs).tolist()
+
+'''
+This function is the batch version of areaScores.
+'''
+
+def areaScoresBatch(board,pegs,jumpIds):
+    children = childMatrix(board,pegs,jumpIds)
+    lines = children.any(axis=2)
+    columns = children.any(axis=1)
+    #argmax finds the first True value, on the reversed rows it finds the last one.
+    height = lines.shape[1] - np.argmax(lines[:, ::-1], axis=1) - np.argmax(lines, axis=1)
+    width = columns.shape[1] - np.argmax(columns[:, ::-1], axis=1) - np.argmax(columns, axis=1)
+    return (height * width).tolist()
+
+'''
+This function is the batch version of ratingScores.
+'''
+
+def ratingScoresBatch(board,pegs,jumpIds):
+    children = childMatrix(board,pegs,jumpIds)
+    empty = board.holeMatrix & ~children
+    #A move needs a peg, a peg next to it and an empty hole after that, in one of the 4 directions.
+    moves = ((children[:, :, :-2] & children[:, :, 1:-1] & empty[:, :, 2:]).sum(axis=(1, 2))
+             + (children[:, :, 2:] & children[:, :, 1:-1] & empty[:, :, :-2]).sum(axis=(1, 2))
+             + (children[:, :-2, :] & children[:, 1:-1, :] & empty[:, 2:, :]).sum(axis=(1, 2))
+             + (children[:, 2:, :] & children[:, 1:-1, :] & empty[:, :-2, :]).sum(axis=(1, 2)))
+    neighbours = np.zeros_like(children)
+    neighbours[:, :, :-1] |= children[:, :, 1:]
+    neighbours[:, :, 1:] |= children[:, :, :-1]
+    neighbours[:, :-1, :] |= children[:, 1:, :]
+    neighbours[:, 1:, :] |= children[:, :-1, :]
+    nonIsolated = (children & neighbours).sum(axis=(1, 2))
+    return (moves + nonIsolated).tolist()
+
+#The incremental and the batch version of each heuristic.
+HEURISTICS = {'manhattan': (manhattanScores, manhattanScoresBatch),
+              'area': (areaScores, areaScoresBatch),
+              'rating': (ratingScores, ratingScoresBatch)}
+
+'''
+This function scores all the children of a board with the given heuristic, using the batch version if board.batchScoring is set and the incremental one otherwise.
+
+Input:  [heuristic] Name of the heuristic (manhattan, area or rating).
+        [board] BoardGeometry of the problem.
+        [pegs] Integer bitmask of the pegs of the current board.
+        [jumpIds] List of the legal jumps of the current board.
+
+Output: List with the score of the child of each jump.
+'''
+
+def scoreChildren(heuristic,board,pegs,jumpIds):
+    if not jumpIds:
+        return []
+    incremental,batch = HEURISTICS[heuristic]
+    if board.batchScoring:
+        return batch(board,pegs,jumpIds)
+    return incremental(board,pegs,jumpIds)
@@ -0,0 +1,139 @@
+'''
+This module implements an IDA* (iterative deepening A*) mode of the Best-First solvers, whose memory does not grow with the length of the search. Like the
+A* of BestFirstSearch.py it gives every board the cost f = depth + weight * h, where h is the score of the area, Manhattan or rating heuristic (negated for
+the rating, whose highest score is the best), but instead of keeping a queue of every generated board it runs depth-first searches with a threshold:
+
+    1. the threshold starts at the smallest cost of the children of the starting board,
+    2. a depth-first search expands the children in order of cost and skips every child whose cost is above the threshold,
+    3. if no solution was found the threshold is raised to the smallest cost that was skipped and the search starts again.
+
+Only the boards of the current path are kept, plus a ReplacementTable (see TranspositionTable.py) of a fixed number of slots that stores, for the boards
+whose subtree was searched without a solution, the threshold of that search. A board is always reached with the same number of moves (one peg less per
+move), so its cost does not depend on the path and it is skipped whenever it is found again with a threshold that is not larger. The table replaces the
+boards of older iterations when it is full, so the memory of the search is the size of the table, however long it runs.
+
+The heuristics do not give a lower bound of the number of moves that are left, so the first solution is not the shortest (every solution has the same
+number of moves anyway): the threshold only decides in which order the boards are searched.
+'''
+
+from BitBoard import pegCount
+from Heuristics import scoreChildren
+from TranspositionTable import ReplacementTable
+from Budget import STOP_NODES
+
+#Number of slots of the replacement table when no size is given.
+DEFAULT_SLOTS = 1 << 20
+
+'''
+This function solves a problem with IDA*.
+
+Input:  [board] BoardGeometry of the problem.
+        [pegs] Integer bitmask of the pegs of the starting board.
+        [heuristic] Name of the heuristic (area, manhattan or rating).
+        [path] List of strings where the moves of the solution are stored.
+        [stats] Dictionary that is filled with the counters of the table (hits, misses, evictions, size, slots) and the list of the iterations, each
+                with its threshold and the number of boards it expanded.
+        [weight] Weight of the heuristic score.
+        [slots] Number of slots of the replacement table (None for DEFAULT_SLOTS).
+        [pruner] Pruner that cuts the boards that cannot be solved (None for no pruning).
+        [maxNodes] Maximum number of boards that are expanded, over all the iterations, before the search stops (None for no limit).
+        [stop] Watchdog that is checked every STOP_NODES boards (None for no time or memory budget, see Budget.py).
+        [partial] List that is filled with the jump ids to the deepest board that was reached when the search fails or stops (None if not needed).
+        [report] Function that is called with the number, the threshold and the expanded boards of each iteration when it ends (None for no report).
+
+Output: 1--> if a solution was found (its moves are in path)
+        0--> if there is no solution
+        -1--> if the search stopped because of maxNodes or stop.
+'''
+
+def ida_solver(board,pegs,heuristic,path,stats,weight=1.0,slots=None,pruner=None,maxNodes=None,stop=None,partial=None,report=None):
+    table = ReplacementTable(slots if slots is not None else DEFAULT_SLOTS, board.cells)
+    sign = -1 if heuristic == 'rating' else 1
+    jumps = board.jumps
+    iterations = []
+    stats['iterations'] = iterations
+    deepest = []
+    nodes = 0
+
+    #The children of a board that are not solved at once, as (cost, jump id) pairs in order of cost (the scan order for the same cost).
+    def children(pegs, depth, legal):
+        jumpIds = board.jumpIds(legal)
+        costs = [(depth + 1) + weight * sign * score for score in scoreChildren(heuristic, board, pegs, jumpIds)]
+        return sorted(zip(costs, jumpIds), key=lambda child: child[0])
+
+    def endIteration(threshold, expanded):
+        iterations.append({'threshold': threshold, 'expanded': expanded})
+        if report is not None:
+            report(len(iterations), threshold, expanded)
+
+    def finish(status):
+        stats.update(table.stats())
+        if partial is not None and status != 1:
+            partial[:] = deepest
+        return status
+
+    if pruner is not None and pruner.prune(pegs):
+        return finish(0)
+    rootLegal = board.legalMask(pegs)
+    rootChildren = children(pegs, 0, rootLegal)
+    if not rootChildren:
+        return finish(0)
+    threshold = rootChildren[0][0]
+
+    while True:
+        expanded = 1
+        nextThreshold = None
+        #Each frame holds the board, its legal jumps, the position of the next child and the children.
+        stack = [[pegs, rootLegal, 0, rootChildren]]
+        moves_list = []
+        while stack:
+            frame = stack[-1]
+            framePegs, legal, cursor, frameChildren = frame
+            if cursor == len(frameChildren):
+                #The whole subtree of the board was searched under the threshold without a solution.
+                stack.pop()
+                if moves_list:
+                    moves_list.pop()
+                table.store(board.canonical(framePegs), threshold)
+                continue
+            cost, k = frameChildren[cursor]
+            frame[2] = cursor + 1
+            nextPegs = framePegs ^ jumps[k][2]
+
+            if pegCount(nextPegs) == 1:
+                path.extend(board.jumpMoves[j] for j in moves_list + [k])
+                endIteration(threshold, expanded)
+                return finish(1)
+
+            #The children are in order of cost, so when one is above the threshold all the others are too.
+            if cost > threshold:
+                if nextThreshold is None or cost < nextThreshold:
+                    nextThreshold = cost
+                frame[2] = len(frameChildren)
+                continue
+
+            key = board.canonical(nextPegs)
+            bound = table.lookup(key)
+            if bound is not None and bound >= threshold:
+                continue
+            if pruner is not None and pruner.prune(nextPegs):
+                #A board that cannot be solved never has to be searched again, whatever the threshold.
+                table.store(key, float('inf'))
+                continue
+
+            if nodes == maxNodes or (stop is not None and nodes % STOP_NODES == 0 and stop()):
+                endIteration(threshold, expanded)
+                return finish(-1)
+            nodes += 1
+            expanded += 1
+            moves_list.append(k)
+            if len(moves_list) > len(deepest):
+                deepest[:] = moves_list
+            nextLegal = board.updateLegalMask(legal, nextPegs, k)
+            stack.append([nextPegs, nextLegal, 0, children(nextPegs, len(moves_list), nextLegal)])
+
+        endIteration(threshold, expanded)
+        #Nothing was skipped because of the threshold, so the whole search tree was searched.
+        if nextThreshold is None:
+            return finish(0)
+        threshold = nextThreshold
@@ -0,0 +1,164 @@
+'''
+This module measures what the backtracking search (see PegSolitaireSolver.search) does while it runs, which is shared by all 4 solvers. A slow solve can be
+stuck in a subtree (the depth stays the same while the nodes grow), thrashing on duplicates (most of the children are boards of the memory) or simply have a
+huge tree (a high branching factor at every depth), and the counters tell them apart:
+
+    expanded   --> the boards that were searched (pushed on the stack) at each depth.
+    generated  --> the children that were made from the boards of each depth, so generated/expanded is the branching factor of the depth.
+    duplicates --> the children that were skipped because they were already in the memory.
+    maxDepth   --> the deepest frame of the stack.
+    ordering   --> the time spent in the move ordering of the solver (the heuristic evaluations of the best-first solvers).
+
+The search only pays for the counters when it is given a SearchMetrics. The progress is written to stderr at most every given number of seconds and only
+checked every few thousand boards, and the counters are returned as a dictionary at the end, which PegSolitaireSolver.py can write as JSON.
+
+The module also has two profiling hooks for a whole solve: cProfile, which measures every call (and slows the search down), and a sampling profiler, which
+looks at the running function a few hundred times per second from a timer signal and costs almost nothing, so it can be left on.
+'''
+
+import collections
+import signal
+import sys
+import time
+
+#The search checks whether a progress line is due every this many boards.
+PROGRESS_NODES = 4096
+
+'''
+This class holds the counters of a search.
+
+Input:  [progressEvery] Number of seconds between two progress lines on stderr (None for no progress lines).
+        [stream] File where the progress lines are written.
+'''
+
+class SearchMetrics:
+    def __init__(self, progressEvery=None, stream=None):
+        self.progressEvery = progressEvery
+        self.stream = stream if stream is not None else sys.stderr
+        self.expanded = [0]
+        self.generated = [0]
+        self.duplicates = 0
+        self.maxDepth = 0
+        self.orderCalls = 0
+        self.orderSeconds = 0.0
+        self.memorySize = 0
+        #Number of times the search was started with these counters (more than 1 when it runs in slices, see Solver.checkpointedSearch).
+        self.searches = 0
+        self.start = time.time()
+        self.reported = self.start
+
+    '''
+    This function wraps the move ordering of a solver, so the time spent in it (in the heuristics) is measured.
+
+    Input:  [orderMoves] Function that returns the ordered moves of a board (and of the move that led to it).
+
+    Output: Function with the same arguments and result.
+    '''
+
+    def timed(self, orderMoves):
+        clock = time.perf_counter
+        def timedOrderMoves(board, pegs, previous=None, legal=None):
+            started = clock()
+            moves = orderMoves(board, pegs, previous, legal)
+            self.orderSeconds += clock() - started
+            self.orderCalls += 1
+            return moves
+        return timedOrderMoves
+
+    '''
+    This function makes the lists of the counters of each depth long enough for the given depth.
+    '''
+
+    def grow(self, depth):
+        while len(self.expanded) <= depth:
+            self.expanded.append(0)
+            self.generated.append(0)
+        if depth > self.maxDepth:
+            self.maxDepth = depth
+
+    '''
+    This function is called by the search every PROGRESS_NODES boards and writes a progress line if one is due.
+
+    Input:  [depth] Depth of the top frame of the stack.
+            [memory] TranspositionTable of the search.
+    '''
+
+    def tick(self, depth, memory):
+        now = time.time()
+        if self.progressEvery is None or now - self.reported < self.progressEvery:
+            return
+        self.reported = now
+        nodes = sum(self.expanded)
+        elapsed = now - self.start
+        self.stream.write("[%.1f s] %d nodes (%.0f/s), depth %d (max %d), %d duplicates, %d boards in memory, %.1f s in move ordering\n"
+                          % (elapsed, nodes, nodes / elapsed if elapsed > 0 else 0, depth, self.maxDepth, self.duplicates, len(memory), self.orderSeconds))
+        self.stream.flush()
+
+    '''
+    This function returns the counters.
+
+    Input:  [memory] TranspositionTable of the search (None if the size of the memory is not known).
+
+    Output: Dictionary with the totals and, for each depth, the boards expanded, the children generated and the branching factor.
+    '''
+
+    def summary(self, memory=None):
+        if memory is not None:
+            self.memorySize = len(memory)
+        elapsed = time.time() - self.start
+        nodes = sum(self.expanded)
+        return {'nodesExpanded': nodes,
+                'childrenGenerated': sum(self.generated),
+                'duplicateHits': self.duplicates,
+                'maxDepth': self.maxDepth,
+                'memorySize': self.memorySize,
+                'orderingCalls': self.orderCalls,
+                'orderingSeconds': self.orderSeconds,
+                'seconds': elapsed,
+                'nodesPerSecond': nodes / elapsed if elapsed > 0 else None,
+                'depths': [{'depth': depth, 'expanded': expanded, 'generated': generated,
+                            'branching': generated / expanded if expanded else None}
+                           for depth, (expanded, generated) in enumerate(zip(self.expanded, self.generated)) if expanded or generated]}
+
+'''
+This class implements a sampling profiler. A timer signal interrupts the process every given number of seconds of CPU time and the function that was
+running (with its caller) is counted, so the functions where the time goes are the ones with the most samples. It only works in the main thread of a
+Unix process.
+
+Input:  [interval] Number of seconds of CPU time between two samples.
+'''
+
+class SamplingProfiler:
+    def __init__(self, interval=0.005):
+        if not hasattr(signal, 'setitimer'):
+            raise ValueError("The sampling profiler needs the timer signals of a Unix system")
+        self.interval = interval
+        self.samples = collections.Counter()
+        self.previous = None
+
+    def sample(self, signum, frame):
+        if frame is not None:
+            caller = frame.f_back
+            self.samples[(frame.f_code.co_name, frame.f_code.co_filename.rsplit('/', 1)[-1], frame.f_lineno,
+                          caller.f_code.co_name if caller is not None else None)] += 1
+
+    def start(self):
+        self.previous = signal.signal(signal.SIGPROF, self.sample)
+        signal.setitimer(signal.ITIMER_PROF, self.interval, self.interval)
+
+    def stop(self):
+        signal.setitimer(signal.ITIMER_PROF, 0, 0)
+        signal.signal(signal.SIGPROF, self.previous if self.previous is not None else signal.SIG_DFL)
+
+    '''
+    This function returns the lines that were sampled most often.
+
+    Input:  [count] Number of lines that are returned.
+
+    Output: List of dictionaries with the function, file, line, caller and the share of the samples.
+    '''
+
+    def top(self, count=20):
+        total = sum(self.samples.values())
+        return [{'function': function, 'file': filename, 'line': line, 'caller': caller, 'samples': samples, 'share': samples / total}
+                for (function, filename, line, caller), samples in self.samples.most_common(count)]
@@ -0,0 +1,258 @@
+'''
+This module learns the order in which the solvers try the moves of a board from the solutions of the boards of the corpus, so at search time the order
+is a lookup in precomputed tables instead of a rating of every child. The tables are kept for each shape of board (its lines, columns and holes, since
+the jump ids only mean the same jump on the same shape) and hold three statistics of the moves of the solutions:
+
+    history --> how often each jump was made in a solution.
+    killers --> the jumps that were made most often when the board had a given number of pegs, so they are the first ones tried at that depth.
+    pairs   --> how often each jump followed each other jump (or was the first move), so after a move the jumps that usually follow it come first.
+
+The moves of a board are ranked by whether they are killers of its number of pegs, then by their pair count after the previous move and then by their
+history. The learned solver (best learned) orders all of its moves that way, and the heuristic solvers use the same rank to break the ties between moves
+with the same rating, which they otherwise try in scan order.
+
+The tables are trained offline by solving the boards of the corpus with the solvers and collecting several solutions of each of them (the search is
+resumed from its stack after each solution, so the next one is a different path):
+
+    python MoveOrdering.py -o ordering.bin                  (every board of the boards directory)
+    python MoveOrdering.py boards/english.txt -o ordering.bin --solutions 50
+
+and the solver loads them with --ordering ordering.bin. The file is binary: a header with the magic bytes and the version of the file, followed by one
+section for each shape with the version of its table, the shape and the compressed counters. Shapes that are trained again replace their section and
+the other sections are kept, and a section of another version is skipped when the file is read, so a shape without a usable table is simply ordered as
+before.
+'''
+
+import argparse
+import os
+import struct
+import sys
+import zlib
+from array import array
+from BitBoard import Board, BoardGeometry
+
+MAGIC = b'PSMO'
+VERSION = 1
+#Version of the table of a shape. A section of another version is skipped when the file is read.
+TABLE_VERSION = 1
+#Number of killer moves kept for each number of pegs.
+KILLERS = 2
+MAX_COUNT = (1 << 32) - 1
+
+'''
+This class holds the move-ordering table of one shape of board.
+
+Input:  [geometry] BoardGeometry of the shape.
+
+Attributes: [history] List of the number of solutions each jump was made in.
+            [killers] List of the tuples of the killer jumps for each number of pegs.
+            [pairs] List with a list of the counts of every jump for each previous jump, and a last one for the first move of a solution.
+            [solutions] Number of solutions the table was trained on.
+            [checksum] CRC of the counters, which tells two tables apart (a checkpoint of a search is only resumed with the same table).
+'''
+
+class MoveTable:
+    def __init__(self, geometry):
+        self.layout = (geometry.lines, geometry.columns, geometry.holes)
+        self.jumps = len(geometry.jumps)
+        self.depths = geometry.cells + 1
+        self.history = [0] * self.jumps
+        self.killers = [()] * self.depths
+        self.pairs = [[0] * self.jumps for previous in range(self.jumps + 1)]
+        self.solutions = 0
+        self.killerCounts = None
+        self.checksum = 0
+
+    '''
+    This function adds the moves of a solution to the counters.
+
+    Input:  [pegs] Integer bitmask of the pegs of the starting board of the solution.
+            [moves] List of the jump ids of the solution.
+    '''
+
+    def record(self, pegs, moves):
+        if self.killerCounts is None:
+            self.killerCounts = [{} for depth in range(self.depths)]
+        count = pegs.bit_count()
+        previous = self.jumps
+        for k in moves:
+            self.history[k] = min(self.history[k] + 1, MAX_COUNT)
+            self.pairs[previous][k] = min(self.pairs[previous][k] + 1, MAX_COUNT)
+            killers = self.killerCounts[count]
+            killers[k] = killers.get(k, 0) + 1
+            previous = k
+            count -= 1
+        self.solutions += 1
+
+    '''
+    This function picks the killer moves of each number of pegs from the counts of the recorded solutions. Ties are broken by the history.
+    '''
+
+    def finish(self):
+        if self.killerCounts is not None:
+            self.killers = [tuple(sorted(counts, key=lambda k: (-counts[k], -self.history[k], k))[:KILLERS]) for counts in self.killerCounts]
+            self.killerCounts = None
+        self.checksum = zlib.crc32(self.counters())
+
+    '''
+    This function returns the rank of each of the given jumps on a board, the higher the earlier the jump is tried.
+
+    Input:  [pegs] Integer bitmask of the pegs of the board.
+            [previous] Jump id of the move that led to the board (None for the starting board).
+            [jumpIds] List of jump ids.
+
+    Output: List of (killer, pair count, history) tuples.
+    '''
+
+    def ranks(self, pegs, previous, jumpIds):
+        killers = self.killers[pegs.bit_count()]
+        pairs = self.pairs[self.jumps if previous is None else previous]
+        history = self.history
+        return [(k in killers, pairs[k], history[k]) for k in jumpIds]
+
+    '''
+    This function sorts the moves of each rating of a heuristic solver by their rank, so the moves with the same rating are no longer tried in scan
+    order. The sort is stable, so moves with the same rank keep the scan order.
+
+    Input:  [search_dict] Dictionary of the rated moves (rating --> list of jump ids).
+            [pegs] Integer bitmask of the pegs of the board.
+            [previous] Jump id of the move that led to the board (None for the starting board).
+    '''
+
+    def sortGroups(self, search_dict, pegs, previous):
+        for moves in search_dict.values():
+            if len(moves) > 1:
+                rank = dict(zip(moves, self.ranks(pegs, previous, moves)))
+                moves.sort(key=rank.__getitem__, reverse=True)
+
+    '''
+    These functions convert the counters to the bytes of a section and back.
+    '''
+
+    def counters(self):
+        killers = array('h', [-1] * (KILLERS * self.depths))
+        for count, moves in enumerate(self.killers):
+            killers[KILLERS * count:KILLERS * count + len(moves)] = array('h', moves)
+        data = array('I', self.history)
+        for row in self.pairs:
+            data.extend(row)
+        return struct.pack('<I', self.solutions) + killers.tobytes() + data.tobytes()
+
+    def restore(self, payload):
+        (self.solutions,) = struct.unpack_from('<I', payload)
+        killers = array('h')
+        killers.frombytes(payload[4:4 + 2 * KILLERS * self.depths])
+        data = array('I')
+        data.frombytes(payload[4 + 2 * KILLERS * self.depths:])
+        if len(data) != self.jumps * (self.jumps + 2):
+            raise ValueError("The move-ordering table does not match the jumps of its shape")
+        self.killers = [tuple(k for k in killers[KILLERS * count:KILLERS * (count + 1)] if k >= 0) for count in range(self.depths)]
+        self.history = data[:self.jumps].tolist()
+        self.pairs = [data[self.jumps * (row + 1):self.jumps * (row + 2)].tolist() for row in range(self.jumps + 1)]
+        self.checksum = zlib.crc32(payload)
+
+'''
+This function reads the tables of a file.
+
+Input:  [path] Path of the file.
+
+Output: Dictionary of the MoveTables of the shapes of the file ((lines, columns, holes) --> MoveTable).
+'''
+
+def loadTables(path):
+    tables = {}
+    with open(path, 'rb') as f:
+        data = f.read()
+    magic, version, count = struct.unpack_from('<4sHI', data)
+    if magic != MAGIC or version != VERSION:
+        raise ValueError(path + " is not a move-ordering file of this version of the solvers")
+    offset = struct.calcsize('<4sHI')
+    for section in range(count):
+        tableVersion, lines, columns, holesSize, size = struct.unpack_from('<HHHHI', data, offset)
+        offset += struct.calcsize('<HHHHI')
+        holes = int.from_bytes(data[offset:offset + holesSize], 'little')
+        payload = data[offset + holesSize:offset + holesSize + size]
+        offset += holesSize + size
+        if tableVersion != TABLE_VERSION:
+            continue
+        table = MoveTable(BoardGeometry(lines, columns, holes))
+        table.restore(zlib.decompress(payload))
+        tables[table.layout] = table
+    return tables
+
+'''
+This function writes the tables to a file. It is written to a temporary file that replaces the old one at once.
+
+Input:  [path] Path of the file.
+        [tables] Dictionary of the MoveTables of the shapes.
+'''
+
+def saveTables(path, tables):
+    temporary = path + '.tmp'
+    with open(temporary, 'wb') as f:
+        f.write(struct.pack('<4sHI', MAGIC, VERSION, len(tables)))
+        for (lines, columns, holes), table in sorted(tables.items()):
+            holesBytes = holes.to_bytes((holes.bit_length() + 7) // 8, 'little')
+            payload = zlib.compress(table.counters(), 9)
+            f.write(struct.pack('<HHHHI', TABLE_VERSION, lines, columns, len(holesBytes), len(payload)))
+            f.write(holesBytes)
+            f.write(payload)
+    os.replace(temporary, path)
+
+'''
+This function trains the table of a problem. The problem is solved by each of the given solvers and the search of each of them is resumed after every
+solution it finds, until it has found the given number of solutions or searched the given number of boards.
+
+Input:  [board] The Board of the problem.
+        [table] MoveTable of the shape of the board.
+        [strategies] List of the names of the solvers.
+        [solutions] Number of solutions collected with each solver.
+        [maxNodes] Number of boards each solver may search.
+
+Output: Number of solutions that were recorded.
+'''
+
+def trainBoard(board, table, strategies, solutions, maxNodes):
+    from PegSolitaireSolver import search, STRATEGIES
+    from TranspositionTable import TranspositionTable
+    geometry = board.geometry()
+    found = 0
+    for strategy in strategies:
+        memory = TranspositionTable()
+        stack = []
+        for solution in range(solutions):
+            budget = maxNodes - memory.misses
+            if budget <= 0 or search(geometry, board.pegs, STRATEGIES[strategy], [], memory, stack, budget) != 1:
+                break
+            #The moves of the solution are the last moves of the frames of the stack, which is where the next search goes on from.
+            table.record(board.pegs, [frame[2][frame[1]-1][0] for frame in stack])
+            found += 1
+    return found
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Learns the move-ordering tables of the solvers from the solutions of a corpus of boards.")
+    parser.add_argument("problems", nargs="*", help="files that contain the problems (every file of the boards directory if omitted)")
+    parser.add_argument("-o", "--output", default="ordering.bin", help="file of the tables (the tables of the other shapes it holds are kept)")
+    parser.add_argument("--strategies", default="depth,area,manhattan,rating", help="comma separated list of the solvers whose solutions are learned")
+    parser.add_argument("--solutions", type=int, default=20, help="number of solutions collected with each solver")
+    parser.add_argument("--max-nodes", type=int, default=200000, help="number of boards each solver may search for each problem")
+    args = parser.parse_args()
+    corpus = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'boards')
+    problems = args.problems or sorted(os.path.join(corpus, name) for name in os.listdir(corpus) if name.endswith('.txt'))
+    strategies = args.strategies.split(',')
+
+    tables = loadTables(args.output) if os.path.exists(args.output) else {}
+    trained = {}
+    for problem in problems:
+        board = Board.fromFile(problem)
+        table = trained.get(board.layout())
+        if table is None:
+            table = trained[board.layout()] = MoveTable(board.geometry())
+        found = trainBoard(board, table, strategies, args.solutions, args.max_nodes)
+        print("%-30s %d solutions" % (os.path.basename(problem), found), file=sys.stderr)
+    for layout, table in trained.items():
+        table.finish()
+        tables[layout] = table
+    saveTables(args.output, tables)
+    print(len(trained), "shapes trained,", len(tables), "shapes in", args.output, file=sys.stderr)
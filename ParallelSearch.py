@@ -0,0 +1,259 @@
+'''
+This module splits the search of the solvers between several processes. The search tree is first expanded up to a given depth (the frontier) in the order
+the selected solver would visit it. Each board of the frontier is the root of a subtree that is searched by one of the processes of a multiprocessing pool.
+A worker that has searched a given number of boards in its subtree without finishing it hands the rest of it back, split into the subtrees of the moves its
+stack has not tried yet, so a large subtree never keeps one worker busy while the others are idle. Returned subtrees are put at the front of the queue, so the
+work still follows the order of the sequential search as closely as possible. When a worker finds a solution the others are cancelled.
+
+By default each worker keeps its own memory of the boards it has searched. With a SharedTranspositionTable the workers share one memory, so they do not
+search again the dead ends other workers have already searched.
+'''
+
+import multiprocessing
+import queue
+from collections import deque
+from BitBoard import pegCount
+from TranspositionTable import TranspositionTable, SharedTranspositionTable
+from PegSolitaireSolver import search, STRATEGIES
+
+#Number of boards a worker searches between two checks of the cancel event.
+CHECK_NODES = 2048
+
+#Number of seconds the main process waits for a subtree before it checks the time and memory budget.
+STOP_SECONDS = 0.5
+
+#The state of each worker process, set once by initWorker.
+worker = {}
+
+'''
+This function initializes a worker process of the pool.
+
+Input:  [board] BoardGeometry of the problem.
+        [strategy] Name of the solver (one of the keys of STRATEGIES).
+        [splitNodes] Number of boards a worker searches in a subtree before it hands the rest of it back.
+        [memoryCap] Maximum number of boards kept in the transposition table of the worker.
+        [eviction] Eviction policy of the transposition table of the worker.
+        [sharedTable] SharedTranspositionTable of all the workers, or None if each worker keeps its own memory.
+        [cancel] Event that is set when a solution was found.
+        [pruner] Pruner that cuts the boards that cannot be solved (None for no pruning). Each worker counts its prunes on its own copy.
+'''
+
+def initWorker(board,strategy,splitNodes,memoryCap,eviction,sharedTable,cancel,pruner=None):
+    worker['board'] = board
+    worker['orderMoves'] = STRATEGIES[strategy]
+    worker['splitNodes'] = splitNodes
+    #The memory of the worker is kept between the subtrees it searches. Boards of a subtree that was handed back are stored as well,
+    #but the rest of their moves are searched in the returned subtrees, so skipping them later does not lose any part of the tree.
+    #The same holds for the boards other workers store in the shared table.
+    if sharedTable is not None:
+        worker['memory'] = sharedTable
+    else:
+        worker['memory'] = TranspositionTable(memoryCap, eviction)
+    worker['cancel'] = cancel
+    worker['pruner'] = pruner
+
+'''
+This function searches a subtree in a worker process.
+
+Input:  [task] Tuple (prefix, pegs) where prefix is the tuple of jump ids that lead from the starting board to the root of the subtree, whose peg bitmask is pegs.
+
+Output: Tuple (status, result, memory counters) where status is 'solved' (result is the jump ids of the solution), 'failed', 'cancelled' or 'split' (result is
+        the list of the subtrees that were not searched). The counters also hold the jump ids to the deepest board of the subtree (deepest).
+'''
+
+def solveSubtree(task):
+    prefix,pegs = task
+    board = worker['board']
+    memory = worker['memory']
+    #A subtree that was handed back may start from a solved board.
+    if pegCount(pegs) == 1:
+        return 'solved',list(prefix),{'hits': 0, 'misses': 0, 'evictions': 0, 'overflows': 0, 'size': len(memory)}
+    pruner = worker['pruner']
+    before = memory.stats()
+    prunesBefore = pruner.stats() if pruner is not None else {}
+    stack = []
+    path = []
+    deepest = []
+    nodes = 0
+    status = -1
+    result = None
+
+    while status == -1:
+        if worker['cancel'].is_set():
+            status = 'cancelled'
+            break
+        if nodes >= worker['splitNodes']:
+            status = 'split'
+            result = remainingSubtrees(board,prefix,stack)
+            break
+        status = search(board,pegs,worker['orderMoves'],path,memory,stack,CHECK_NODES,pruner,partial=deepest)
+        nodes += CHECK_NODES
+
+    if status == 1:
+        status = 'solved'
+        #The moves of the path are strings, so the solution is returned as the jump ids of the stack instead.
+        result = list(prefix) + [frame[2][frame[1]-1][0] for frame in stack]
+    elif status == 0:
+        status = 'failed'
+
+    after = memory.stats()
+    counters = {name: after[name] - before[name] for name in ('hits', 'misses', 'evictions', 'overflows') if name in after}
+    counters['size'] = after['size']
+    counters['deepest'] = list(prefix) + deepest
+    if pruner is not None:
+        counters['prunes'] = {rule: count - prunesBefore[rule] for rule, count in pruner.stats().items()}
+    return status,result,counters
+
+'''
+This function turns the frames of a stopped search into the subtrees of the moves that were not tried yet. The deepest frame comes first, since the sequential
+search would continue from there.
+
+Input:  [board] BoardGeometry of the problem.
+        [prefix] Tuple of the jump ids that lead to the board of the first frame.
+        [stack] List of the frames of the stopped search.
+
+Output: List of (prefix, pegs) subtrees.
+'''
+
+def remainingSubtrees(board,prefix,stack):
+    jumps = board.jumps
+    framePrefixes = [tuple(prefix)]
+    for frame in stack[:-1]:
+        framePrefixes.append(framePrefixes[-1] + (frame[2][frame[1]-1][0],))
+
+    subtrees = []
+    for frame,framePrefix in reversed(list(zip(stack,framePrefixes))):
+        pegs,cursor,moves = frame
+        for k,skip in moves[cursor:]:
+            fromOver,to,flip = jumps[k]
+            if pegs & fromOver == fromOver and not pegs & to:
+                subtrees.append((framePrefix + (k,),pegs ^ flip))
+    return subtrees
+
+'''
+This function expands the search tree up to the given depth. The boards of each level are found in the order the solver would visit them and repeated boards
+are only kept once.
+
+Input:  [board] BoardGeometry of the problem.
+        [pegs] Integer bitmask of the pegs of the starting board.
+        [orderMoves] Function that returns the ordered (jump id, skip) pairs of a board.
+        [depth] Depth of the frontier.
+
+Output: [frontier] List of (prefix, pegs) subtrees.
+        [solution] The jump ids of a solution if one was found while expanding, else None.
+'''
+
+def expandFrontier(board,pegs,orderMoves,depth):
+    frontier = [((),pegs)]
+    seen = set()
+    for level in range(depth):
+        nextFrontier = []
+        for prefix,pegs in frontier:
+            for k,skip in orderMoves(board,pegs,prefix[-1] if prefix else None):
+                fromOver,to,flip = board.jumps[k]
+                if pegs & fromOver != fromOver or pegs & to:
+                    continue
+                nextPegs = pegs ^ flip
+                if pegCount(nextPegs) == 1:
+                    return [],prefix + (k,)
+                key = board.canonical(nextPegs)
+                if key in seen:
+                    continue
+                seen.add(key)
+                nextFrontier.append((prefix + (k,),nextPegs))
+        #Boards without any possible move end the expansion early, they are simply not part of the next level.
+        if not nextFrontier:
+            return [],None
+        frontier = nextFrontier
+    return frontier,None
+
+'''
+This function solves a problem with several worker processes.
+
+Input:  [board] BoardGeometry of the problem.
+        [pegs] Integer bitmask of the pegs of the starting board.
+        [strategy] Name of the solver (one of the keys of STRATEGIES).
+        [path] List of strings where the moves of the solution are stored.
+        [stats] Dictionary that is filled with the memory counters of all the workers and the number of searched and split subtrees.
+        [workers] Number of worker processes.
+        [frontierDepth] Depth up to which the search tree is expanded before it is split between the workers.
+        [splitNodes] Number of boards a worker searches in a subtree before it hands the rest of it back.
+        [memoryCap] Maximum number of boards kept in the transposition table of each worker.
+        [eviction] Eviction policy of the transposition tables of the workers (or of their overflow tables when the shared table is used).
+        [sharedCapacity] Number of slots of a SharedTranspositionTable that all the workers use as their memory (None for a separate memory per worker).
+        [pruner] Pruner that cuts the boards that cannot be solved (None for no pruning).
+        [maxNodes] Maximum number of new boards the workers store before the search stops (None for no limit). It is checked whenever a subtree
+                   is finished, so the workers may store a few more.
+        [stop] Watchdog that is checked whenever a subtree is finished and at least every STOP_SECONDS seconds (None for no time or memory budget).
+        [partial] List that is filled with the jump ids to the deepest board any worker stored when the search fails or stops (None if not needed).
+
+Output: 1--> if a solution was found (its moves are in path)
+        0--> if there is no solution
+        -1--> if the search stopped because of maxNodes or stop.
+'''
+
+def parallel_solver(board,pegs,strategy,path,stats,workers,frontierDepth=3,splitNodes=100000,memoryCap=None,eviction='fifo',sharedCapacity=None,pruner=None,maxNodes=None,
+                    stop=None,partial=None):
+    stats.update({'hits': 0, 'misses': 0, 'evictions': 0, 'overflows': 0, 'size': 0, 'tasks': 0, 'splits': 0})
+    if pruner is not None:
+        stats['prunes'] = pruner.stats()
+    frontier,solution = expandFrontier(board,pegs,STRATEGIES[strategy],frontierDepth)
+    if solution is not None:
+        path.extend(board.jumpMoves[k] for k in solution)
+        return 1
+
+    tasks = deque(frontier)
+    results = queue.Queue()
+    cancel = multiprocessing.Event()
+    sharedTable = None
+    if sharedCapacity is not None:
+        sharedTable = SharedTranspositionTable(sharedCapacity,board.cells,memoryCap,eviction)
+    pool = multiprocessing.Pool(workers, initializer=initWorker, initargs=(board,strategy,splitNodes,memoryCap,eviction,sharedTable,cancel,pruner))
+    running = 0
+    deepest = max((list(prefix) for prefix,_ in frontier), key=len, default=[])
+    stopped = False
+    try:
+        while tasks or running:
+            #Keep every worker busy, with one more subtree waiting for each of them.
+            while tasks and running < 2*workers:
+                pool.apply_async(solveSubtree, (tasks.popleft(),), callback=results.put, error_callback=results.put)
+                running += 1
+
+            try:
+                result = results.get(timeout=STOP_SECONDS if stop is not None else None)
+            except queue.Empty:
+                if stop():
+                    stopped = True
+                    break
+                continue
+            running -= 1
+            if isinstance(result, BaseException):
+                raise result
+            status,subtree,counters = result
+            stats['tasks'] += 1
+            for name in ('hits', 'misses', 'evictions', 'overflows'):
+                stats[name] += counters.get(name, 0)
+            stats['size'] = max(stats['size'], counters['size'])
+            if len(counters.get('deepest', ())) > len(deepest):
+                deepest = counters['deepest']
+            for rule, count in counters.get('prunes', {}).items():
+                stats['prunes'][rule] += count
+
+            if status == 'solved':
+                cancel.set()
+                path.extend(board.jumpMoves[k] for k in subtree)
+                return 1
+            if status == 'split':
+                stats['splits'] += 1
+                tasks.extendleft(reversed(subtree))
+            if maxNodes is not None and stats['misses'] >= maxNodes or stop is not None and stop():
+                stopped = True
+                break
+        if partial is not None:
+            partial[:] = deepest
+        return -1 if stopped else 0
+    finally:
+        pool.terminate()
+        pool.join()
+        if sharedTable is not None:
+            sharedTable.close(unlink=True)
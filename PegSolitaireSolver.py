@@ -1,564 +1,991 @@
-''' 
-The program solves Peg Solitaire problems using the Depth-First search and Best-First search algorithms, while adopting some elements from Backtracking algorithms such as recursion
-and memory that stores previous board states, in order to 'backtrack' from them. These backtracking elements are part of the 4 solvers that were createdand are further expained below.
-The boards are converted into numpy (2D) matrices in order to be processed. Problems are read from an input file, while the solution is written to an output file.
-'''
-import sys
-import numpy as np
-import time
-
-'''
-This function checks whether the problem is solved by counting if there is only one peg on the board.
-
-Input: [array] Int numpy matrix that represents the board's current state.
-Output: 1--> if there is only 1 peg on the board 
-        2--> in every other case.
-'''
-
-def solutionFound(array):
-    if np.count_nonzero(array == 1) == 1:
-        return 1
-    else:
-        return 0
-
-'''
-This function represents a Depth-First search solution that recursively traverses through the (hypothetical) search tree unti a solution is found. Board states that were previously
-visited are stored in a list called memory and the function backtracks when it encounters them. The function takes as input the current board (represented as a numpy array),
-goes through each peg on the board and check which moves are possible (and in which direction). If any legal move is possible on the first peg encountered, the move is executed
-and through recursion the function, is again applied on the Updated board.
-
-Input:  [array] Int numpy matrix that represents the board's current state. 
-        [path] List of strings that stores the moves that were made on the current board.
-        [memory] List of integers that represent, in an efficient way, previously encountered board states.
-        
-Output: [path] The final list that contains the moves for the first solution found. 
-'''
-def depth_first_solver(array,path,memory):
-    #List that stores each of the 4 possible move directions
-    directions = ['up', 'down', 'left', 'right']
-    #List of strings that stores the moves that were made on the current board.
-    moves_list = path
-    
-    #Go through each peg on the board..
-    for i in range(totalLines):
-        for j in range(totalColumns):
-            #If a peg is found..
-            if array[i][j] == 1:
-                flag = 0
-                
-                #Check each one of the 4 possible move directions..
-                for direction in directions:
-                    
-                    #If a move is possible..
-                    if hasPossibleMove(array,i,j,direction):
-                        
-                        #Make the move and store the new board in a numpy array and a string that contain the move that was made.
-                        nextMoveArray = np.copy(array)
-                        nextMoveArray,move = makeTheMove(nextMoveArray,i,j,direction)
-                        
-                        #Check if the current board is previously encountered..
-                        if boardPreviouslySeen(memory,convertToStr(nextMoveArray)):
-                            flag = 1
-                            #If yes go to the next direction/peg.
-                            break
-                        
-                        #If the current board is not previously encountered save it.  
-                        if not flag:
-                            memory.append(convertToStr(nextMoveArray))
-                        
-                        #If there are no boards saved, save the current one.        
-                        if not memory:
-                            memory.append(convertToStr(nextMoveArray))
-                        
-                        #If the board is previously encountered skip to next direction/peg.
-                        if flag:
-                            continue
-                        
-                        #Store the move that was made.
-                        moves_list.append(move)
-                        
-                        #If the problem is not solved..
-                        if not solutionFound(nextMoveArray):
-                            #recursively apply the solver to the current board.
-                            depth_first_solver(nextMoveArray,moves_list,memory)
-                            
-                        #If the problem is solved stop and return the path.
-                        else:
-                            global solution_flag
-                            solution_flag = 1
-                            path = moves_list
-                        if solution_flag:
-                            return 1
-                        
-                        #If the move did not solve the problem remove it from the path.
-                        moves_list.pop(len(moves_list)-1)
- 
-'''
-This function implements a Best-First search solution that recursively traverses through the (hypothetical) search tree unti a solution is found. Board states that were previously
-visited are stored in a list called memory and the function backtracks when it encounters them. The heuristic function used essentialy uses 2 criteria in order to rate each possible
-move at the current point of the search. The first criterion is the number of available moves in the resulting board and the second one, is the number of isolated pegs in the resulting board
-after the move is applied. This rating is calculated for each 'child node' (each possible move) from the current node in the search tree that is examined.
-The ratings are saved in a dictionary where the key is the rating and the values are lists of the corresponding rated moves (as strings). The dictionary is then sorted in descending
-order and the highest rated moves are applied to the board. The function is recursively applied based on the moves ratings until a solution is found. If two moves have the same rating,
-the one that was first found is the first one to be applied.
-
-Input:  [array] Int numpy matrix that represents the board's current state. 
-        [path] List of strings that stores the moves that were made on the current board.
-        [memory] List of integers that represent, in an efficient way, previously encountered board states.
-        
-Output: [path] The final list that contains the moves for the first solution found. 
-'''                       
-
-def heuristic_solver_rating(array,path,memory):
-    directions = ['up', 'down', 'left', 'right']
-    moves_list = path
-    
-    #This dictionary saves the rating for each possible move at the current search point.
-    search_dict = {}
-    
-    
-    for i in range(totalLines):
-        for j in range(totalColumns):
-            flag = 0
-            if array[i][j] == 1:
-                for direction in directions:
-                    #Find the first peg that has an available move in some direction..
-                    if hasPossibleMove(array,i,j,direction):
-                        #Make the move and save the resulting board..
-                        nextMoveArray = np.copy(array)
-                        nextMoveArray,move = makeTheMove(nextMoveArray,i,j,direction)
-                        availableMovesCounter = 0
-                        nonIsolated = 0
-                        
-                        #For each peg in the resulting board, if a move is possible in some direction rate it based on..
-                        for x in range(totalLines):
-                            for y in range(totalColumns):
-                                if nextMoveArray[x][y] == 1:
-                                    for direction_secondary in directions:
-                                        #The amount of possible moves for each peg and..
-                                        if hasPossibleMove(nextMoveArray,x,y,direction_secondary):
-                                            availableMovesCounter += 1
-                                    #The amount of isolated pegs.
-                                    if isIsolated(nextMoveArray,x,y):
-                                        nonIsolated += 1
-                                        
-                        #Sum the results of the 2 criteria in the rating variable..                
-                        rating = nonIsolated + availableMovesCounter
-                        #If the current key-rating already exists update its (list) value with the corresponding move.
-                        #Moves with same rating are saved in the same list and the one first found is the first one to be applied.
-                        if rating in search_dict:
-                            search_dict[rating].append(str(i) + str(j) + direction)
-                        #else, create a new key-rating with a list that contains the corresponding move as its value.
-                        else:
-                            search_dict[rating] = [str(i) + str(j) + direction]
-
-    #Sort the dictionary in descending order based on the keys (ratings) since we want the moves with highest rating.
-    search_dict_sorted = {k: v for k, v in sorted(search_dict.items(), key=lambda item: item[0], reverse=True)}
-    
-    #Traverse through the sorted dictionary..
-    for key,value in search_dict_sorted.items():
-        flag = 0
-
-        #For each move (value) in the dictionary (starting from the highest rated)..
-        for peg_move in value:
-            #Make the move and the save the resulting board.
-            nextMoveArray = np.copy(array) 
-            nextMoveArray,move = makeTheMove(nextMoveArray,int(peg_move[0]),int(peg_move[1]),peg_move[2:])
-            
-            #Check if the board was previously encountered.
-            if boardPreviouslySeen(memory,convertToStr(nextMoveArray)):
-                flag = 1
-                break
-                
-            if not flag:
-                memory.append(convertToStr(nextMoveArray))
-                    
-            if not memory:
-                memory.append(convertToStr(nextMoveArray))
-            
-            if flag:
-                continue
-            moves_list.append(move)
-            
-            if not solutionFound(nextMoveArray):
-                heuristic_solver_rating(nextMoveArray,moves_list,memory)
-            else:
-                global solution_flag
-                solution_flag = 1
-                path = moves_list
-            if solution_flag:
-                return 1
-            moves_list.pop(len(moves_list)-1)
-
-'''
-This function implements a Best-First search solution that recursively traverses through the (hypothetical) search tree unti a solution is found. Board states that were previously
-visited are stored in a list called memory and the function backtracks when it encounters them. The heuristic function used essentialy uses 1 criterion in order to rate each possible
-move at the current point of the search. The criterion is the Manhattan Distance of each peg on the board with every other peg. This distance is calculated for each 'child node' 
-(the resulting board for each possible move) from the current node in the search tree that is examined. The distances are saved in a dictionary where the key is the total distance 
-and the values are lists of the corresponding moves (as strings). The dictionary is then sorted in asceding order and moves that result to a board with the smallest possible total 
-distance are applied to the board. The function is recursively applied until a solution is found. If two moves have the same total distance, the one that was first found 
-is the first one to be applied.
-
-Input:  [array] Int numpy matrix that represents the board's current state. 
-        [path] List of strings that stores the moves that were made on the current board.
-        [memory] List of integers that represent, in an efficient way, previously encountered board states.
-        
-Output: [path] The final list that contains the moves for the first solution found. 
-'''
-                        
-def heuristic_solver_manhattan(array,path,memory):
-    directions = ['up', 'down', 'left', 'right']
-    moves_list = path
-    search_dict = {}
-    
-    for i in range(totalLines):
-        for j in range(totalColumns):
-            if array[i][j] == 1:
-                for direction in directions:
-                    if hasPossibleMove(array,i,j,direction):
-                        nextMoveArray = np.copy(array)
-                        nextMoveArray,move = makeTheMove(nextMoveArray,i,j,direction)
-                        total_distance = 0
-                        for x in range(totalLines):
-                            for y in range(totalColumns):
-                                #Calculate the total distance for each peg on the resulting board..
-                                if nextMoveArray[x][y] == 1:
-                                    total_distance = manhattanDistance(nextMoveArray,x,y) + total_distance
-                        #And accordingly save it in the dictionary.
-                        if total_distance in search_dict:
-                            search_dict[total_distance].append(str(i) + str(j) + direction)
-                        else:
-                            search_dict[total_distance] = [str(i) + str(j) + direction]
-    
-    #Sort the dictionary in asceding order based on the keys (distance) since we want to start applying moves that result to boards with the least total distance between the pegs.
-    search_dict_sorted = {k: v for k, v in sorted(search_dict.items(), key=lambda item: item[0])}
-    for key,value in search_dict_sorted.items():
-        flag = 0
-        
-        for peg_move in value:
-            nextMoveArray = np.copy(array)
-            nextMoveArray,move = makeTheMove(nextMoveArray,int(peg_move[0]),int(peg_move[1]),peg_move[2:])
-            
-            #Check if the board was previously encountered.
-            if boardPreviouslySeen(memory,convertToStr(nextMoveArray)):
-                flag = 1
-                break
-                
-            if not flag:
-                memory.append(convertToStr(nextMoveArray))
-                    
-            if not memory:
-                memory.append(convertToStr(nextMoveArray))
-            
-            if flag:
-                continue
-            moves_list.append(move)
-            
-            if not solutionFound(nextMoveArray):
-                heuristic_solver_manhattan(nextMoveArray,moves_list,memory)
-            else:
-                global solution_flag
-                solution_flag = 1
-                path = moves_list
-            if solution_flag:
-                return 1
-            moves_list.pop(len(moves_list)-1)
-            
-'''
-This function implements a Best-First search solution that recursively traverses through the (hypothetical) search tree unti a solution is found. Board states that were previously
-visited are stored in a list called memory and the function backtracks when it encounters them. The heuristic function used essentialy uses 1 criterion in order to rate each possible
-move at the current point of the search. The criterion is the Total (Square) Area on the board that is covered by the pegs. The covered area is calculated for each 'child node' 
-(the resulting board for each possible move) from the current node in the search tree that is examined. The values are saved in a dictionary where the key is the total area 
-and the values are lists of the corresponding moves (as strings). The dictionary is then sorted in asceding order, and moves that result to a board with the smallest possible total
-covered area are applied to the board. The function is recursively applied until a solution is found. If two moves have the same total area, 
-the one that was first found is the first one to be applied.
-
-Input:  [array] Int numpy matrix that represents the board's current state. 
-        [path] List of strings that stores the moves that were made on the current board.
-        [memory] List of integers that represent, in an efficient way, previously encountered board states.
-        
-Output: [path] The final list that contains the moves for the first solution found. 
-'''
-            
-def heuristic_solver_area(array,path,memory):
-    directions = ['up', 'down', 'left', 'right']
-    moves_list = path
-    search_dict = {}
-    
-    for i in range(totalLines):
-        for j in range(totalColumns):
-            if array[i][j] == 1:
-                for direction in directions:
-                    if hasPossibleMove(array,i,j,direction):
-                        nextMoveArray = np.copy(array)
-                        nextMoveArray,move = makeTheMove(nextMoveArray,i,j,direction)
-                        #Calculate the total area covered by the pegs on the resulting board..
-                        area = areaCovered(nextMoveArray)
-                        #And accordingly save it in the dictionary.
-                        if area in search_dict:
-                            search_dict[area].append(str(i) + str(j) + direction)
-                        else:
-                            search_dict[area] = [str(i) + str(j) + direction]
-    
-    #Sort the dictionary in asceding order based on the keys (area) since we want to start applying moves that result to boards with the least total area covered by the pegs.                        
-    search_dict_sorted = {k: v for k, v in sorted(search_dict.items(), key=lambda item: item[0])}
-    for key,value in search_dict_sorted.items():
-        flag = 0
-        
-        for peg_move in value:
-            nextMoveArray = np.copy(array)
-            nextMoveArray,move = makeTheMove(nextMoveArray,int(peg_move[0]),int(peg_move[1]),peg_move[2:])
-            
-            #Check if the board was previously encountered.
-            if boardPreviouslySeen(memory,convertToStr(nextMoveArray)):
-                flag = 1
-                break
-                
-            if not flag:
-                memory.append(convertToStr(nextMoveArray))
-                    
-            if not memory:
-                memory.append(convertToStr(nextMoveArray))
-            
-            if flag:
-                continue
-            moves_list.append(move)
-            if not solutionFound(nextMoveArray):
-                heuristic_solver_area(nextMoveArray,moves_list,memory)
-            else:
-                global solution_flag
-                solution_flag = 1
-                path = moves_list
-            if solution_flag:
-                return 1
-            moves_list.pop(len(moves_list)-1)
-            
-'''
-This function is used in order to find out whether a given board was previously encountered. Using the function 'convertToStr' the numpy array is converted to a String and saved
-into a list. This list is given as input to this function together with the converted array we need to check.
-
-Input:  [str_list] List of strings which represent the boards previously encountered while searching. 
-        [string] The current board we want to check after being converted into a string.
-        
-Output: 1--> if the board is previously encountered (if the string is in the list) 
-        2--> if it is a new board. 
-'''
-                        
-def boardPreviouslySeen(str_list,string):
-    if string in str_list:
-        return 1
-    else:
-        return 0  
-
-'''
-This function is used in order to efficiently store the Peg Solitaire boards in a list. Looping through each of the board's (numpy array) elements, a string is created which encodes
-the whole array as a sequence of its elements. If the given element is zero it is not included since their position never change while solving a problem (they just fill the array).
-
-Input:  [array] Numpy array that represents the current board we want to convert into a string.
-  
-Output: The string that encodes the given array. 
-'''          
-
-def convertToStr(array):
-    number = ""
-    for i in range(array.shape[0]):
-        for j in range(array.shape[1]):
-            if array[i][j] != 0:
-                number = number + str(int(array[i][j]))
-    return number
-
-'''
-This function is used by the heuristic_solver_area in order to calculate the Total Square Area the pegs cover on the current board. 
-
-Input:  [array] Numpy array that represents the current board from which the Total Square Area that is covered by the pegs will be calculated.
-  
-Output: The Total Square Area that is covered by the pegs. 
-'''  
-
-def areaCovered(array):
-    max_line,max_column = 0,0
-    min_line,min_column = array.shape[0],array.shape[1]
-    for i in range(array.shape[0]):
-        for j in range(array.shape[1]):
-            if array[i][j] == 1:
-                if i>max_line:
-                    max_line = i
-                if i<min_line:
-                    min_line = i 
-                if j>max_column:
-                    max_column = j
-                if j<min_column:
-                    min_column = j 
-    return ((max_line-min_line)+1)*((max_column-min_column)+1)
-
-'''
-This function is used by the heuristic_solver_manhattan in order to calculate the Total Distance between the pegs on the current board. 
-
-Input:  [array] Numpy array that represents the current board from which the Total Distance between the pegs will be calculated.
-  
-Output: The Total Distance between the pegs. 
-'''  
-            
-def manhattanDistance(array,indexL,indexC):
-    mD = 0
-    for i in range(array.shape[0]):
-        for j in range(array.shape[1]):
-            if array[i][j] == 1:
-                mD = abs(indexL-i) + abs(indexC-j) + mD
-    return mD
- 
-'''
-This function is used by the heuristic_solver_rating in order to find out whether a peg is isolated on the given board. A peg is isolated if there is not a peg in each of the 4 legal
-directions a move can have (up,down,left,right).
-
-Input:  [array] Numpy array that represents the current board.
-        [indexL] Line coordinate of the current peg.
-        [indexC] Column coordinate of the current peg.
-        
-Output: 1--> if the peg is isolated
-        2--> if it is not
-''' 
-                
-def isIsolated(array,indexL,indexC):
-    neighbors = 0
-    if indexL+1<array.shape[0]:
-        if array[indexL+1][indexC] == 1:
-            neighbors += 1
-    if indexL-1>=0:
-        if array[indexL-1][indexC] == 1:
-            neighbors += 1
-    if indexC+1<array.shape[1]:
-        if array[indexL][indexC+1] == 1:
-            neighbors += 1
-    if indexC-1>=0:
-        if array[indexL][indexC-1] == 1:
-            neighbors += 1
-    if neighbors>0:
-        return 1
-    else:
-        return 0
-    
-'''
-This function is used by the heuristic_solver_rating in order to find out whether a move is possible from a given peg to a given direction.
-
-Input:  [array] Numpy array that represents the current board.
-        [indexL] Line coordinate of the current peg.
-        [indexC] Column coordinate of the current peg.
-        [direction] Direction in which the existence of a possible move is checked.
-        
-Output: 1--> if the move is possible
-        2--> if it is not
-''' 
-
-def hasPossibleMove(array,indexL,indexC,direction):
-    if direction == 'up':
-        if indexL-2 >= 0:
-            if array[indexL-2][indexC] == 2 and array[indexL-1][indexC] == 1:
-                return 1
-    elif direction == 'down':
-        if indexL+2 < array.shape[0]:
-            if array[indexL+2][indexC] == 2 and array[indexL+1][indexC] == 1:
-                return 1
-    elif direction == 'right':
-        if indexC+2 < array.shape[1]:
-            if array[indexL][indexC+2] == 2 and array[indexL][indexC+1] == 1:
-                return 1
-    elif direction == 'left':
-        if indexC-2 >= 0:
-            if array[indexL][indexC-2] == 2 and array[indexL][indexC-1] == 1:
-                return 1
-    return 0
-
-'''
-This function is used from all the solvers in oder to create apply a given move to the current board and create the next one.
-
-Input:  [array] Numpy array that represents the current board.
-        [indexL] Line coordinate of the current peg.
-        [indexC] Column coordinate of the current peg.
-        [direction] Direction in which the existence of a possible move is checked.
-        
-Output: [array] The updated array after the given move was applied.
-        [move] A string that contains the move that was made to the array.
-''' 
-
-def makeTheMove(array,indexL,indexC,direction):
-    if direction == 'up':
-        array[indexL-2][indexC] = 1
-        array[indexL-1][indexC] = 2
-        array[indexL][indexC] = 2
-        move = str(indexL+1) + " " + str(indexC+1) + " " + str(indexL-1) + " " + str(indexC+1)
-        return array,move
-    elif direction == 'down':
-        array[indexL+2][indexC] = 1
-        array[indexL+1][indexC] = 2
-        array[indexL][indexC] = 2
-        move = str(indexL+1) + " " + str(indexC+1) + " " + str(indexL+3) + " " + str(indexC+1)
-        return array,move
-    elif direction == 'right':
-        array[indexL][indexC+2] = 1
-        array[indexL][indexC+1] = 2
-        array[indexL][indexC] = 2
-        move = str(indexL+1) + " " + str(indexC+1) + " " + str(indexL+1) + " " + str(indexC+3)
-        return array,move
-    elif direction == 'left':
-        array[indexL][indexC-2] = 1
-        array[indexL][indexC-1] = 2
-        array[indexL][indexC] = 2
-        move = str(indexL+1) + " " + str(indexC+1) + " " + str(indexL+1) + " " + str(indexC-1)
-        return array,move
-    
-
-#Below is the program's main function.
-   
-#Start the timer in order to compare the different algorithm's and read the given arguments from the program's execution.
-start = time.time()
-algorithm = str(sys.argv[1])
-inputFile = str(sys.argv[2])
-outputFile = str(sys.argv[3])
-
-
-#Read the file that contains the problem's starting board.
-f = open(inputFile, "r")
-
-flag = 1
-lineIndex = 0
-columnIndex = 0
-solution_flag = 0
-for line in f:
-    if len(line) == 4 and flag:
-        totalLines = int(line[0])
-        totalColumns = int(line[2])
-        array = np.zeros((totalLines, totalColumns))
-        flag = 0
-    else:
-        for element in line:
-            if element == '\n' or element == ' ':
-                continue
-            array[lineIndex][columnIndex] = int(element)
-            columnIndex += 1
-        lineIndex += 1
-        columnIndex = 0
-
-f.close()
-
-#Use the selected solver.
-path = []
-memory = []
-if algorithm == 'depth':
-    depth_first_solver(array,path,memory)
-elif  algorithm == 'best':
-    if len(sys.argv)<5:
-        heuristic_solver_area(array,path,memory)
-    elif str(sys.argv[4]) == 'manhattan':
-        heuristic_solver_manhattan(array,path,memory)
-    elif str(sys.argv[4]) == 'rating':
-        heuristic_solver_rating(array,path,memory)
-        
-#Write the result in the file.
-f = open(outputFile, "a")
-for line in path:
-    if line:
-        f.write(str(line) + '\n')
-f.close()
-end = time.time()
-print(end-start, "seconds")
+'''
+The program solves Peg Solitaire problems using the Depth-First search and Best-First search algorithms, while adopting some elements from Backtracking algorithms such as an explicit
+stack of the boards on the current path and memory (a transposition table) that stores previous board states, in order to 'backtrack' from them. These backtracking elements are part of the 4 solvers that were createdand are further expained below.
+The boards are converted into bitboards (see BitBoard.py) in order to be processed: the pegs of a board are stored as the bits of a single integer and every jump of the board
+is precomputed, so making a move is a single xor. Problems are read from an input file, while the solution is written to an output file.
+'''
+import argparse
+import json
+import os
+import sys
+import time
+from BitBoard import Board, pegCount
+from TranspositionTable import TranspositionTable, EVICTION_POLICIES
+from Heuristics import scoreChildren
+from BestFirstSearch import best_first_solver, SEARCH_MODES
+from IterativeDeepening import ida_solver
+from Pruning import Pruner, PRUNE_RULES
+from SolutionCache import SolutionCache
+from RetrogradeSearch import BackwardFrontier
+from Checkpoint import problemKey, saveCheckpoint, loadCheckpoint
+from Metrics import SearchMetrics, SamplingProfiler, PROGRESS_NODES
+from Budget import Watchdog, STOP_NODES
+from MoveOrdering import loadTables
+
+'''
+This function checks whether the problem is solved by counting if there is only one peg on the board.
+
+Input: [pegs] Integer bitmask of the pegs of the board's current state.
+Output: 1--> if there is only 1 peg on the board
+        2--> in every other case.
+'''
+
+def solutionFound(pegs):
+    if pegCount(pegs) == 1:
+        return 1
+    else:
+        return 0
+
+'''
+This function is the search core that is shared by all the solvers. It traverses the (hypothetical) search tree in a Depth-First manner until a solution is found,
+but instead of calling itself recursively for each move it keeps an explicit stack of frames. Each frame holds the board (its peg bitmask), a cursor that shows which
+of its moves is examined next and the ordered list of its moves, which is computed once by the given orderMoves function when the frame is pushed. Since there is no
+recursion the search is not limited by Python's recursion limit, and since all of its state is local several searches can run in the same process.
+
+The moves of a frame are (jump id, skip) pairs. When a move leads to a board that was previously encountered the cursor jumps to the skip position, which is how
+the solvers have always skipped the rest of the moves of the same peg (Depth-First) or the same rating (Best-First).
+
+If a Pruner (see Pruning.py) is given, new boards that it shows cannot be solved are stored in the memory like the searched ones but are not searched.
+If the CachedPositions of a SolutionCache (see SolutionCache.py) are given, new boards whose result is known are not searched either: the search stops
+with the cached moves of a board that is known to be solvable, and the boards that cannot be solved (including the ones the Pruner cuts) are added to them.
+
+The search can also be given a node budget. When the given number of new boards has been stored it stops and leaves its frames in the given stack list,
+so it can be resumed later (by calling it again with the same stack) or its remaining moves can be handed to other processes (see ParallelSearch.py).
+It stops the same way when the given Watchdog says the time or memory budget is spent, and it keeps the moves to the deepest board it has stored (the one
+with the fewest pegs) in the given partial list, which is the best partial solution when there is no complete one.
+
+Input:  [board] BoardGeometry of the problem.
+        [pegs] Integer bitmask of the pegs of the starting board.
+        [orderMoves] Function that returns the ordered (jump id, skip) pairs of a board, given the board, the jump id of the move that led to it and
+                     the bitmask of its legal jumps.
+        [path] List of strings where the moves of the solution are stored.
+        [memory] TranspositionTable that stores the keys of the previously encountered board states.
+        [stack] List of the frames of the search. If it is given and not empty the search is resumed from it.
+        [maxNodes] Maximum number of new boards that are stored before the search stops (None for no limit).
+        [pruner] Pruner that cuts the boards that cannot be solved (None for no pruning).
+        [cache] CachedPositions with the known results of boards (None for no cache).
+        [metrics] SearchMetrics that counts what the search does (None for no counters, see Metrics.py).
+        [stop] Watchdog that is checked every STOP_NODES boards (None for no time or memory budget, see Budget.py).
+        [partial] List of the jump ids that lead to the deepest board stored so far (None if not needed). It is only replaced by deeper boards, so the
+                  same list can be given to several calls.
+
+Output: 1--> if a solution was found (its moves are in path)
+        0--> if there is no solution
+        -1--> if the search stopped because of maxNodes or stop.
+'''
+
+def search(board,pegs,orderMoves,path,memory,stack=None,maxNodes=None,pruner=None,cache=None,metrics=None,stop=None,partial=None):
+    jumps = board.jumps
+    if stack is None:
+        stack = []
+    if metrics is not None:
+        orderMoves = metrics.timed(orderMoves)
+        metrics.searches += 1
+    if not stack:
+        if pruner is not None and pruner.prune(pegs):
+            if cache is not None:
+                cache.unsolvable(board.canonical(pegs),pegs)
+            return 0
+        legal = board.legalMask(pegs)
+        stack.append([pegs,0,orderMoves(board,pegs,None,legal)])
+        legals = [legal]
+        if metrics is not None:
+            metrics.expanded[0] += 1
+    else:
+        #The legal jumps of the frames of a resumed search are computed again.
+        legals = [board.legalMask(frame[0]) for frame in stack]
+    if metrics is not None:
+        metrics.grow(len(stack)-1)
+    #The jump ids of the moves that lead from the starting board to the board of the top frame. The move that led to each frame is the last move
+    #its parent frame applied, the one right before the parent's cursor.
+    moves_list = [frame[2][frame[1]-1][0] for frame in stack[:-1]]
+    if partial is not None and len(moves_list) > len(partial):
+        partial[:] = moves_list
+    nodes = 0
+
+    while stack:
+        frame = stack[-1]
+        pegs,cursor,moves = frame
+        total = len(moves)
+
+        #Find the next move of the frame that is possible..
+        while cursor < total:
+            k,skip = moves[cursor]
+            fromOver,to,flip = jumps[k]
+            if pegs & fromOver == fromOver and not pegs & to:
+                break
+            cursor += 1
+
+        #If there are no more moves, backtrack and remove the move that led to this board from the path.
+        if cursor == total:
+            stack.pop()
+            legals.pop()
+            if moves_list:
+                moves_list.pop()
+            continue
+
+        #Make the move and store the new board and its key.
+        nextPegs = pegs ^ flip
+        key = board.canonical(nextPegs)
+        if metrics is not None:
+            metrics.generated[len(stack)-1] += 1
+
+        #If the board is previously encountered skip the rest of the moves of the same group.
+        if boardPreviouslySeen(memory,key):
+            frame[1] = skip
+            if metrics is not None:
+                metrics.duplicates += 1
+            continue
+
+        #If the current board is not previously encountered save it together with the move that was made.
+        frame[1] = cursor + 1
+        memory.store(key)
+        moves_list.append(k)
+        if partial is not None and len(moves_list) > len(partial):
+            partial[:] = moves_list
+
+        #If the problem is solved stop and return the path.
+        if solutionFound(nextPegs):
+            path.extend(board.jumpMoves[k] for k in moves_list)
+            return 1
+
+        #If the result of the new board is known use it.
+        if cache is not None:
+            known = cache.lookup(key,nextPegs)
+            if known is False:
+                moves_list.pop()
+                continue
+            if known is not None:
+                path.extend(board.jumpMoves[k] for k in moves_list + known)
+                return 1
+
+        #If the new board cannot be solved do not search it.
+        if pruner is not None and pruner.prune(nextPegs):
+            if cache is not None:
+                cache.unsolvable(key,nextPegs)
+            moves_list.pop()
+            continue
+
+        #Otherwise continue the search from the new board.
+        legal = board.updateLegalMask(legals[-1],nextPegs,k)
+        stack.append([nextPegs,0,orderMoves(board,nextPegs,k,legal)])
+        legals.append(legal)
+        nodes += 1
+        if metrics is not None:
+            depth = len(stack)-1
+            metrics.grow(depth)
+            metrics.expanded[depth] += 1
+            if nodes % PROGRESS_NODES == 0:
+                metrics.tick(depth,memory)
+        if nodes == maxNodes:
+            return -1
+        if stop is not None and nodes % STOP_NODES == 0 and stop():
+            return -1
+    return 0
+
+'''
+This function groups the rated moves of a board for the Best-First solvers. The rated moves are saved in a dictionary where the key is the rating and the values
+are lists of the corresponding jumps. The dictionary is sorted based on the keys and each move is paired with the position of the first move of the next rating,
+where the search skips to if the move leads to a previously encountered board. If two moves have the same rating, the one that was first found is the first one to be applied.
+
+Input:  [search_dict] Dictionary of the rated moves (rating --> list of jump ids).
+        [reverse] True if the moves with the highest rating must be applied first.
+
+Output: List of (jump id, skip) pairs.
+'''
+
+def orderRatedMoves(search_dict,reverse):
+    moves = []
+    for key in sorted(search_dict, reverse=reverse):
+        skip = len(moves) + len(search_dict[key])
+        for k in search_dict[key]:
+            moves.append((k,skip))
+    return moves
+
+'''
+This function represents a Depth-First search solution that traverses through the (hypothetical) search tree unti a solution is found. Board states that were previously
+visited are stored in a transposition table called memory and the function backtracks when it encounters them. The function goes through each peg on the board
+(represented as a peg bitmask) and checks which moves are possible (and in which direction). If any legal move is possible on the first peg encountered, the move
+is executed and the search continues from the Updated board. The moves are examined in the scan order of the board: the search keeps the legal jumps of each
+board as a bitmask that it updates after every move (see BoardGeometry.updateLegalMask), and board.scanMoves lists them in scan order.
+
+Input:  [board] BoardGeometry of the problem.
+        [pegs] Integer bitmask of the pegs of the board's current state.
+        [path] List of strings that stores the moves that were made on the current board.
+        [memory] TranspositionTable that stores the keys of the previously encountered board states.
+        [pruner] Pruner that cuts the boards that cannot be solved (None for no pruning).
+
+Output: [path] The final list that contains the moves for the first solution found.
+'''
+
+def depth_first_solver(board,pegs,path,memory,pruner=None):
+    return search(board,pegs,depthFirstOrder,path,memory,pruner=pruner)
+
+def depthFirstOrder(board,pegs,previous=None,legal=None):
+    return board.scanMoves(legal if legal is not None else board.legalMask(pegs))
+
+'''
+This function implements a Best-First search solution that traverses through the (hypothetical) search tree unti a solution is found. Board states that were previously
+visited are stored in a transposition table called memory and the function backtracks when it encounters them. The heuristic function used essentialy uses 2 criteria in order to rate each possible
+move at the current point of the search. The first criterion is the number of available moves in the resulting board and the second one, is the number of isolated pegs in the resulting board
+after the move is applied. This rating is calculated for each 'child node' (each possible move) from the current node in the search tree that is examined.
+The ratings are saved in a dictionary where the key is the rating and the values are lists of the corresponding rated moves. The dictionary is then sorted in descending
+order and the highest rated moves are applied to the board. The search continues based on the moves ratings until a solution is found. If two moves have the same rating,
+the one that was first found is the first one to be applied.
+
+Input:  [board] BoardGeometry of the problem.
+        [pegs] Integer bitmask of the pegs of the board's current state.
+        [path] List of strings that stores the moves that were made on the current board.
+        [memory] TranspositionTable that stores the keys of the previously encountered board states.
+        [pruner] Pruner that cuts the boards that cannot be solved (None for no pruning).
+
+Output: [path] The final list that contains the moves for the first solution found.
+'''
+
+def heuristic_solver_rating(board,pegs,path,memory,pruner=None):
+    return search(board,pegs,ratingOrder,path,memory,pruner=pruner)
+
+def ratingOrder(board,pegs,previous=None,legal=None):
+    #This dictionary saves the rating for each possible move at the current search point.
+    search_dict = {}
+
+    #Find each peg that has an available move in some direction..
+    jumpIds = board.legalJumps(pegs,legal)
+    #and rate the resulting board with the sum of the amount of possible moves and the amount of pegs that are not isolated.
+    for k,rating in zip(jumpIds,scoreChildren('rating',board,pegs,jumpIds)):
+        #If the current key-rating already exists update its (list) value with the corresponding move.
+        #Moves with same rating are saved in the same list and the one first found is the first one to be applied.
+        if rating in search_dict:
+            search_dict[rating].append(k)
+        #else, create a new key-rating with a list that contains the corresponding move as its value.
+        else:
+            search_dict[rating] = [k]
+
+    #If a move-ordering table was learned for the shape, the moves with the same rating are tried in its order instead of the scan order.
+    if board.moveOrdering is not None:
+        board.moveOrdering.sortGroups(search_dict,pegs,previous)
+
+    #Sort the moves in descending order based on the keys (ratings) since we want the moves with highest rating.
+    return orderRatedMoves(search_dict,True)
+
+'''
+This function implements a Best-First search solution that traverses through the (hypothetical) search tree unti a solution is found. Board states that were previously
+visited are stored in a transposition table called memory and the function backtracks when it encounters them. The heuristic function used essentialy uses 1 criterion in order to rate each possible
+move at the current point of the search. The criterion is the Manhattan Distance of each peg on the board with every other peg. This distance is calculated for each 'child node'
+(the resulting board for each possible move) from the current node in the search tree that is examined. The distances are saved in a dictionary where the key is the total distance
+and the values are lists of the corresponding moves. The dictionary is then sorted in asceding order and moves that result to a board with the smallest possible total
+distance are applied to the board. The search continues until a solution is found. If two moves have the same total distance, the one that was first found
+is the first one to be applied.
+
+Input:  [board] BoardGeometry of the problem.
+        [pegs] Integer bitmask of the pegs of the board's current state.
+        [path] List of strings that stores the moves that were made on the current board.
+        [memory] TranspositionTable that stores the keys of the previously encountered board states.
+        [pruner] Pruner that cuts the boards that cannot be solved (None for no pruning).
+
+Output: [path] The final list that contains the moves for the first solution found.
+'''
+
+def heuristic_solver_manhattan(board,pegs,path,memory,pruner=None):
+    return search(board,pegs,manhattanOrder,path,memory,pruner=pruner)
+
+def manhattanOrder(board,pegs,previous=None,legal=None):
+    search_dict = {}
+
+    jumpIds = board.legalJumps(pegs,legal)
+    #Calculate the total distance between the pegs on each resulting board..
+    for k,total_distance in zip(jumpIds,scoreChildren('manhattan',board,pegs,jumpIds)):
+        #And accordingly save it in the dictionary.
+        if total_distance in search_dict:
+            search_dict[total_distance].append(k)
+        else:
+            search_dict[total_distance] = [k]
+
+    if board.moveOrdering is not None:
+        board.moveOrdering.sortGroups(search_dict,pegs,previous)
+
+    #Sort the moves in asceding order based on the keys (distance) since we want to start applying moves that result to boards with the least total distance between the pegs.
+    return orderRatedMoves(search_dict,False)
+
+'''
+This function implements a Best-First search solution that traverses through the (hypothetical) search tree unti a solution is found. Board states that were previously
+visited are stored in a transposition table called memory and the function backtracks when it encounters them. The heuristic function used essentialy uses 1 criterion in order to rate each possible
+move at the current point of the search. The criterion is the Total (Square) Area on the board that is covered by the pegs. The covered area is calculated for each 'child node'
+(the resulting board for each possible move) from the current node in the search tree that is examined. The values are saved in a dictionary where the key is the total area
+and the values are lists of the corresponding moves. The dictionary is then sorted in asceding order, and moves that result to a board with the smallest possible total
+covered area are applied to the board. The search continues until a solution is found. If two moves have the same total area,
+the one that was first found is the first one to be applied.
+
+Input:  [board] BoardGeometry of the problem.
+        [pegs] Integer bitmask of the pegs of the board's current state.
+        [path] List of strings that stores the moves that were made on the current board.
+        [memory] TranspositionTable that stores the keys of the previously encountered board states.
+        [pruner] Pruner that cuts the boards that cannot be solved (None for no pruning).
+
+Output: [path] The final list that contains the moves for the first solution found.
+'''
+
+def heuristic_solver_area(board,pegs,path,memory,pruner=None):
+    return search(board,pegs,areaOrder,path,memory,pruner=pruner)
+
+def areaOrder(board,pegs,previous=None,legal=None):
+    search_dict = {}
+
+    jumpIds = board.legalJumps(pegs,legal)
+    #Calculate the total area covered by the pegs on each resulting board..
+    for k,area in zip(jumpIds,scoreChildren('area',board,pegs,jumpIds)):
+        #And accordingly save it in the dictionary.
+        if area in search_dict:
+            search_dict[area].append(k)
+        else:
+            search_dict[area] = [k]
+
+    if board.moveOrdering is not None:
+        board.moveOrdering.sortGroups(search_dict,pegs,previous)
+
+    #Sort the moves in asceding order based on the keys (area) since we want to start applying moves that result to boards with the least total area covered by the pegs.
+    return orderRatedMoves(search_dict,False)
+
+'''
+This function implements a solution that tries the moves in the order learned from the solutions of the corpus (see MoveOrdering.py) instead of rating
+the child of every move. The possible moves of the board are ranked by the move-ordering table of its shape: first the killer moves of its number of pegs,
+then the moves that most often followed the previous move and then the moves that were most often made at all. Since no two moves are rated the same,
+a move that leads to a previously encountered board only skips itself. A shape without a table is searched in scan order.
+
+Input:  [board] BoardGeometry of the problem.
+        [pegs] Integer bitmask of the pegs of the board's current state.
+        [path] List of strings that stores the moves that were made on the current board.
+        [memory] TranspositionTable that stores the keys of the previously encountered board states.
+        [pruner] Pruner that cuts the boards that cannot be solved (None for no pruning).
+
+Output: [path] The final list that contains the moves for the first solution found.
+'''
+
+def heuristic_solver_learned(board,pegs,path,memory,pruner=None):
+    return search(board,pegs,learnedOrder,path,memory,pruner=pruner)
+
+def learnedOrder(board,pegs,previous=None,legal=None):
+    table = board.moveOrdering
+    if table is None:
+        return depthFirstOrder(board,pegs,previous,legal)
+    jumpIds = board.legalJumps(pegs,legal)
+    ranks = table.ranks(pegs,previous,jumpIds)
+    order = sorted(range(len(jumpIds)), key=ranks.__getitem__, reverse=True)
+    return [(jumpIds[i],position + 1) for position,i in enumerate(order)]
+
+'''
+This function is used in order to find out whether a given board was previously encountered. Since a board is stored as the integer bitmask of its pegs, the
+board itself (or, when symmetries are enabled, the smallest bitmask among its rotations and mirror images, see BoardGeometry.canonical) is the key that is saved
+into the memory, a transposition table (see TranspositionTable.py) that answers the lookup in constant time. The search itself always continues on the board
+as it is, so the moves of the solution never have to be mapped back to the original orientation.
+
+Input:  [memory] TranspositionTable of the boards previously encountered while searching.
+        [pegs] Integer key of the current board we want to check.
+
+Output: 1--> if the board is previously encountered (if the key is in the table)
+        2--> if it is a new board.
+'''
+
+def boardPreviouslySeen(memory,pegs):
+    if memory.lookup(pegs):
+        return 1
+    else:
+        return 0
+
+#The move ordering of each solver, by the name that is used by the other modules.
+STRATEGIES = {'depth': depthFirstOrder, 'area': areaOrder, 'manhattan': manhattanOrder, 'rating': ratingOrder, 'learned': learnedOrder}
+
+
+'''
+This class holds the limits of a single solve.
+
+Input:  [maxNodes] Maximum number of new boards that are searched before the solver stops (None for no limit).
+        [memoryCap] Maximum number of boards kept in the transposition table (None for no limit).
+        [eviction] Which board is replaced when the transposition table is full (fifo, lru or none).
+        [maxSeconds] Number of seconds the solve may run before it stops (None for no limit).
+        [maxMemory] Number of megabytes of resident memory the process may reach before the solve stops (None for no limit, see Budget.py).
+'''
+
+class Limits:
+    def __init__(self, maxNodes=None, memoryCap=None, eviction='fifo', maxSeconds=None, maxMemory=None):
+        if eviction not in EVICTION_POLICIES:
+            raise ValueError("Unknown eviction policy: " + str(eviction))
+        self.maxNodes = maxNodes
+        self.memoryCap = memoryCap
+        self.eviction = eviction
+        self.maxSeconds = maxSeconds
+        self.maxMemory = maxMemory
+
+    '''
+    This function returns the Watchdog of the time and memory limits, or None if there are none.
+    '''
+
+    def watchdog(self):
+        if self.maxSeconds is None and self.maxMemory is None:
+            return None
+        return Watchdog(self.maxSeconds, self.maxMemory)
+
+'''
+This class holds the result of a solve.
+
+Attributes: [status] solved, unsolvable (a complete method proved there is no solution: the pruning rules, IDA*, the retrograde frontier, the
+                     breadth-first search on disk or the cache), exhausted (the backtracking or best-first search ran out of boards without a solution,
+                     which is not a proof: the backtracking searches skip the rest of a group of moves after a repeated board) or stopped (a limit was
+                     reached first).
+            [moves] List of the moves of the solution, as the strings that are written to the output file (empty if there is no solution).
+            [seconds] Time the solve needed.
+            [stats] Dictionary with the counters of the memory (hits, misses, evictions, size) and, for the parallel search, of the workers.
+            [prunes] Dictionary with the number of boards cut by each pruning rule, or None if pruning is off.
+            [metrics] Dictionary with the counters of the backtracking search (see SearchMetrics.summary), or None if they were not collected.
+            [reason] nodes, time or memory, the limit that stopped the solve (None if it was not stopped).
+            [partial] List of the moves to the board with the fewest pegs the search reached, in the same format as the moves (empty if it was solved).
+            [pegsLeft] Number of pegs left after the moves of the solution or, if there is none, of the partial solution.
+'''
+
+class SolveResult:
+    def __init__(self, status, moves, seconds, stats, prunes=None, metrics=None, reason=None, partial=None, pegsLeft=None):
+        self.status = status
+        self.moves = moves
+        self.seconds = seconds
+        self.stats = stats
+        self.prunes = prunes
+        self.metrics = metrics
+        self.reason = reason
+        self.partial = partial if partial is not None else []
+        self.pegsLeft = pegsLeft
+
+    @property
+    def solved(self):
+        return self.status == 'solved'
+
+    def __repr__(self):
+        if self.status == 'stopped':
+            return "SolveResult(stopped by %s, %d pegs left, %.3f seconds)" % (self.reason, self.pegsLeft, self.seconds)
+        return "SolveResult(%s, %d moves, %.3f seconds)" % (self.status, len(self.moves), self.seconds)
+
+#Number of boards the search with checkpoints searches between two checks of the time since the last checkpoint.
+CHECKPOINT_NODES = 20000
+
+#The status of a solve for each return value of the searches. A search that returns 0 without a proof is exhausted instead of unsolvable.
+STATUS = {1: 'solved', 0: 'unsolvable', -1: 'stopped'}
+
+#The exit code of the program for each status (1 and 2 are left to uncaught exceptions and to the errors of the arguments).
+EXIT_CODES = {'solved': 0, 'unsolvable': 3, 'stopped': 4, 'exhausted': 5}
+
+'''
+This class is the library interface of the solvers. A Solver holds the options of the search and solves any number of boards, one call of solve at a
+time, without any state shared with other solvers or kept between the solves apart from the BoardGeometry of each layout it has seen (which never changes
+while a board is solved). So many boards can be solved in one process, without starting a new interpreter and reading a file for each of them.
+
+Input:  [symmetry] True if rotated and mirrored boards are treated as the same board state.
+        [prune] True if the boards that cannot be solved are cut (see Pruning.py).
+        [batchScoring] True if the heuristics use their NumPy batch versions.
+        [search] How the best-first strategies search: backtracking, best-first, astar (see BestFirstSearch.py) or ida (see IterativeDeepening.py).
+                 IDA* keeps its boards in a table of limits.memoryCap slots, so its memory does not grow.
+        [weight] Weight of the heuristic score in A* and IDA*.
+        [frontierCap] Maximum number of boards in the queue of the best-first search and A*.
+        [workers] Number of processes that search in parallel (see ParallelSearch.py).
+        [frontierDepth] Depth up to which the search tree is expanded before it is split between the workers.
+        [splitNodes] Number of boards a worker searches before it hands the rest of its subtree back.
+        [sharedTable] Number of slots of a shared transposition table for the workers (None for a separate memory per worker).
+        [cache] SolutionCache that is consulted and filled by every solve (None for no cache). Only the backtracking search in a single process
+                consults it for every board, the other searches only for the starting board.
+        [retrograde] Number of jumps the backward search undoes from the final boards before the forward search meets it (None for no backward
+                     search, see RetrogradeSearch.py). It is only used by the backtracking search in a single process.
+        [target] (line, column) of the hole where the last peg must end, counted from 0 (None for any hole).
+        [disk] Directory where the breadth-first search keeps its levels (None to search in memory, see ExternalSearch.py). A search that was
+               interrupted goes on from the checkpoint of the directory.
+        [ramBudget] Number of megabytes of memory the boards of the disk-backed search may use.
+        [checkpoint] File where the state of the backtracking search in a single process is saved every checkpointEvery seconds (None for no
+                     checkpoints, see Checkpoint.py). It is removed when the solve ends, unless the solve was stopped by a limit.
+        [checkpointEvery] Number of seconds between two checkpoints.
+        [resume] True if the solve goes on from the checkpoint file, when it exists.
+        [metrics] True if the backtracking search counts what it does (see Metrics.py). The other searches only report their memory counters.
+        [progressEvery] Number of seconds between two progress lines of the backtracking search on stderr (None for no progress lines).
+        [ordering] Dictionary of the learned move-ordering tables of the shapes (see MoveOrdering.loadTables, None for no tables). The learned
+                   solver orders its moves by them and the heuristic solvers break the ties of their ratings with them.
+'''
+
+class Solver:
+    def __init__(self, symmetry=False, prune=False, batchScoring=False, search='backtracking', weight=1.0, frontierCap=None,
+                 workers=1, frontierDepth=3, splitNodes=100000, sharedTable=None, cache=None, retrograde=None, target=None,
+                 disk=None, ramBudget=256, checkpoint=None, checkpointEvery=60.0, resume=False,
+                 metrics=False, progressEvery=None, ordering=None):
+        if search not in ('backtracking', 'ida') and search not in SEARCH_MODES:
+            raise ValueError("Unknown search mode: " + str(search))
+        if retrograde is not None and (search != 'backtracking' or workers > 1):
+            raise ValueError("The retrograde search only works with the backtracking search in a single process")
+        if target is not None and retrograde is None:
+            raise ValueError("A target hole needs the retrograde search")
+        if disk is not None and (workers > 1 or retrograde is not None):
+            raise ValueError("The disk-backed search runs in a single process without the retrograde search")
+        if checkpoint is not None and (workers > 1 or retrograde is not None or disk is not None or search != 'backtracking'):
+            raise ValueError("Checkpoints are only saved by the backtracking search in a single process")
+        if resume and checkpoint is None:
+            raise ValueError("Resuming needs a checkpoint file")
+        self.symmetry = symmetry
+        self.prune = prune
+        self.batchScoring = batchScoring
+        self.search = search
+        self.weight = weight
+        self.frontierCap = frontierCap
+        self.workers = workers
+        self.frontierDepth = frontierDepth
+        self.splitNodes = splitNodes
+        self.sharedTable = sharedTable
+        self.cache = cache
+        self.retrograde = retrograde
+        self.target = target
+        self.disk = disk
+        self.ramBudget = ramBudget
+        self.checkpoint = checkpoint
+        self.checkpointEvery = checkpointEvery
+        self.resume = resume
+        self.metrics = metrics
+        self.progressEvery = progressEvery
+        self.ordering = ordering
+        self.geometries = {}
+        self.frontiers = {}
+
+    '''
+    This function returns the BoardGeometry of the layout of a board, built with the options of the solver the first time the layout is seen.
+    '''
+
+    def geometry(self, board):
+        layout = board.layout()
+        geometry = self.geometries.get(layout)
+        if geometry is None:
+            geometry = board.geometry()
+            if self.symmetry:
+                geometry.enableSymmetries()
+            geometry.batchScoring = self.batchScoring
+            if self.ordering is not None:
+                geometry.moveOrdering = self.ordering.get(layout)
+            self.geometries[layout] = geometry
+        return geometry
+
+    '''
+    This function solves a board.
+
+    Input:  [board] The Board to solve.
+            [strategy] Name of the solver (depth, area, manhattan or rating).
+            [limits] Limits of the solve (None for no limits).
+
+    Output: SolveResult of the solve.
+    '''
+
+    def solve(self, board, strategy='area', limits=None):
+        if strategy not in STRATEGIES:
+            raise ValueError("Unknown strategy: " + str(strategy))
+        if strategy == 'learned' and self.search != 'backtracking':
+            raise ValueError("The learned move ordering only works with the backtracking search")
+        if limits is None:
+            limits = Limits()
+        start = time.time()
+        geometry = self.geometry(board)
+        pegs = board.pegs
+        path = []
+        memory = TranspositionTable(limits.memoryCap, limits.eviction)
+        stats = memory.stats()
+        pruner = Pruner(geometry,pegs) if self.prune else None
+        positions = self.cache.load(geometry) if self.cache is not None else None
+        known = positions.lookup(geometry.canonical(pegs),pegs) if positions is not None else None
+        metrics = SearchMetrics(self.progressEvery) if self.metrics or self.progressEvery is not None else None
+        watchdog = limits.watchdog()
+        partial = []
+        #Whether a status 0 was proved by a complete method (the searches that are not one leave it False and the solve is exhausted).
+        proved = False
+
+        if pegCount(pegs) == 1:
+            #A starting board with a single peg is already solved, whatever the search would make of it.
+            status = 1
+        elif known is not None:
+            #The cache only holds what was proved.
+            status = 1 if known is not False else 0
+            proved = True
+            path.extend(geometry.jumpMoves[k] for k in known or [])
+        elif pruner is not None and pruner.prune(pegs):
+            status = 0
+            proved = True
+            if positions is not None:
+                positions.unsolvable(geometry.canonical(pegs),pegs)
+        elif self.retrograde is not None:
+            frontier = self.backwardFrontier(geometry,pegs)
+            stats['frontier'] = len(frontier)
+            frontier.hits = 0
+            known = frontier.lookup(None,pegs)
+            #Every solution goes through the frontier, so when it is empty (no feasible final hole, or not the target) nothing has to be searched.
+            if not frontier.levels[-1]:
+                status = 0
+                proved = True
+            elif known is not None:
+                status = 1 if known is not False else 0
+                proved = True
+                path.extend(geometry.jumpMoves[k] for k in known or [])
+            else:
+                status = search(geometry,pegs,STRATEGIES[strategy],path,memory,maxNodes=limits.maxNodes,pruner=pruner,cache=frontier,metrics=metrics,
+                                stop=watchdog,partial=partial)
+                stats.update(memory.stats())
+            stats['frontierHits'] = frontier.hits
+        elif self.disk is not None:
+            from ExternalSearch import external_solver
+            status = external_solver(geometry,pegs,path,stats,self.disk,self.ramBudget << 20,pruner,limits.maxNodes,watchdog,partial)
+            #The breadth-first search goes through every board that can be reached, so when it fails the board cannot be solved.
+            proved = True
+            if status == 0 and positions is not None:
+                positions.unsolvable(geometry.canonical(pegs),pegs)
+        elif strategy != 'depth' and self.search == 'ida':
+            report = None
+            if self.progressEvery is not None:
+                report = lambda iteration, threshold, expanded: print("IDA* iteration %d: threshold %g, %d boards expanded" % (iteration, threshold, expanded),
+                                                                      file=sys.stderr, flush=True)
+            status = ida_solver(geometry,pegs,strategy,path,stats,self.weight,limits.memoryCap,pruner,limits.maxNodes,watchdog,partial,report)
+            #IDA* only fails when an iteration skipped no board because of the threshold, so it searched every board that can be reached.
+            proved = True
+            if status == 0 and positions is not None:
+                positions.unsolvable(geometry.canonical(pegs),pegs)
+        elif strategy != 'depth' and self.search != 'backtracking':
+            status = best_first_solver(geometry,pegs,strategy,path,stats,self.search,self.weight,self.frontierCap,pruner,limits.maxNodes,
+                                       watchdog,partial)
+        elif self.workers > 1:
+            from ParallelSearch import parallel_solver
+            status = parallel_solver(geometry,pegs,strategy,path,stats,self.workers,self.frontierDepth,self.splitNodes,limits.memoryCap,limits.eviction,
+                                     self.sharedTable,pruner,limits.maxNodes,watchdog,partial)
+        elif self.checkpoint is not None:
+            status = self.checkpointedSearch(geometry,pegs,strategy,path,memory,limits,pruner,positions,metrics,watchdog,partial)
+            stats = memory.stats()
+        else:
+            status = search(geometry,pegs,STRATEGIES[strategy],path,memory,maxNodes=limits.maxNodes,pruner=pruner,cache=positions,metrics=metrics,
+                            stop=watchdog,partial=partial)
+            stats = memory.stats()
+
+        if positions is not None:
+            if status == 1:
+                self.storeSolution(geometry,pegs,path,positions)
+            stats['cacheHits'] = positions.hits
+            self.cache.save(positions)
+
+        prunes = None
+        if pruner is not None:
+            prunes = stats.pop('prunes', pruner.stats())
+        summary = metrics.summary(memory) if metrics is not None and metrics.searches else None
+        reason = None
+        if status == -1:
+            reason = watchdog.reason if watchdog is not None and watchdog.reason is not None else 'nodes'
+        if status == 1:
+            partial = []
+        return SolveResult(STATUS[status] if status != 0 or proved else 'exhausted', path, time.time() - start, stats, prunes, summary, reason, [geometry.jumpMoves[k] for k in partial],
+                           1 if status == 1 else pegCount(pegs) - len(partial))
+
+    '''
+    This function runs the backtracking search in slices of CHECKPOINT_NODES boards and saves its state to the checkpoint file between them, at most once
+    every checkpointEvery seconds. search keeps its frames in the stack it is given when it stops at the end of a slice, so the next slice (or a search
+    that is resumed from the checkpoint) goes on with exactly the same state as a search that never stopped.
+
+    Input:  [geometry] BoardGeometry of the problem.
+            [pegs] Integer bitmask of the pegs of the starting board.
+            [strategy] Name of the solver.
+            [path] List where the moves of the solution are stored.
+            [memory] TranspositionTable of the search.
+            [limits] Limits of the solve. Its maxNodes counts the boards of this solve only, so a solve that goes on from a checkpoint gets the
+                     whole limit again.
+            [pruner] Pruner of the solve (None for no pruning).
+            [positions] CachedPositions of the solve (None for no cache).
+            [metrics] SearchMetrics of the solve (None for no counters).
+            [stop] Watchdog of the solve (None for no time or memory budget). The slices check it every STOP_NODES boards like search does, and a
+                   slice that it stops is saved where it stopped.
+            [partial] List of the jump ids to the deepest board stored so far (None if not needed). It is saved with the checkpoint and read back
+                      from it.
+
+    Output: The status of the search (see search).
+    '''
+
+    def checkpointedSearch(self, geometry, pegs, strategy, path, memory, limits, pruner, positions, metrics=None, stop=None, partial=None):
+        problem = problemKey(geometry, pegs, [('strategy', strategy), ('symmetry', self.symmetry), ('batchScoring', self.batchScoring),
+                                              ('prune', self.prune), ('memoryCap', limits.memoryCap), ('eviction', limits.eviction),
+                                              ('ordering', geometry.moveOrdering.checksum if geometry.moveOrdering is not None else None)])
+        orderMoves = STRATEGIES[strategy]
+        stack = []
+        nodes = 0
+        if self.resume and os.path.exists(self.checkpoint):
+            frames, nodes, prunes, deepest = loadCheckpoint(self.checkpoint, problem, memory)
+            #The moves of a frame depend on the move that led to it, the last move of the frame before it.
+            for board, cursor in frames:
+                stack.append([board, cursor, orderMoves(geometry,board,stack[-1][2][stack[-1][1]-1][0] if stack else None)])
+            if pruner is not None:
+                pruner.prunes.update(prunes)
+            if partial is not None:
+                partial[:] = deepest
+        #search calls the Watchdog once every STOP_NODES boards, so the calls of a slice tell how many boards it searched when the Watchdog stopped it.
+        checks = [0]
+        def sliceStop():
+            checks[0] += 1
+            return stop()
+        #The boards of this solve, which the node limit is applied to, while nodes also counts the boards of the solves before the checkpoint.
+        searched = 0
+        saved = time.time()
+        while True:
+            budget = CHECKPOINT_NODES
+            if limits.maxNodes is not None:
+                budget = min(budget, limits.maxNodes - searched)
+            checks[0] = 0
+            status = search(geometry,pegs,orderMoves,path,memory,stack,budget,pruner,positions,metrics,sliceStop if stop is not None else None,
+                            partial) if budget > 0 else -1
+            if status != -1:
+                break
+            stopped = stop is not None and stop.reason is not None
+            count = checks[0] * STOP_NODES if stopped else max(budget, 0)
+            nodes += count
+            searched += count
+            if stopped or limits.maxNodes is not None and searched >= limits.maxNodes:
+                saveCheckpoint(self.checkpoint, problem, geometry, stack, memory, nodes, pruner.prunes if pruner is not None else None, partial)
+                return -1
+            if time.time() - saved >= self.checkpointEvery:
+                saveCheckpoint(self.checkpoint, problem, geometry, stack, memory, nodes, pruner.prunes if pruner is not None else None, partial)
+                saved = time.time()
+        if os.path.exists(self.checkpoint):
+            os.remove(self.checkpoint)
+        return status
+
+    '''
+    This function returns the backward frontier for a starting board. The final holes are the feasible ones for the parity of the board (or the target
+    hole, if it is one of them) and the depth is at most the number of pegs minus 1. Frontiers are kept by the solver, so the boards of the same layout
+    reuse them.
+
+    Input:  [geometry] BoardGeometry of the problem.
+            [pegs] Integer bitmask of the pegs of the starting board.
+
+    Output: BackwardFrontier of the board.
+    '''
+
+    def backwardFrontier(self, geometry, pegs):
+        finalHoles = Pruner(geometry,pegs).finalHoles
+        if self.target is not None:
+            line, column = self.target
+            finalHoles = [hole for hole in finalHoles if hole == line*geometry.columns + column]
+        depth = max(0, min(self.retrograde, pegCount(pegs) - 1))
+        frontierKey = (geometry.lines, geometry.columns, geometry.holes, tuple(finalHoles), depth)
+        frontier = self.frontiers.get(frontierKey)
+        if frontier is None:
+            frontier = self.frontiers[frontierKey] = BackwardFrontier(geometry,finalHoles,depth)
+        return frontier
+
+    '''
+    This function stores every board of a solution in the cache, with the moves that solve it from there.
+
+    Input:  [geometry] BoardGeometry of the problem.
+            [pegs] Integer bitmask of the pegs of the starting board.
+            [path] List of the moves of the solution.
+            [positions] CachedPositions of the solve.
+    '''
+
+    def storeSolution(self, geometry, pegs, path, positions):
+        jumpIds = {move: k for k, move in enumerate(geometry.jumpMoves)}
+        solution = [jumpIds[move] for move in path]
+        for index, k in enumerate(solution):
+            positions.solved(geometry.canonical(pegs),pegs,solution[index:])
+            pegs ^= geometry.jumps[k][2]
+
+
+#Below is the program's main function. It only runs when the program is executed, so the solvers can also be imported by other modules.
+if __name__ == '__main__':
+    #Start the timer in order to compare the different algorithm's and read the given arguments from the program's execution.
+    start = time.time()
+    parser = argparse.ArgumentParser(description="Solves the Peg Solitaire problem of the input file and writes the moves of the solution to the output file.")
+    parser.add_argument("algorithm", help="depth, best or portfolio")
+    parser.add_argument("inputFile", help="file of the problem (with --batch: a directory, a file with several problems, a file of boards of BinaryFormat.py or - for the standard input)")
+    parser.add_argument("outputFile", help="file where the moves are written (with --batch: the JSON lines of the results, or - for the standard output)")
+    parser.add_argument("heuristic", nargs="?", help="manhattan, rating or learned (the area heuristic is used if it is omitted)")
+    parser.add_argument("--memory-cap", type=int, default=None, help="maximum number of boards kept in the transposition table (the slots of the table of IDA*)")
+    parser.add_argument("--eviction", choices=EVICTION_POLICIES, default="fifo", help="which board is replaced when the transposition table is full")
+    parser.add_argument("--symmetry", action="store_true", help="treat rotated and mirrored boards as the same board state")
+    parser.add_argument("--batch-scoring", action="store_true", help="score the moves of the best-first solvers with the NumPy batch heuristics")
+    parser.add_argument("--workers", type=int, default=1, help="number of processes that search in parallel (with --batch: that solve different problems)")
+    parser.add_argument("--frontier-depth", type=int, default=3, help="depth up to which the search tree is expanded before it is split between the workers")
+    parser.add_argument("--shared-table", type=int, default=None, help="number of slots of a transposition table in shared memory that all the workers use")
+    parser.add_argument("--split-nodes", type=int, default=100000, help="number of boards a worker searches before it hands the rest of its subtree back to be split")
+    parser.add_argument("--prune", action="store_true", help="cut the boards whose parity, position classes or pagoda functions show they cannot be solved")
+    parser.add_argument("--search", choices=("backtracking",) + SEARCH_MODES + ("ida",), default="backtracking",
+                        help="how the best algorithm searches: backtracking (the moves of each board in heuristic order), a global best-first queue, A* or IDA*")
+    parser.add_argument("--weight", type=float, default=1.0, help="weight of the heuristic score in A* and IDA* (weighted when it is not 1)")
+    parser.add_argument("--cache", default=None, help="SQLite file of solved and unsolvable positions that is consulted and filled by the solvers (for every board by the backtracking search in a single process, for the starting board by the others)")
+    parser.add_argument("--cache-size", type=int, default=None, help="maximum number of positions kept in the cache (the least recently used are removed)")
+    parser.add_argument("--retrograde", type=int, nargs="?", const=8, default=None,
+                        help="undo this many jumps from the final boards (8 if no number is given) and let the forward search meet them")
+    parser.add_argument("--target", type=int, nargs=2, default=None, metavar=("LINE", "COLUMN"),
+                        help="hole (counted from 1, like the moves) where the last peg must end, for the retrograde search")
+    parser.add_argument("--disk", default=None, help="search breadth-first with the levels of the search in files of this directory (resumed if it holds a checkpoint)")
+    parser.add_argument("--ram-budget", type=int, default=256, help="number of megabytes of memory the boards of the --disk search may use")
+    parser.add_argument("--checkpoint", default=None, help="file where the state of the search is saved periodically (backtracking search in a single process)")
+    parser.add_argument("--checkpoint-every", type=float, default=60.0, help="number of seconds between two checkpoints")
+    parser.add_argument("--resume", action="store_true", help="go on from the state saved in the --checkpoint file, if it exists")
+    parser.add_argument("--progress", type=float, default=None, metavar="SECONDS", help="write the counters of the search to stderr every SECONDS seconds")
+    parser.add_argument("--metrics", default=None, help="file where a JSON summary of the counters of the solve is written (- for stderr)")
+    parser.add_argument("--profile", default=None, help="profile the solve with cProfile and write its statistics to this file (read them with pstats)")
+    parser.add_argument("--sample-interval", type=float, default=None, metavar="SECONDS",
+                        help="sample the running function every SECONDS seconds of CPU time and add the most sampled lines to the summary")
+    parser.add_argument("--ordering", default=None, help="file of the move-ordering tables learned by MoveOrdering.py")
+    parser.add_argument("--portfolio", default="depth,area,manhattan,rating",
+                        help="comma separated list of the solvers that the portfolio algorithm races in separate processes")
+    parser.add_argument("--stagger", type=float, default=0.0, metavar="SECONDS", help="number of seconds between the starts of two solvers of the portfolio")
+    parser.add_argument("--nice-step", type=int, default=0, help="niceness added for each solver of the portfolio after the first, to give the first ones more CPU")
+    parser.add_argument("--ranking", default=None, help="JSON file of the races won by each solver on each shape of board, which orders the portfolio")
+    parser.add_argument("--binary", action="store_true", help="write the solution as a file of solutions of the binary format of BinaryFormat.py (replaced, not appended to)")
+    parser.add_argument("--batch", action="store_true", help="solve every problem of the input and write one JSON line per problem")
+    parser.add_argument("--max-nodes", type=int, default=None, help="maximum number of boards searched for each problem")
+    parser.add_argument("--time-limit", type=float, default=None, metavar="SECONDS", help="stop the search of each problem after SECONDS seconds")
+    parser.add_argument("--memory-limit", type=float, default=None, metavar="MB",
+                        help="stop the search when the memory of the process reaches MB megabytes")
+    parser.add_argument("--frontier-cap", type=int, default=None, help="maximum number of boards kept in the queue of the best-first search and A*")
+    args = parser.parse_args()
+    algorithm = args.algorithm
+    inputFile = args.inputFile
+    outputFile = args.outputFile
+
+
+    #Find the selected solver.
+    strategy = None
+    if algorithm == 'depth':
+        strategy = 'depth'
+    elif  algorithm == 'best':
+        if args.heuristic is None:
+            strategy = 'area'
+        elif args.heuristic == 'manhattan':
+            strategy = 'manhattan'
+        elif args.heuristic == 'rating':
+            strategy = 'rating'
+        elif args.heuristic == 'learned':
+            strategy = 'learned'
+
+    cache = SolutionCache(args.cache, args.cache_size) if args.cache is not None else None
+    ordering = loadTables(args.ordering) if args.ordering is not None else None
+    target = (args.target[0] - 1, args.target[1] - 1) if args.target is not None else None
+
+    #In batch mode every problem is solved in a single process and the workers solve different problems.
+    if args.batch:
+        if strategy is None:
+            parser.error("unknown algorithm: " + algorithm)
+        from BatchSolver import solveBatch
+        solver = Solver(args.symmetry, args.prune, args.batch_scoring, args.search, args.weight, args.frontier_cap, cache=cache, retrograde=args.retrograde, target=target,
+                        ordering=ordering)
+        output = sys.stdout if outputFile == '-' else open(outputFile, "a")
+        counts = solveBatch(inputFile, output, solver, strategy, Limits(args.max_nodes, args.memory_cap, args.eviction, args.time_limit, args.memory_limit), args.workers)
+        if output is not sys.stdout:
+            output.close()
+        print(time.time()-start, "seconds", file=sys.stderr)
+        print("Problems:", sum(counts.values()), "(" + ", ".join(str(count) + " " + status for status, count in sorted(counts.items())) + ")", file=sys.stderr)
+        sys.exit(0)
+
+    #Read the file that contains the problem's starting board.
+    board = Board.fromFile(inputFile)
+
+    #Use the selected solver, in a single process or split between several workers, or race several solvers.
+    solver = Solver(args.symmetry, args.prune, args.batch_scoring, args.search, args.weight, args.frontier_cap,
+                    args.workers, args.frontier_depth, args.split_nodes, args.shared_table, cache, args.retrograde, target,
+                    args.disk, args.ram_budget, args.checkpoint, args.checkpoint_every, args.resume,
+                    args.metrics is not None, args.progress, ordering)
+    path = []
+    stats = TranspositionTable().stats()
+    prunes = dict.fromkeys(PRUNE_RULES, 0) if args.prune else None
+    result = None
+    winner = None
+    profiler = sampler = None
+    if args.profile is not None:
+        import cProfile
+        profiler = cProfile.Profile()
+        profiler.enable()
+    if args.sample_interval is not None:
+        sampler = SamplingProfiler(args.sample_interval)
+        sampler.start()
+    if algorithm == 'portfolio':
+        from Portfolio import portfolio_solver
+        for name in args.portfolio.split(','):
+            if name not in STRATEGIES:
+                parser.error("unknown solver in the portfolio: " + name)
+        if len(set(args.portfolio.split(','))) != len(args.portfolio.split(',')):
+            parser.error("every solver of the portfolio must be given once")
+        if args.workers > 1 or args.checkpoint is not None or args.disk is not None:
+            parser.error("the portfolio cannot be used with --workers, --checkpoint or --disk")
+        result, winner, order = portfolio_solver(solver, board, args.portfolio.split(','),
+                                                 Limits(args.max_nodes, args.memory_cap, args.eviction, args.time_limit, args.memory_limit),
+                                                 args.stagger, args.nice_step, args.ranking)
+    elif strategy is not None:
+        result = solver.solve(board, strategy, Limits(args.max_nodes, args.memory_cap, args.eviction, args.time_limit, args.memory_limit))
+    if result is not None:
+        #When a limit stopped the search the best partial solution is written instead.
+        path = result.moves if result.status != 'stopped' else result.partial
+        stats = result.stats
+        prunes = result.prunes
+    if sampler is not None:
+        sampler.stop()
+    if profiler is not None:
+        profiler.disable()
+        profiler.dump_stats(args.profile)
+
+    #Write the result in the file, as text lines or as a file of solutions of the binary format.
+    if args.binary:
+        from BinaryFormat import SolutionWriter
+        writer = SolutionWriter(outputFile)
+        writer.write(board, path)
+        writer.close()
+    else:
+        f = open(outputFile, "a")
+        for line in path:
+            if line:
+                f.write(str(line) + '\n')
+        f.close()
+    end = time.time()
+    print(end-start, "seconds")
+    if result is not None:
+        if result.status == 'stopped':
+            print("Status: stopped (%s limit), %d pegs left" % (result.reason, result.pegsLeft))
+        elif result.status == 'exhausted':
+            print("Status: exhausted (no solution found, not a proof that there is none), %d pegs left" % result.pegsLeft)
+        else:
+            print("Status:", result.status)
+    if winner is not None:
+        if result.status == 'solved':
+            print("Portfolio:", winner, "won the race of", ", ".join(order), "(started in this order)")
+        else:
+            print("Portfolio: no solution found by", ", ".join(order) + ", the result is the one of", winner)
+    if args.symmetry:
+        print("Symmetries:", len(solver.geometry(board).symmetries)+1)
+    if 'tasks' in stats:
+        print("Workers:", args.workers, "processes,", stats['tasks'], "subtrees searched,", stats['splits'], "subtrees split")
+        if args.shared_table is not None:
+            print("Shared memory:", stats['overflows'], "boards stored in the workers' overflow tables")
+    if prunes is not None:
+        print("Pruned:", sum(prunes.values()), "boards,", ", ".join(str(prunes[rule]) + " " + rule for rule in PRUNE_RULES))
+    if 'frontier' in stats:
+        print("Retrograde:", stats['frontier'], "boards in the backward search,", stats['frontierHits'], "boards of the forward search met it")
+    if 'iterations' in stats:
+        for iteration, counts in enumerate(stats['iterations'], 1):
+            print("IDA* iteration %d: threshold %g, %d boards expanded" % (iteration, counts['threshold'], counts['expanded']))
+    if 'levels' in stats:
+        print("Disk:", stats['levels'], "levels,", stats['runs'], "sorted runs merged")
+    if cache is not None:
+        print("Cache:", stats.get('cacheHits', 0), "hits,", len(cache), "positions stored")
+    print("Memory:", stats['hits'], "hits,", stats['misses'], "misses,", stats['evictions'], "evictions,", stats['size'], "boards stored")
+
+    #Write the summary of the solve.
+    if args.metrics is not None:
+        summary = {'status': result.status if result is not None else None, 'reason': result.reason if result is not None else None,
+                   'pegsLeft': result.pegsLeft if result is not None else None, 'seconds': end-start, 'moves': len(path), 'memory': stats,
+                   'prunes': prunes, 'search': result.metrics if result is not None else None}
+        if winner is not None:
+            summary['portfolio'] = {'winner': winner, 'order': order}
+        if sampler is not None:
+            summary['samples'] = sampler.top()
+        if args.metrics == '-':
+            json.dump(summary, sys.stderr, indent=1)
+            sys.stderr.write('\n')
+        else:
+            with open(args.metrics, 'w') as f:
+                json.dump(summary, f, indent=1)
+                f.write('\n')
+    elif sampler is not None:
+        for line in sampler.top(10):
+            print("Sampled: %5.1f%% %s (%s:%d) called by %s" % (100 * line['share'], line['function'], line['file'], line['line'], line['caller']), file=sys.stderr)
+
+    if result is not None:
+        sys.exit(EXIT_CODES[result.status])
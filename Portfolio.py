@@ -0,0 +1,174 @@
+'''
+This module races several solvers on the same problem. Which solver is the fastest changes a lot from board to board, so instead of picking one, the
+portfolio starts each of the chosen strategies in its own process and takes the first solution, after which the other processes are killed.
+
+The processes do not have to start on equal terms:
+    stagger --> the strategies are started one after the other, the given number of seconds apart, so on an easy board the first one finishes before
+                the others have used any time.
+    nice    --> each strategy runs with a niceness that is the given step higher than the one before it, so when there are fewer cores than strategies
+                the first ones get a larger share of the CPU.
+
+The order of the strategies is the order they are given in, unless a ranking file is given: the ranking counts the races each strategy has won on each
+shape of board (its lines, columns and holes) and the strategies that won most often on the shape are started first. The winner of every race is added
+to the ranking, so the order keeps learning from the boards that are solved. The ranking is a small JSON file that is replaced at once when it is written.
+'''
+
+import json
+import multiprocessing
+import os
+import queue
+import time
+
+#Number of seconds the race waits for a result before it checks whether another strategy has to be started.
+POLL_SECONDS = 0.05
+
+'''
+This function returns the key of the shape of a board in the ranking.
+'''
+
+def shapeKey(board):
+    return "%dx%d:%x" % board.layout()
+
+'''
+This function reads a ranking file.
+
+Input:  [path] Path of the ranking file.
+
+Output: Dictionary of the number of races each strategy won on each shape (shape key --> strategy --> wins). It is empty if the file does not exist.
+'''
+
+def loadRanking(path):
+    if not os.path.exists(path):
+        return {}
+    with open(path) as f:
+        return json.load(f)
+
+'''
+This function adds the winner of a race to a ranking file.
+
+Input:  [path] Path of the ranking file.
+        [board] The Board of the race.
+        [strategy] Name of the strategy that won.
+'''
+
+def recordWinner(path, board, strategy):
+    ranking = loadRanking(path)
+    wins = ranking.setdefault(shapeKey(board), {})
+    wins[strategy] = wins.get(strategy, 0) + 1
+    temporary = path + '.tmp'
+    with open(temporary, 'w') as f:
+        json.dump(ranking, f, indent=1, sort_keys=True)
+        f.write('\n')
+    os.replace(temporary, path)
+
+'''
+This function orders the strategies by the number of races they won on the shape of a board. Strategies with the same number of wins keep the given order.
+
+Input:  [ranking] Dictionary of the ranking (see loadRanking).
+        [board] The Board of the race.
+        [strategies] List of the names of the strategies.
+
+Output: List of the names of the strategies, the likely winner first.
+'''
+
+def rankStrategies(ranking, board, strategies):
+    wins = ranking.get(shapeKey(board), {})
+    return sorted(strategies, key=lambda strategy: -wins.get(strategy, 0))
+
+'''
+This function solves the problem with one strategy in a process of the race and sends its result back.
+
+Input:  [solver] Solver with the options of the race.
+        [board] The Board of the problem.
+        [index] Number of the process in the order of the race.
+        [strategy] Name of the strategy.
+        [limits] Limits of the solve.
+        [niceness] Number that is added to the niceness of the process.
+        [results] Queue where the (index, SolveResult or exception) pair is put.
+'''
+
+def raceStrategy(solver, board, index, strategy, limits, niceness, results):
+    try:
+        if niceness:
+            os.nice(niceness)
+        results.put((index, solver.solve(board, strategy, limits)))
+    except Exception as error:
+        results.put((index, error))
+
+'''
+This function races the strategies on a problem.
+
+Input:  [solver] Solver with the options of the race. It must search in a single process, without a checkpoint and in memory, since every strategy
+                 of the race runs in a process of its own and they would all write the same files.
+        [board] The Board of the problem.
+        [strategies] List of the names of the strategies, each of them once.
+        [limits] Limits of the solve of each strategy (None for no limits).
+        [stagger] Number of seconds between the starts of two strategies.
+        [niceStep] Niceness that is added for each strategy after the first one.
+        [ranking] Path of the ranking file (None for no ranking). The strategies are started in its order and the winner is added to it.
+
+A strategy that fails (it raises an exception or its process dies, e.g. killed by a signal) is out of the race, and the race only fails with its error
+when every strategy failed.
+
+Output: [result] SolveResult of the winner if a strategy found a solution. Otherwise the result of a strategy that proved there is no solution, or the
+                 result with the best partial solution if every strategy was stopped by a limit or exhausted without a proof.
+        [winner] Name of the strategy of the result.
+        [order] List of the names of the strategies in the order they were started.
+'''
+
+def portfolio_solver(solver, board, strategies, limits=None, stagger=0.0, niceStep=0, ranking=None):
+    if solver.workers > 1 or solver.checkpoint is not None or solver.disk is not None:
+        raise ValueError("Every strategy of the portfolio runs in a single process, without a checkpoint and in memory")
+    if not strategies:
+        raise ValueError("The portfolio needs at least one strategy")
+    if len(set(strategies)) != len(strategies):
+        raise ValueError("Every strategy of the portfolio must be given once")
+    order = rankStrategies(loadRanking(ranking), board, strategies) if ranking is not None else list(strategies)
+    results = multiprocessing.Queue()
+    processes = []
+    #The SolveResult or the exception of each process that finished, by its number in the order.
+    finished = {}
+    start = time.time()
+    try:
+        while len(finished) < len(order):
+            #Start the strategies whose turn has come.
+            while len(processes) < len(order) and time.time() - start >= len(processes) * stagger:
+                index = len(processes)
+                process = multiprocessing.Process(target=raceStrategy, args=(solver, board, index, order[index], limits, index * niceStep, results))
+                process.start()
+                processes.append(process)
+            try:
+                index, result = results.get(timeout=POLL_SECONDS)
+            except queue.Empty:
+                #A process that died without sending its result is out of the race. One that ended normally has sent its result before it
+                #ended, so it is read from the queue by the next poll.
+                for index, process in enumerate(processes):
+                    if index not in finished and not process.is_alive() and process.exitcode != 0:
+                        finished[index] = RuntimeError("The %s strategy of the portfolio ended with exit code %d" % (order[index], process.exitcode))
+                continue
+            finished[index] = result
+            #A proof that there is no solution ends the race as well, since no other strategy can find one.
+            if not isinstance(result, BaseException) and result.status in ('solved', 'unsolvable'):
+                break
+    finally:
+        for process in processes:
+            if process.is_alive():
+                process.terminate()
+        for process in processes:
+            process.join()
+
+    #The processes that finished, in the order they finished.
+    done = [index for index in finished if not isinstance(finished[index], BaseException)]
+    if not done:
+        raise next(iter(finished.values()))
+    solved = [index for index in done if finished[index].status == 'solved']
+    unsolvable = [index for index in done if finished[index].status == 'unsolvable']
+    if solved:
+        winner = solved[0]
+        if ranking is not None:
+            recordWinner(ranking, board, order[winner])
+    elif unsolvable:
+        winner = unsolvable[0]
+    else:
+        winner = min(done, key=lambda index: finished[index].pegsLeft)
+    return finished[winner], order[winner], order
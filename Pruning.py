@@ -0,0 +1,142 @@
+'''
+This module implements the pruning rules of the solvers. The solvers only backtrack from boards they have already encountered, so without pruning most of
+their time goes to subtrees that cannot be solved. A Pruner checks a few invariants of a board that no move can break and cuts the board when they show that
+a single final peg cannot be reached from it. The rules only depend on the layout of the holes, so everything is computed once from the BoardGeometry:
+
+    parity   --> Cells are split into 3 classes by (line+column) mod 3 and into 3 other classes by (line-column) mod 3. A jump covers one cell of each class, so
+                 it flips the parity of the number of pegs of all 3 classes, and the parity of the sum of any two classes never changes. A single peg can only
+                 end on the holes whose classes give the same parities as the starting board (the feasible final holes). If there are none the problem
+                 has no solution.
+    class    --> A peg moves 2 cells at a time, so it can only reach the holes that are connected to its cell by a chain of jumps. A final hole is kept only if
+                 at least one peg can still reach it.
+    pagoda   --> A pagoda function gives a value to every cell so that for every jump value(from)+value(over) >= value(to). The sum of the values of the pegs
+                 can then never increase, so a final hole whose value is larger than the value of the board cannot be reached. The 0/1 functions with
+                 the pattern 1 1 0 along the lines or the columns (period 3) are pagodas on every layout.
+    distance --> The pagoda where every cell is worth s**d, with d the Manhattan distance to the final hole and s = (sqrt(5)-1)/2 (so that s**2 + s = 1,
+                 as in Conway's soldiers). The final peg is worth 1, so the pegs of the board must be worth at least 1.
+
+A board is pruned when none of the feasible final holes is still reachable, and the rule that removed the last of them is counted.
+'''
+
+#s**2 + s = 1, so a jump towards the final hole keeps the value of the board and every other jump lowers it.
+GOLDEN = (5 ** 0.5 - 1) / 2
+
+#The distance pagoda is computed with floats, so a board is only pruned when its value is clearly below 1.
+EPSILON = 1e-9
+
+PRUNE_RULES = ('parity', 'class', 'pagoda', 'distance')
+
+'''
+This function returns the parities of the number of pegs of a board that no move can change.
+
+Input:  [board] BoardGeometry of the problem.
+        [pegs] Integer bitmask of the pegs of the board.
+
+Output: Tuple with the parity of the sum of each pair of classes.
+'''
+
+def paritySignature(board,pegs):
+    sums = [0] * 3
+    differences = [0] * 3
+    for cell in board.pegCells(pegs):
+        line, column = board.cellLine[cell], board.cellColumn[cell]
+        sums[(line + column) % 3] += 1
+        differences[(line - column) % 3] += 1
+    return ((sums[0] + sums[1]) % 2, (sums[1] + sums[2]) % 2, (differences[0] + differences[1]) % 2, (differences[1] + differences[2]) % 2)
+
+'''
+This function finds the cells from which a peg can reach the given hole, following the jumps of the board backwards.
+
+Input:  [board] BoardGeometry of the problem.
+        [hole] Cell of the final hole.
+
+Output: Integer bitmask of the cells.
+'''
+
+def reachingCells(board,hole):
+    jumpsTo = {}
+    for fromCell, overCell, toCell in board.jumpCells:
+        jumpsTo.setdefault(toCell, []).append(fromCell)
+    mask = 1 << hole
+    cells = [hole]
+    while cells:
+        cell = cells.pop()
+        for fromCell in jumpsTo.get(cell, ()):
+            if not mask >> fromCell & 1:
+                mask |= 1 << fromCell
+                cells.append(fromCell)
+    return mask
+
+'''
+This class implements the pruning rules. The rules of each feasible final hole are kept as bitmasks, so checking a board costs a few integer operations for
+each of them.
+
+Input:  [board] BoardGeometry of the problem.
+        [pegs] Integer bitmask of the pegs of the starting board.
+
+Attributes: [finalHoles] List of the cells where the last peg can end.
+            [prunes] Dictionary with the number of boards that were pruned by each rule.
+'''
+
+class Pruner:
+    def __init__(self, board, pegs):
+        self.board = board
+        signature = paritySignature(board, pegs)
+        self.finalHoles = [cell for cell in board.pegCells(board.holes) if paritySignature(board, 1 << cell) == signature]
+        self.prunes = dict.fromkeys(PRUNE_RULES, 0)
+
+        cellLine, cellColumn = board.cellLine, board.cellColumn
+        holeCells = board.pegCells(board.holes)
+        lineClasses = [sum(1 << cell for cell in holeCells if cellLine[cell] % 3 != r) for r in range(3)]
+        columnClasses = [sum(1 << cell for cell in holeCells if cellColumn[cell] % 3 != r) for r in range(3)]
+
+        #For each final hole: the cells that can reach it, the 1 1 0 pagodas where it is worth 1 (the board must have a peg on them) and the rings of
+        #the cells at each distance with their value.
+        self.rules = []
+        for hole in self.finalHoles:
+            line, column = cellLine[hole], cellColumn[hole]
+            pagodas = [lineClasses[r] for r in range(3) if line % 3 != r] + [columnClasses[r] for r in range(3) if column % 3 != r]
+            rings = {}
+            for cell in holeCells:
+                distance = abs(cellLine[cell] - line) + abs(cellColumn[cell] - column)
+                rings[distance] = rings.get(distance, 0) | (1 << cell)
+            rings = [(GOLDEN ** distance, mask) for distance, mask in sorted(rings.items())]
+            self.rules.append((reachingCells(board, hole), pagodas, rings))
+
+    '''
+    This function checks whether a board can still be solved.
+
+    Input:  [pegs] Integer bitmask of the pegs of the board.
+
+    Output: True--> if no final hole can be reached and the board is pruned
+            False--> if it may still be solved.
+    '''
+
+    def prune(self, pegs):
+        if not self.rules:
+            self.prunes['parity'] += 1
+            return True
+        rule = None
+        for reaching, pagodas, rings in self.rules:
+            if not pegs & reaching:
+                rule = 'class'
+                continue
+            if any(not pegs & mask for mask in pagodas):
+                rule = 'pagoda'
+                continue
+            #The closest rings are worth the most, so most boards reach 1 after the first few of them.
+            total = 0
+            for value, mask in rings:
+                total += value * (pegs & mask).bit_count()
+                if total >= 1 - EPSILON:
+                    return False
+            rule = 'distance'
+        self.prunes[rule] += 1
+        return True
+
+    '''
+    This function returns the number of boards that were pruned by each rule.
+    '''
+
+    def stats(self):
+        return dict(self.prunes)
@@ -0,0 +1,80 @@
+'''
+This module implements the retrograde (backward) half of a bidirectional search. Starting from the final boards, a single peg on each feasible final hole
+(see Pruning.py) or on one target hole, the jumps are undone (see BoardGeometry.legalUnjumps) level by level up to a given depth. Undoing a jump adds one peg,
+so level d holds every board with d+1 pegs that can be solved, and the last level is the backward frontier.
+
+The forward search then only has to reach the frontier instead of a single peg: a board with as many pegs as the frontier is solved if it is in it and cannot
+be solved otherwise, so the forward search tree is cut at that depth. The moves from the frontier to the end are found by going down the levels again, making
+at each step a jump that leads to a board of the next level.
+'''
+
+'''
+This class holds the levels of the backward search. It answers the same lookup as the CachedPositions of SolutionCache.py, so PegSolitaireSolver.search
+uses it as the cache of known results.
+
+Input:  [board] BoardGeometry of the problem.
+        [finalHoles] List of the cells where the last peg may end.
+        [depth] Number of jumps that are undone.
+
+Attributes: [levels] List of the sets of boards of each level, level d holds the boards with d+1 pegs.
+            [hits] Number of forward boards that were found in the frontier.
+'''
+
+class BackwardFrontier:
+    def __init__(self, board, finalHoles, depth):
+        self.board = board
+        self.depth = depth
+        self.levels = [{1 << hole for hole in finalHoles}]
+        self.hits = 0
+        jumps = board.jumps
+        for level in range(depth):
+            boards = set()
+            for pegs in self.levels[-1]:
+                boards.update(pegs ^ jumps[k][2] for k in board.legalUnjumps(pegs))
+            self.levels.append(boards)
+
+    def __len__(self):
+        return sum(len(level) for level in self.levels)
+
+    '''
+    This function looks up a board of the forward search.
+
+    Input:  [key] Integer key of the board (not used, the frontier holds the boards themselves).
+            [pegs] Integer bitmask of the pegs of the board.
+
+    Output: None--> if the board has more pegs than the frontier
+            False--> if it has as many pegs as the frontier but is not in it, so it cannot be solved
+            List of the jump ids that solve it otherwise.
+    '''
+
+    def lookup(self, key, pegs):
+        count = pegs.bit_count()
+        if count > len(self.levels):
+            return None
+        if pegs not in self.levels[count - 1]:
+            return False
+        self.hits += 1
+        return self.suffix(pegs)
+
+    '''
+    This function finds the moves that solve a board of the frontier, going down the levels.
+
+    Input:  [pegs] Integer bitmask of the pegs of the board.
+
+    Output: List of jump ids.
+    '''
+
+    def suffix(self, pegs):
+        jumps = self.board.jumps
+        moves = []
+        for level in reversed(self.levels[:pegs.bit_count() - 1]):
+            for k in self.board.legalJumps(pegs):
+                if pegs ^ jumps[k][2] in level:
+                    moves.append(k)
+                    pegs ^= jumps[k][2]
+                    break
+        return moves
+
+    #The forward search reports the boards the Pruner cuts, but the frontier does not need them.
+    def unsolvable(self, key, pegs):
+        pass
@@ -0,0 +1,206 @@
+'''
+This module implements a cache of solved positions that is kept on disk (in an SQLite database) between the runs of the solvers. For every board it stores
+either the moves that solve it from there (the suffix of a solution) or the fact that it cannot be solved, under the key of the board (see
+BoardGeometry.canonical) and its layout, so problems that start from a known position, or reach one while they are searched, are answered at once.
+
+What is stored is only what was proved:
+    solved     --> every board of a solution that was found, with the rest of the moves of the solution.
+    unsolvable --> the boards the Pruner cut (see Pruning.py) and the starting board of a search that went through the whole search tree. The backtracking
+                   solvers skip the rest of the moves of a group after a repeated board, so when they fail nothing is proved and nothing is stored.
+
+The positions of a layout are loaded into a dictionary the first time a problem of the layout is solved (see CachedPositions), so the search only pays a
+dictionary lookup for each new board. The dictionary is kept for the next problems of the layout, which only read the positions that were stored or used
+since the last one (by this process or by another one that shares the file), so the cost of a solve does not grow with the size of the cache. The cache can
+be limited to a number of positions: the positions that were not found or stored by the most recent solves are removed first (a process that already read
+them keeps them, since what is proved stays true).
+
+Only the backtracking search in a single process (with or without a checkpoint) looks up every board it reaches. The other searches (best-first, A*,
+IDA*, the parallel workers and the breadth-first search on disk) only look up the starting board, and store it when they prove it cannot be solved.
+'''
+
+import sqlite3
+
+'''
+This class holds the positions of one layout while a problem is solved: the ones loaded from the cache and the ones found by the solve, which
+SolutionCache.save writes back.
+
+Input:  [geometry] BoardGeometry of the problem.
+        [entries] Dictionary of the cached positions (key --> (pegs, suffix)), where suffix is the list of the jump ids that solve the board or None
+                  if it cannot be solved.
+
+Attributes: [hits] Number of boards whose result was found in the cache.
+'''
+
+class CachedPositions:
+    def __init__(self, geometry, entries):
+        self.geometry = geometry
+        self.entries = entries
+        self.new = {}
+        self.used = set()
+        self.hits = 0
+        self.jumpIds = None
+
+    '''
+    This function looks up the result of a board.
+
+    Input:  [key] Integer key of the board.
+            [pegs] Integer bitmask of the pegs of the board.
+
+    Output: None--> if the board is not in the cache
+            False--> if it cannot be solved
+            List of the jump ids that solve it otherwise.
+    '''
+
+    def lookup(self, key, pegs):
+        entry = self.entries.get(key)
+        if entry is None:
+            return None
+        storedPegs, suffix = entry
+        #Boards with the same key are rotations or mirror images of each other, so a board that cannot be solved only needs the key,
+        #while the moves of a solution have to be turned the same way as the board.
+        if suffix is not None:
+            suffix = self.orient(storedPegs, suffix, pegs)
+            if suffix is None:
+                return None
+        self.used.add(key)
+        self.hits += 1
+        return False if suffix is None else suffix
+
+    '''
+    This function turns the moves of a solution of a stored board into the moves of a rotation or mirror image of it.
+
+    Input:  [storedPegs] Integer bitmask of the pegs of the stored board.
+            [suffix] The jump ids that solve the stored board.
+            [pegs] Integer bitmask of the pegs of the board.
+
+    Output: The jump ids that solve the board, or None if it is not a rotation or mirror image of the stored board.
+    '''
+
+    def orient(self, storedPegs, suffix, pegs):
+        if storedPegs == pegs:
+            return suffix
+        geometry = self.geometry
+        if self.jumpIds is None:
+            self.jumpIds = {cells: k for k, cells in enumerate(geometry.jumpCells)}
+        cells = geometry.pegCells(storedPegs)
+        for name, permutation in geometry.symmetries:
+            if sum(1 << permutation[cell] for cell in cells) == pegs:
+                return [self.jumpIds[tuple(permutation[cell] for cell in geometry.jumpCells[k])] for k in suffix]
+        return None
+
+    '''
+    This function stores the moves that solve a board.
+
+    Input:  [key] Integer key of the board.
+            [pegs] Integer bitmask of the pegs of the board.
+            [suffix] List of the jump ids that solve it.
+    '''
+
+    def solved(self, key, pegs, suffix):
+        self.entries[key] = self.new[key] = (pegs, suffix)
+
+    '''
+    This function stores a board that cannot be solved.
+
+    Input:  [key] Integer key of the board.
+            [pegs] Integer bitmask of the pegs of the board.
+    '''
+
+    def unsolvable(self, key, pegs):
+        self.entries[key] = self.new[key] = (pegs, None)
+
+'''
+This class implements the cache. The database is opened again by every process it is sent to, so the workers of the batch mode share the same file.
+
+Input:  [path] Path of the database file.
+        [maxEntries] Maximum number of positions kept in the cache (None for no limit).
+'''
+
+class SolutionCache:
+    def __init__(self, path, maxEntries=None):
+        if maxEntries is not None and maxEntries < 1:
+            raise ValueError("The cache must be able to store at least 1 position")
+        self.path = path
+        self.maxEntries = maxEntries
+        #The positions read for each layout (layout --> [entries, the highest used value that was read]).
+        self.layouts = {}
+        self.connect()
+
+    '''
+    This function opens the database and creates its table the first time.
+    '''
+
+    def connect(self):
+        self.connection = sqlite3.connect(self.path, timeout=60)
+        #key and pegs are hexadecimal strings, since a board may need more than 64 bits. suffix holds the jump ids of the solution, NULL if there is none.
+        self.connection.execute("CREATE TABLE IF NOT EXISTS positions (layout TEXT, key TEXT, pegs TEXT, suffix TEXT, used INTEGER, PRIMARY KEY (layout, key))")
+        self.connection.execute("CREATE INDEX IF NOT EXISTS positionsUsed ON positions (used)")
+        self.connection.execute("CREATE INDEX IF NOT EXISTS positionsLayoutUsed ON positions (layout, used)")
+        self.connection.commit()
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        del state['connection']
+        #Every process reads the positions again.
+        state['layouts'] = {}
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self.connect()
+
+    def __len__(self):
+        return self.connection.execute("SELECT COUNT(*) FROM positions").fetchone()[0]
+
+    '''
+    This function returns the name of the layout of a board in the database.
+    '''
+
+    def layout(self, geometry):
+        return "%dx%d:%x" % (geometry.lines, geometry.columns, geometry.holes)
+
+    '''
+    This function loads the positions of the layout of a problem. The first time all of them are read, then only the ones that were stored or used
+    since the last time.
+
+    Input:  [geometry] BoardGeometry of the problem.
+
+    Output: CachedPositions of the layout.
+    '''
+
+    def load(self, geometry):
+        layout = self.layout(geometry)
+        known = self.layouts.get(layout)
+        if known is None:
+            known = self.layouts[layout] = [{}, -1]
+        entries, seen = known
+        for key, pegs, suffix, used in self.connection.execute("SELECT key, pegs, suffix, used FROM positions WHERE layout = ? AND used > ?", (layout, seen)):
+            entries[int(key, 16)] = (int(pegs, 16), None if suffix is None else [int(k) for k in suffix.split()])
+            known[1] = max(known[1], used)
+        return CachedPositions(geometry, entries)
+
+    '''
+    This function writes the positions a solve found and marks the ones it used as recently used, then removes the least recently used positions
+    if the cache is over its limit.
+
+    Input:  [positions] CachedPositions of the solve.
+    '''
+
+    def save(self, positions):
+        layout = self.layout(positions.geometry)
+        with self.connection:
+            used = self.connection.execute("SELECT COALESCE(MAX(used), 0) + 1 FROM positions").fetchone()[0]
+            self.connection.executemany("INSERT OR REPLACE INTO positions VALUES (?, ?, ?, ?, ?)",
+                                        [(layout, "%x" % key, "%x" % pegs, None if suffix is None else " ".join(map(str, suffix)), used)
+                                         for key, (pegs, suffix) in positions.new.items()])
+            self.connection.executemany("UPDATE positions SET used = ? WHERE layout = ? AND key = ?",
+                                        [(used, layout, "%x" % key) for key in positions.used if key not in positions.new])
+            if self.maxEntries is not None:
+                excess = len(self) - self.maxEntries
+                if excess > 0:
+                    self.connection.execute("DELETE FROM positions WHERE rowid IN (SELECT rowid FROM positions ORDER BY used LIMIT ?)", (excess,))
+        positions.new = {}
+        positions.used = set()
+
+    def close(self):
+        self.connection.close()
@@ -1,109 +1,261 @@
-''' 
-This program is created in order to verify the solutions created by the PegSolitaireSolver.py. It takes as input the original
-problem which it translates into a numpy array, as well as the moves that define the solution which it applies one-by-one to
-the numpy array. If there is only one '1' in the array the program prints positive answer.
-'''
-
-import sys
-import numpy as np
-
-'''
-This function checks whether the problem is solved by counting if there is only one peg on the board.
-
-Input: [array] Int numpy matrix that represents the board's current state.
-Output: 1--> if there is only 1 peg on the board 
-        2--> in every other case.
-'''
-
-def solutionFound(array):
-    if np.count_nonzero(array == 1) == 1:
-        return 1
-    else:
-        return 0
-
-'''
-This function is used from all the solvers in oder to create apply a given move to the current board and create the next one.
-
-Input:  [array] Numpy array that represents the current board.
-        [indexL] Line coordinate of the current peg.
-        [indexC] Column coordinate of the current peg.
-        [direction] Direction in which the existence of a possible move is checked.
-        
-Output: [array] The updated array after the given move was applied.
-        [move] A string that contains the move that was made to the array.
-''' 
-   
-def makeTheMove(array, n1, n2, n3, n4):
-    start_line_index = int(n1) - 1
-    start_column_index = int(n2) - 1
-    end_line_index = int(n3) - 1
-    end_column_index = int(n4) - 1
-    empty = []
-    
-    if start_line_index == end_line_index:
-        if start_column_index > end_column_index:
-            median = start_column_index-1
-        else:
-            median = end_column_index-1
-        if array[start_line_index][median] != 1:
-            return 0,empty
-        else:
-            array[start_line_index][start_column_index] = 2
-            array[start_line_index][median] = 2
-            array[end_line_index][end_column_index] = 1
-            return 1,array
-        
-    elif start_column_index == end_column_index:
-        if start_line_index > end_line_index:
-            median = start_line_index-1
-        else:
-            median = end_line_index-1
-        if array[median][start_column_index] != 1:
-            return 0,empty
-        else:
-            array[start_line_index][start_column_index] = 2
-            array[median][start_column_index] = 2
-            array[end_line_index][end_column_index] = 1
-            return 1,array
-            
-    else:
-        return 0,empty
-            
-
-inputFile = str(sys.argv[1])
-outputFile = str(sys.argv[2])
-
-f = open(inputFile, "r")
-
-flag = 1
-lineIndex = 0
-columnIndex = 0
-for line in f:
-    if len(line) == 4 and flag:
-        totalLines = int(line[0])
-        totalColumns = int(line[2])
-        array = np.zeros((totalLines, totalColumns))
-        flag = 0
-    else:
-        for element in line:
-            if element == '\n' or element == ' ':
-                continue
-            array[lineIndex][columnIndex] = int(element)
-            columnIndex += 1
-        lineIndex += 1
-        columnIndex = 0
-
-f.close()
-f = open(outputFile, "r")
-
-for line in f:
-    line_no_spaces = line.replace(' ','')
-    move = list(line_no_spaces)
-    makeTheMove(array,move[0],move[1],move[2],move[3])
-
-if solutionFound(array):
-    print("The solution is valid.")    
-else:
-    print("The solution is not valid.")
-        
-
+'''
+This program is created in order to verify the solutions created by the PegSolitaireSolver.py. It takes as input the original
+problem which it translates into a numpy array, as well as the moves that define the solution, and checks that every move is a
+legal jump (a peg jumps over a peg into an empty hole of the board) and that only one peg is left at the end. When a move is not
+legal the program prints its number and why.
+
+    python SolutionVerifier.py problem.txt solution.txt
+
+Many solutions are verified in one run with --batch, which reads the problems the way BatchSolver.py does (a directory, a file with
+several problems or - for the standard input) and the JSON lines it wrote for them. Every solved problem must be solved by its moves and
+every stopped or exhausted one must reach its number of pegs left with its partial moves:
+
+    python SolutionVerifier.py --batch boards results.jsonl
+
+The moves are not applied one by one. The solutions are verified in batches: the moves of all the solutions of a batch are put in arrays,
+each solution with cells of its own, and the state of the three cells of every move at the time it is made is found at once by looking up
+the last earlier move that changed each cell (or the problem, if none did).
+'''
+
+import argparse
+import json
+import sys
+from itertools import islice
+import numpy as np
+
+#Values of the cells of a problem.
+NO_HOLE = 0
+PEG = 1
+EMPTY = 2
+#Table that turns the digits of the cells into their values.
+CELL_VALUES = str.maketrans('012', '\x00\x01\x02')
+
+#Number of solutions that are verified together in batch mode.
+BATCH_SIZE = 1024
+
+#Why a move is not legal, by the code verifyBatch gives it.
+REASONS = {1: "it is not on the holes of the board",
+           2: "it is not a jump over the next hole in a line or a column",
+           3: "there is no peg to move",
+           4: "there is no peg to jump over",
+           5: "the landing hole is not empty"}
+
+'''
+This function reads a problem with the same rules as the solvers (see BitBoard.parseBoard). The first line holds the number of lines and columns
+and each line of the board holds the value of its cells, one digit for each, separated by spaces or not. Lines that are shorter than the board and
+the lines that are missing at its end are cells that do not belong to the board.
+
+Input:  [lines] Iterable of the lines of the problem.
+
+Output: [array] Int8 numpy matrix of the values of the cells (NO_HOLE, PEG or EMPTY).
+'''
+
+def readProblem(lines):
+    totalLines = None
+    rows = []
+    for line in lines:
+        if totalLines is None:
+            if line.strip():
+                fields = line.split()
+                if len(fields) != 2:
+                    raise ValueError("The first line of the problem must hold the number of lines and columns of the board")
+                totalLines, totalColumns = int(fields[0]), int(fields[1])
+            continue
+        cells = line.rstrip('\r\n').replace(' ', '')
+        if cells and len(rows) >= totalLines:
+            raise ValueError("The board has more than %d lines" % totalLines)
+        if len(cells) > totalColumns:
+            raise ValueError("A line of the board has more than %d columns" % totalColumns)
+        rows.append(cells.ljust(totalColumns, '0'))
+    if totalLines is None:
+        raise ValueError("The problem is empty")
+    rows = "".join(rows[:totalLines]).ljust(totalLines*totalColumns, '0')
+    if rows.strip('012'):
+        raise ValueError("The cells of the board must be 0, 1 or 2")
+    return np.frombuffer(rows.translate(CELL_VALUES).encode('latin-1'), dtype=np.int8).reshape(totalLines, totalColumns).copy()
+
+'''
+This function reads the moves of a solution, one per line as the line and column of the peg and of the hole it jumps to (counted from 1).
+The numbers may have any number of digits. Empty lines are skipped.
+
+Input:  [lines] Iterable of the lines (or strings) of the moves.
+
+Output: [moves] Int64 numpy array of the moves that were read, one row of 4 coordinates for each.
+        [unreadable] Index of the first move that cannot be read (None if every move was read).
+'''
+
+def readMoves(lines):
+    moves = [line.split() for line in lines]
+    moves = [move for move in moves if move]
+    #Most solutions can be read at once. Otherwise the moves are checked one by one to find the first one that cannot be read.
+    if all(len(move) == 4 for move in moves):
+        try:
+            return np.array([int(field) for move in moves for field in move], dtype=np.int64).reshape(-1, 4), None
+        except ValueError:
+            pass
+    for index, move in enumerate(moves):
+        if len(move) != 4 or not all(field.isdigit() for field in move):
+            return np.array(moves[:index], dtype=np.int64).reshape(-1, 4), index
+    return np.array(moves, dtype=np.int64).reshape(-1, 4), None
+
+'''
+This function verifies a batch of solutions.
+
+Input:  [solutions] List of (array, moves, unreadable, pegsLeft) tuples: the board of the problem (see readProblem), the moves of the solution
+                    and the index of its first unreadable move (see readMoves) and the number of pegs that must be left after the moves.
+
+Output: List of (valid, move, reason) tuples, one for each solution: whether it is valid, the index of the first move that is not legal (None
+        if every move is) and why the solution is not valid (None if it is).
+'''
+
+def verifyBatch(solutions):
+    if not solutions:
+        return []
+    lines = np.array([array.shape[0] for array, moves, unreadable, pegsLeft in solutions], dtype=np.int64)
+    columns = np.array([array.shape[1] for array, moves, unreadable, pegsLeft in solutions], dtype=np.int64)
+    counts = np.array([len(moves) for array, moves, unreadable, pegsLeft in solutions], dtype=np.int64)
+    #Each solution has cells of its own, after the cells of the solutions before it.
+    offsets = np.concatenate(([0], np.cumsum(lines * columns)[:-1]))
+    firsts = np.concatenate(([0], np.cumsum(counts)[:-1]))
+    initial = np.concatenate([array.ravel() for array, moves, unreadable, pegsLeft in solutions])
+    total = int(counts.sum())
+    codes = np.zeros(total, dtype=np.int8)
+
+    if total:
+        owner = np.repeat(np.arange(len(solutions)), counts)
+        moves = np.concatenate([moves for array, moves, unreadable, pegsLeft in solutions]) - 1
+        L, C = lines[owner], columns[owner]
+        fromLine, fromColumn, toLine, toColumn = moves.T
+        dL, dC = toLine - fromLine, toColumn - fromColumn
+        inside = (fromLine >= 0) & (fromLine < L) & (fromColumn >= 0) & (fromColumn < C) & (toLine >= 0) & (toLine < L) & (toColumn >= 0) & (toColumn < C)
+        jump = ((np.abs(dL) == 2) & (dC == 0)) | ((dL == 0) & (np.abs(dC) == 2))
+        #The cells of the moves that are outside their board are replaced by the first cell of the board, whose state does not matter.
+        fromCell = offsets[owner] + np.where(inside, fromLine * C + fromColumn, 0)
+        overCell = offsets[owner] + np.where(inside & jump, (fromLine + dL // 2) * C + fromColumn + dC // 2, 0)
+        toCell = offsets[owner] + np.where(inside, toLine * C + toColumn, 0)
+        holes = inside & (initial[fromCell] != NO_HOLE) & (initial[overCell] != NO_HOLE) & (initial[toCell] != NO_HOLE)
+
+        #Every move empties its first two cells and fills the third. The state of a cell before a move is the one set by the last earlier move
+        #that changed it, found with a binary search in the changes sorted by cell and time.
+        times = np.arange(total, dtype=np.int64)
+        keys = np.concatenate((fromCell, overCell, toCell)) * (total + 1) + np.tile(times, 3)
+        values = np.concatenate((np.full(2 * total, EMPTY, dtype=np.int8), np.full(total, PEG, dtype=np.int8)))
+        order = np.argsort(keys, kind='stable')
+        keys, values = keys[order], values[order]
+
+        def stateBefore(cells):
+            found = np.searchsorted(keys, cells * (total + 1) + times) - 1
+            last = np.maximum(found, 0)
+            changed = (found >= 0) & (keys[last] // (total + 1) == cells)
+            return np.where(changed, values[last], initial[cells])
+
+        codes = np.select([~inside | (jump & ~holes), ~jump, stateBefore(fromCell) != PEG, stateBefore(overCell) != PEG,
+                           stateBefore(toCell) != EMPTY], [1, 2, 3, 4, 5], 0).astype(np.int8)
+
+    #The first move of each solution that is not legal.
+    failing = np.full(len(solutions), -1, dtype=np.int64)
+    bad = np.flatnonzero(codes)
+    if len(bad):
+        owners, first = np.unique(owner[bad], return_index=True)
+        failing[owners] = bad[first]
+
+    verdicts = []
+    for index, (array, moves, unreadable, pegsLeft) in enumerate(solutions):
+        if failing[index] >= 0:
+            move = int(failing[index] - firsts[index])
+            verdicts.append((False, move, "move %d (%s) is not legal: %s" % (move + 1, " ".join(map(str, moves[move])), REASONS[codes[failing[index]]])))
+        elif unreadable is not None:
+            verdicts.append((False, unreadable, "move %d cannot be read" % (unreadable + 1)))
+        else:
+            left = int(np.count_nonzero(array == PEG)) - len(moves)
+            if left != pegsLeft:
+                verdicts.append((False, None, "%d pegs are left instead of %d" % (left, pegsLeft)))
+            else:
+                verdicts.append((True, None, None))
+    return verdicts
+
+'''
+This function verifies one solution.
+
+Input:  [array] Int8 numpy matrix of the problem (see readProblem).
+        [lines] Iterable of the lines of the moves.
+        [pegsLeft] Number of pegs that must be left after the moves.
+
+Output: (valid, move, reason) tuple (see verifyBatch).
+'''
+
+def verifySolution(array, lines, pegsLeft=1):
+    moves, unreadable = readMoves(lines)
+    return verifyBatch([(array, moves, unreadable, pegsLeft)])[0]
+
+'''
+This function verifies the JSON lines that BatchSolver.py wrote for the problems of a source, in batches of the given number of solutions. The
+lines must be in the order the problems are read (the order BatchSolver.py writes them). Unsolvable problems and problems with an error have
+nothing to verify and are skipped. A problem that cannot be read is not valid.
+
+Input:  [source] Path of a directory, of a file with one or more problems, or - for the standard input.
+        [results] Iterable of the JSON lines of the results.
+        [batchSize] Number of solutions verified together.
+        [report] Function that is called with the name of each problem whose solution is not valid and the reason.
+
+Output: Dictionary with the number of valid, invalid and skipped results.
+'''
+
+def verifyResults(source, results, batchSize=BATCH_SIZE, report=None):
+    from BatchSolver import readProblems
+    counts = {'valid': 0, 'invalid': 0, 'skipped': 0}
+    records = (json.loads(line) for line in results if line.strip())
+    pairs = zip(readProblems(source), records)
+    while True:
+        batch = list(islice(pairs, batchSize))
+        if not batch:
+            return counts
+        names = []
+        solutions = []
+        for (name, lines), record in batch:
+            if record['name'] != name:
+                raise ValueError("The result of %s is not in the order of the problems (found %s)" % (name, record['name']))
+            if record['status'] not in ('solved', 'stopped', 'exhausted'):
+                counts['skipped'] += 1
+                continue
+            try:
+                array = readProblem(lines)
+            except ValueError as error:
+                counts['invalid'] += 1
+                if report is not None:
+                    report(name, "the problem cannot be read: " + str(error))
+                continue
+            partial = record['status'] != 'solved'
+            moves, unreadable = readMoves(record['partial'] if partial else record['moves'])
+            names.append(name)
+            solutions.append((array, moves, unreadable, record['pegsLeft'] if partial else 1))
+        for name, (valid, move, reason) in zip(names, verifyBatch(solutions)):
+            counts['valid' if valid else 'invalid'] += 1
+            if not valid and report is not None:
+                report(name, reason)
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Verifies the solutions of the Peg Solitaire problems written by PegSolitaireSolver.py.")
+    parser.add_argument("inputFile", help="file of the problem (with --batch: the problems the way BatchSolver.py reads them)")
+    parser.add_argument("outputFile", help="file of the moves of the solution (with --batch: the JSON lines of the results, or - for the standard input)")
+    parser.add_argument("--batch", action="store_true", help="verify the results of a batch of problems solved with --batch")
+    parser.add_argument("--batch-size", type=int, default=BATCH_SIZE, help="number of solutions verified together")
+    args = parser.parse_args()
+
+    if args.batch:
+        results = sys.stdin if args.outputFile == '-' else open(args.outputFile, "r")
+        counts = verifyResults(args.inputFile, results, args.batch_size, lambda name, reason: print(name + ":", reason))
+        print("Results:", counts['valid'], "valid,", counts['invalid'], "not valid,", counts['skipped'], "without a solution")
+        sys.exit(1 if counts['invalid'] else 0)
+
+    with open(args.inputFile, "r") as f:
+        array = readProblem(f)
+    with open(args.outputFile, "r") as f:
+        valid, move, reason = verifySolution(array, f)
+    if valid:
+        print("The solution is valid.")
+    else:
+        print(reason[0].upper() + reason[1:] + ".")
+        print("The solution is not valid.")
+        sys.exit(1)
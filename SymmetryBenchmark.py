@@ -0,0 +1,73 @@
+'''
+This program measures how much work the symmetry reduction of the solvers saves. Each given problem is solved by each given algorithm twice, once with the plain
+board keys (the bitmask of the pegs, so every board state is stored as it is) and once with the --symmetry option, where rotated and mirrored board states share
+the same key. Both runs use the same bitmask boards, so the difference between them is only the symmetry reduction. For both runs it prints the number of board states that were stored in the memory (the nodes of the search tree that were
+expanded), the repeated board states that were skipped, the peak memory of the solver process and the time it needed.
+
+Usage: python SymmetryBenchmark.py [--algorithms depth,area,manhattan,rating] problem1.txt [problem2.txt ...]
+'''
+
+import argparse
+import os
+import re
+import subprocess
+import sys
+import tempfile
+
+#The arguments of PegSolitaireSolver.py for each algorithm.
+ALGORITHMS = {'depth': ['depth'], 'area': ['best'], 'manhattan': ['best', 'manhattan'], 'rating': ['best', 'rating']}
+
+SOLVER = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'PegSolitaireSolver.py')
+
+'''
+This function solves a problem with PegSolitaireSolver.py in a separate process and collects its statistics.
+
+Input:  [inputFile] Path of the file that contains the problem.
+        [algorithm] Name of the algorithm (one of the keys of ALGORITHMS).
+        [symmetry] True if the --symmetry option is used.
+
+Output: Dictionary with the time, the boards stored in the memory, the memory hits, the peak memory (in KB) and the number of moves of the solution.
+'''
+
+def runSolver(inputFile, algorithm, symmetry):
+    handle, outputFile = tempfile.mkstemp(suffix='.txt')
+    os.close(handle)
+    command = [sys.executable, SOLVER] + ALGORITHMS[algorithm][:1] + [inputFile, outputFile] + ALGORITHMS[algorithm][1:]
+    if symmetry:
+        command.append('--symmetry')
+    process = subprocess.Popen(command, stdout=subprocess.PIPE, universal_newlines=True)
+    output = process.stdout.read()
+    #wait4 returns the resource usage of this process alone, so the peak memory of each solve is measured separately.
+    _, status, usage = os.wait4(process.pid, 0)
+    process.returncode = status
+    with open(outputFile) as f:
+        moves = len([line for line in f if line.strip()])
+    os.remove(outputFile)
+
+    seconds = float(re.search(r'^([0-9.e-]+) seconds', output, re.M).group(1))
+    memory = re.search(r'Memory: (\d+) hits, (\d+) misses, (\d+) evictions, (\d+) boards stored', output)
+    return {'time': seconds, 'stored': int(memory.group(4)), 'hits': int(memory.group(1)), 'peakKB': usage.ru_maxrss, 'moves': moves}
+
+'''
+This function returns the reduction (as a percentage) from the first to the second value.
+'''
+
+def reduction(before, after):
+    if not before:
+        return 0.0
+    return 100.0 * (before - after) / before
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Compares the solvers with and without the symmetry reduction of the board states.")
+    parser.add_argument("problems", nargs="+", help="files that contain the problems")
+    parser.add_argument("--algorithms", default="depth,area,manhattan,rating", help="comma separated list of the algorithms (depth, area, manhattan, rating)")
+    args = parser.parse_args()
+
+    print("%-24s %-10s %12s %12s %9s %10s %10s %9s %9s %9s" % ("problem", "algorithm", "nodes", "nodes(sym)", "saved", "peak KB", "peak(sym)", "time", "time(sym)", "moves"))
+    for problem in args.problems:
+        for algorithm in args.algorithms.split(','):
+            plain = runSolver(problem, algorithm, False)
+            symmetric = runSolver(problem, algorithm, True)
+            print("%-24s %-10s %12d %12d %8.1f%% %10d %10d %9.3f %9.3f %4d/%-4d" % (os.path.basename(problem), algorithm, plain['stored'], symmetric['stored'],
+                  reduction(plain['stored'], symmetric['stored']), plain['peakKB'], symmetric['peakKB'], plain['time'], symmetric['time'], plain['moves'], symmetric['moves']))
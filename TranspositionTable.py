@@ -0,0 +1,385 @@
+'''
+This module implements the memory (transposition table) that the solvers use in order to find out whether a board was previously encountered. Boards are stored
+by their integer key, the peg bitmask, which the solvers already update incrementally with a single xor whenever a move is made. The key is exact, so a
+hash set of keys answers each lookup in constant time instead of going through every board encountered so far.
+
+The table can be given a maximum number of boards. When it is full a new board replaces an older one according to the eviction policy:
+    fifo --> the board that was stored first is removed.
+    lru  --> the board that was least recently looked up or stored is removed.
+    none --> no board is removed and new boards are simply not stored.
+Forgetting a board never makes a solver wrong, it only means that the board may be searched again if it is encountered later.
+
+The module also implements SharedTranspositionTable, the memory that the worker processes of the parallel search share, and ReplacementTable, the memory
+of a fixed size that the IDA* search uses (see IterativeDeepening.py).
+'''
+
+import multiprocessing
+from array import array
+from multiprocessing import shared_memory
+
+EVICTION_POLICIES = ('fifo', 'lru', 'none')
+
+'''
+This class implements the transposition table. A Python dictionary is used as the hash set since it also remembers the order in which the keys
+were inserted, which is all the fifo and lru policies need.
+
+Input:  [maxEntries] Maximum number of boards that are stored (None for no limit).
+        [eviction] The eviction policy that is used when the table is full (fifo, lru or none).
+
+Attributes: [hits] Number of lookups that found the board in the table.
+            [misses] Number of lookups that did not find the board in the table.
+            [evictions] Number of boards that were removed (or not stored) because the table was full.
+'''
+
+class TranspositionTable:
+    def __init__(self, maxEntries=None, eviction='fifo'):
+        if eviction not in EVICTION_POLICIES:
+            raise ValueError("Unknown eviction policy: " + str(eviction))
+        if maxEntries is not None and maxEntries < 1:
+            raise ValueError("The transposition table must be able to store at least 1 board")
+        self.maxEntries = maxEntries
+        self.eviction = eviction
+        self.table = {}
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __len__(self):
+        return len(self.table)
+
+    def __contains__(self, key):
+        return key in self.table
+
+    '''
+    This function checks whether a board is stored in the table and updates the hit and miss counters.
+
+    Input:  [key] Integer key of the board.
+
+    Output: True--> if the board is stored in the table
+            False--> if it is not.
+    '''
+
+    def lookup(self, key):
+        table = self.table
+        if key in table:
+            self.hits += 1
+            if self.eviction == 'lru':
+                #Move the board to the end of the dictionary, the most recently used position.
+                del table[key]
+                table[key] = None
+            return True
+        self.misses += 1
+        return False
+
+    '''
+    This function stores a board in the table. If the table is full another board is evicted first according to the eviction policy.
+
+    Input:  [key] Integer key of the board.
+    '''
+
+    def store(self, key):
+        table = self.table
+        if self.maxEntries is not None and len(table) >= self.maxEntries and key not in table:
+            self.evictions += 1
+            if self.eviction == 'none':
+                return
+            #The first key of the dictionary is the oldest (fifo) or the least recently used (lru) board.
+            del table[next(iter(table))]
+        table[key] = None
+
+    '''
+    This function returns the counters of the table.
+
+    Output: Dictionary with the hits, misses, evictions and the number of stored boards.
+    '''
+
+    def stats(self):
+        return {'hits': self.hits, 'misses': self.misses, 'evictions': self.evictions, 'size': len(self.table)}
+
+'''
+This class implements a transposition table that is shared by all the worker processes of the parallel search (see ParallelSearch.py), so a board that one
+worker has searched is skipped by all the others. The table lives in a block of multiprocessing.shared_memory and is an open addressing hash table of board
+keys with a fixed number of slots. Each key is stored in as many 64 bit words as the cells of the board need and a slot whose words are all 0 is empty (a board
+always has at least one peg, so no key is 0).
+
+The slots are split into partitions and every key belongs to exactly one of them (and is only probed inside it), so each partition is protected by its own lock
+(striped locking) and workers that store keys of different partitions never wait for each other. Looking up a key of a single word does not need the lock,
+since a 64 bit word is always written at once and a lookup that misses a key that is being stored only means the board is searched twice. Keys of more words
+are looked up under the lock, so a half written key is never mistaken for another one.
+
+When a partition is 90% full (to keep the probe sequences short) its new keys are stored in the local TranspositionTable of the worker instead (the overflow
+table), which can be limited and evicts boards like the single process memory does. So the shared table never has to remove a key and the search never loses
+its memory of a board, it is only not shared any more.
+
+Input:  [capacity] Number of slots of the shared table.
+        [cells] Number of cells of the board, which gives the number of words of each key.
+        [overflowCap] Maximum number of boards kept in the overflow table of each worker (None for no limit).
+        [eviction] Eviction policy of the overflow tables.
+        [partitions] Number of partitions (and locks) of the shared table.
+
+Attributes: [hits] Number of lookups of this process that found the board in the shared or the overflow table.
+            [misses] Number of lookups of this process that did not find the board.
+            [overflows] Number of boards this process stored in its overflow table because a partition was full.
+'''
+
+MASK64 = (1 << 64) - 1
+
+def mixKey(key):
+    h = (key ^ (key >> 64) ^ (key >> 128)) & MASK64
+    h = ((h ^ (h >> 30)) * 0xBF58476D1CE4E5B9) & MASK64
+    h = ((h ^ (h >> 27)) * 0x94D049BB133111EB) & MASK64
+    return h ^ (h >> 31)
+
+class SharedTranspositionTable:
+    def __init__(self, capacity, cells, overflowCap=None, eviction='fifo', partitions=64):
+        if capacity < 1:
+            raise ValueError("The shared transposition table must have at least 1 slot")
+        partitions = min(partitions, capacity)
+        self.words = max(1, (cells + 63) // 64)
+        self.partitions = partitions
+        self.partitionSize = capacity // partitions
+        self.capacity = self.partitionSize * partitions
+        self.maxLoad = max(1, self.partitionSize * 9 // 10)
+        self.overflowCap = overflowCap
+        self.eviction = eviction
+        #The first words of the block hold the number of keys of each partition, the slots follow.
+        self.memory = shared_memory.SharedMemory(create=True, size=8 * (partitions + self.capacity * self.words))
+        self.name = self.memory.name
+        self.locks = [multiprocessing.Lock() for _ in range(partitions)]
+        self.attach()
+
+    '''
+    This function prepares the part of the table that belongs to each process: the view of the shared block, the overflow table and the counters.
+    '''
+
+    def attach(self):
+        self.slots = self.memory.buf.cast('Q')
+        self.overflow = TranspositionTable(self.overflowCap, self.eviction)
+        self.hits = 0
+        self.misses = 0
+        self.overflows = 0
+
+    #Only the name of the shared block is sent to a process that is started with the spawn method, which then attaches to the same block.
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        for name in ('memory', 'slots', 'overflow'):
+            del state[name]
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self.memory = shared_memory.SharedMemory(name=self.name)
+        self.attach()
+
+    def __len__(self):
+        return sum(self.slots[partition] for partition in range(self.partitions))
+
+    '''
+    This function mixes the bits of a key (splitmix64), since boards that differ in a few cells would otherwise land on neighbouring slots. The result
+    gives both the partition of the key and the slot where its probe sequence starts.
+
+    Input:  [key] Integer key of the board.
+
+    Output: 64 bit hash of the key.
+    '''
+
+    def hashKey(self, key):
+        return mixKey(key)
+
+    '''
+    This function finds the slot of a key inside its partition (linear probing).
+
+    Input:  [key] Integer key of the board.
+            [h] The hash of the key.
+
+    Output: [slot] Index of the first word of the slot that holds the key, or of the empty slot where it would be stored (None if the partition has no empty slot).
+            [found] True if the key is stored in the table.
+    '''
+
+    def probe(self, key, h):
+        partition = h % self.partitions
+        size = self.partitionSize
+        words = self.words
+        slots = self.slots
+        first = self.partitions + partition * size * words
+        index = (h // self.partitions) % size
+        for _ in range(size):
+            slot = first + index * words
+            if words == 1:
+                value = slots[slot]
+            else:
+                value = 0
+                for w in range(words):
+                    value |= slots[slot + w] << (64 * w)
+            if value == key:
+                return slot, True
+            if value == 0:
+                return slot, False
+            index += 1
+            if index == size:
+                index = 0
+        return None, False
+
+    '''
+    This function checks whether a board is stored in the shared table or in the overflow table of this process and updates the hit and miss counters.
+
+    Input:  [key] Integer key of the board.
+
+    Output: True--> if the board is stored
+            False--> if it is not.
+    '''
+
+    def lookup(self, key):
+        h = self.hashKey(key)
+        if self.words == 1:
+            found = self.probe(key, h)[1]
+        else:
+            with self.locks[h % self.partitions]:
+                found = self.probe(key, h)[1]
+        if found or key in self.overflow:
+            self.hits += 1
+            return True
+        self.misses += 1
+        return False
+
+    '''
+    This function stores a board in the shared table, or in the overflow table of this process if its partition is full.
+
+    Input:  [key] Integer key of the board.
+    '''
+
+    def store(self, key):
+        h = self.hashKey(key)
+        partition = h % self.partitions
+        slots = self.slots
+        with self.locks[partition]:
+            #Probe under the lock, another worker may have stored the key or taken the slot in the meantime.
+            slot, found = self.probe(key, h)
+            if found:
+                return
+            if slot is None or slots[partition] >= self.maxLoad:
+                self.overflows += 1
+                self.overflow.store(key)
+                return
+            for w in range(self.words):
+                slots[slot + w] = (key >> (64 * w)) & MASK64
+            slots[partition] += 1
+
+    '''
+    This function returns the counters of this process.
+
+    Output: Dictionary with the hits, misses, evictions (of the overflow table), overflows and the number of stored boards (in the shared table and
+            the overflow table of this process).
+    '''
+
+    def stats(self):
+        return {'hits': self.hits, 'misses': self.misses, 'evictions': self.overflow.evictions, 'overflows': self.overflows,
+                'size': len(self) + len(self.overflow)}
+
+    '''
+    This function releases the shared block. The process that created the table also removes the block from the system (unlink).
+    '''
+
+    def close(self, unlink=False):
+        self.slots.release()
+        self.memory.close()
+        if unlink:
+            self.memory.unlink()
+
+'''
+This class implements a transposition table of a fixed number of slots that never grows: all of its memory is allocated when it is created, so the memory
+of a search that uses it stays the same however long it runs. Every board is stored with a bound, a number that the search decides (the IDA* search stores
+the threshold under which the board was searched without finding a solution). The slots are grouped in buckets of 2 and a key can only be stored in the
+bucket of its hash. When both slots of a bucket hold other boards, the board with the smaller bound is replaced, which for the IDA* search is the board that
+was searched in an older iteration and is useless for the next ones.
+
+Input:  [slots] Number of slots of the table.
+        [cells] Number of cells of the board, which gives the number of words of each key.
+
+Attributes: [hits] Number of lookups that found the board in the table.
+            [misses] Number of lookups that did not find the board in the table.
+            [evictions] Number of boards that were replaced by another board.
+'''
+
+class ReplacementTable:
+    def __init__(self, slots, cells):
+        if slots < 2:
+            raise ValueError("The replacement table must have at least 2 slots")
+        self.words = max(1, (cells + 63) // 64)
+        self.buckets = slots // 2
+        self.slots = 2 * self.buckets
+        #A slot whose key is 0 is empty (a board always has at least one peg, so no key is 0).
+        self.keys = array('Q', bytes(8 * self.words * self.slots))
+        self.bounds = array('d', bytes(8 * self.slots))
+        self.size = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __len__(self):
+        return self.size
+
+    '''
+    This function returns the key of a slot.
+    '''
+
+    def slotKey(self, slot):
+        if self.words == 1:
+            return self.keys[slot]
+        first = slot * self.words
+        return sum(self.keys[first + w] << (64 * w) for w in range(self.words))
+
+    '''
+    This function looks up the bound of a board and updates the hit and miss counters.
+
+    Input:  [key] Integer key of the board.
+
+    Output: The bound of the board, or None if it is not stored.
+    '''
+
+    def lookup(self, key):
+        first = 2 * (mixKey(key) % self.buckets)
+        for slot in (first, first + 1):
+            if self.slotKey(slot) == key:
+                self.hits += 1
+                return self.bounds[slot]
+        self.misses += 1
+        return None
+
+    '''
+    This function stores the bound of a board. A board that is already stored keeps the larger of its two bounds.
+
+    Input:  [key] Integer key of the board.
+            [bound] Bound of the board.
+    '''
+
+    def store(self, key, bound):
+        first = 2 * (mixKey(key) % self.buckets)
+        target = None
+        for slot in (first, first + 1):
+            stored = self.slotKey(slot)
+            if stored == key:
+                self.bounds[slot] = max(self.bounds[slot], bound)
+                return
+            if stored == 0 and target is None:
+                target = slot
+        if target is None:
+            target = first if self.bounds[first] <= self.bounds[first + 1] else first + 1
+            self.evictions += 1
+        else:
+            self.size += 1
+        if self.words == 1:
+            self.keys[target] = key
+        else:
+            for w in range(self.words):
+                self.keys[target * self.words + w] = (key >> (64 * w)) & MASK64
+        self.bounds[target] = bound
+
+    '''
+    This function returns the counters of the table.
+
+    Output: Dictionary with the hits, misses, evictions, the number of stored boards and the number of slots.
+    '''
+
+    def stats(self):
+        return {'hits': self.hits, 'misses': self.misses, 'evictions': self.evictions, 'size': self.size, 'slots': self.slots}
@@ -0,0 +1,7 @@
+import os
+import sys
+
+#The modules of the solver live in the root of the repository.
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+BOARDS = os.path.join(ROOT, 'boards')
@@ -0,0 +1,19 @@
+import os
+import subprocess
+import sys
+import pytest
+from conftest import BOARDS, ROOT
+
+#The files of tests/baseline hold what the recursive solvers the bitboard engine replaced wrote for each board (named board_solver.txt). The flag board
+#has no solution in the order of the best-first solver, so nothing was written for it.
+BASELINE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'baseline')
+CASES = sorted(name[:-len('.txt')].rsplit('_', 1) for name in os.listdir(BASELINE))
+
+@pytest.mark.parametrize('name,solver', CASES)
+def test_output_is_the_baseline_output(tmp_path, name, solver):
+    output = tmp_path / 'solution.txt'
+    subprocess.run([sys.executable, os.path.join(ROOT, 'PegSolitaireSolver.py'), solver, os.path.join(BOARDS, name + '.txt'), str(output)],
+                   capture_output=True)
+    with open(os.path.join(BASELINE, '%s_%s.txt' % (name, solver)), 'rb') as f:
+        expected = f.read()
+    assert (output.read_bytes() if output.exists() else b'') == expected
@@ -0,0 +1,40 @@
+import io
+import json
+import os
+from BatchSolver import solveBatch
+from BitBoard import pegCount
+from PegSolitaireSolver import Solver
+from conftest import BOARDS
+
+'''
+A Solver that fails on the boards with the given number of pegs, like a bug of the search would.
+'''
+
+class FailingSolver(Solver):
+    def __init__(self, failPegs):
+        Solver.__init__(self)
+        self.failPegs = failPegs
+
+    def solve(self, board, strategy='area', limits=None):
+        if pegCount(board.pegs) == self.failPegs:
+            raise RuntimeError("search failed")
+        return Solver.solve(self, board, strategy, limits)
+
+def solveProblems(tmp_path, names, solver, workers):
+    source = tmp_path / 'problems.txt'
+    source.write_text('\n'.join(open(os.path.join(BOARDS, name)).read() for name in names))
+    output = io.StringIO()
+    counts = solveBatch(str(source), output, solver, 'depth', workers=workers)
+    return counts, [json.loads(line) for line in output.getvalue().splitlines()]
+
+def test_failing_problem_does_not_stop_the_batch(tmp_path):
+    #cross.txt has 6 pegs, the other two boards are solved.
+    counts, records = solveProblems(tmp_path, ['flag.txt', 'cross.txt', 'pointer.txt'], FailingSolver(6), 1)
+    assert counts == {'solved': 2, 'error': 1}
+    assert [record['status'] for record in records] == ['solved', 'error', 'solved']
+    assert records[1]['error'] == "RuntimeError: search failed"
+
+def test_failing_problem_does_not_stop_the_pool(tmp_path):
+    counts, records = solveProblems(tmp_path, ['cross.txt', 'flag.txt', 'cross.txt', 'pointer.txt'], FailingSolver(6), 2)
+    assert counts == {'solved': 2, 'error': 2}
+    assert [record['status'] for record in records] == ['error', 'solved', 'error', 'solved']
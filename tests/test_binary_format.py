@@ -0,0 +1,45 @@
+import os
+import pytest
+from BinaryFormat import BoardWriter, BoardFile, SolutionWriter, SolutionFile, fileKind
+from BitBoard import Board
+from PegSolitaireSolver import Solver
+from conftest import BOARDS
+
+#The 7x7 boards come first, so the 9x9 boards make the writer widen the records it has written.
+CORPUS = ['cross.txt', 'english.txt', 'pointer.txt', 'german.txt', 'diamond.txt', 'square6x6.txt']
+
+def corpusBoard(name):
+    return Board.fromFile(os.path.join(BOARDS, name))
+
+def test_boards_round_trip(tmp_path):
+    boards = [corpusBoard(name) for name in CORPUS]
+    path = str(tmp_path / 'boards.bin')
+    writer = BoardWriter(path)
+    for board in boards:
+        writer.write(board)
+    writer.close()
+    assert fileKind(path) == 'boards'
+    assert list(BoardFile(path)) == boards
+
+def test_unfinished_boards_file_is_not_read(tmp_path):
+    path = str(tmp_path / 'boards.bin')
+    writer = BoardWriter(path)
+    writer.write(corpusBoard('cross.txt'))
+    writer.file.flush()
+    with pytest.raises(ValueError):
+        BoardFile(path)
+
+def test_solutions_round_trip(tmp_path):
+    solver = Solver()
+    solved = [(board, solver.solve(board, 'depth').moves) for board in map(corpusBoard, ['cross.txt', 'pointer.txt', 'english.txt'])]
+    #A board without moves (its single peg is already the solution) is a solution too.
+    solved.append((corpusBoard('cross.txt'), []))
+    path = str(tmp_path / 'solutions.bin')
+    writer = SolutionWriter(path)
+    for board, moves in solved:
+        writer.write(board, moves)
+    writer.close()
+    assert fileKind(path) == 'solutions'
+    solutions = SolutionFile(path)
+    assert list(solutions) == [moves for board, moves in solved]
+    assert solutions.jumpIds(0)[0] == solved[0][0].layout()
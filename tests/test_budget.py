@@ -0,0 +1,53 @@
+import os
+import subprocess
+import sys
+import pytest
+from BitBoard import Board
+from PegSolitaireSolver import Solver, Limits, EXIT_CODES
+from SolutionVerifier import readProblem, verifySolution
+from conftest import ROOT, BOARDS
+
+#A 3x5 board whose pegs can make jumps but never end with a single peg.
+UNSOLVABLE = Board(3, 5, 0x7fff, 0b11011)
+
+def verifyPartial(name, result):
+    with open(os.path.join(BOARDS, name)) as f:
+        assert verifySolution(readProblem(f), result.partial, result.pegsLeft) == (True, None, None)
+
+@pytest.mark.parametrize('options,strategy', [({}, 'depth'), ({}, 'area'), ({'search': 'best-first'}, 'area'), ({'search': 'astar'}, 'area'),
+                                              ({'search': 'ida'}, 'area'), ({'prune': True}, 'depth'), ({'retrograde': 2}, 'depth')],
+                         ids=['depth', 'backtracking', 'best-first', 'astar', 'ida', 'prune', 'retrograde'])
+def test_single_peg_is_solved(options, strategy):
+    result = Solver(**options).solve(Board(3, 3, 0x1ff, 0x10), strategy)
+    assert (result.status, result.moves, result.pegsLeft) == ('solved', [], 1)
+
+def test_single_peg_exit_code(tmp_path):
+    problem = tmp_path / 'single.txt'
+    problem.write_text("3 3\n2 2 2\n2 1 2\n2 2 2\n")
+    output = tmp_path / 'moves.txt'
+    process = subprocess.run([sys.executable, os.path.join(ROOT, 'PegSolitaireSolver.py'), 'depth', str(problem), str(output)], capture_output=True, text=True)
+    assert process.returncode == EXIT_CODES['solved']
+    assert "Status: solved" in process.stdout
+
+@pytest.mark.parametrize('limits,reason', [(Limits(maxNodes=500), 'nodes'), (Limits(maxSeconds=0.05), 'time'), (Limits(maxMemory=1), 'memory')],
+                         ids=['nodes', 'time', 'memory'])
+@pytest.mark.parametrize('search', ['backtracking', 'best-first', 'ida'])
+def test_budget_stops_with_a_valid_partial_solution(limits, reason, search):
+    result = Solver(search=search).solve(Board.fromFile(os.path.join(BOARDS, 'german.txt')), 'area', limits)
+    assert (result.status, result.reason) == ('stopped', reason)
+    assert result.seconds < 5
+    verifyPartial('german.txt', result)
+
+def test_exhausted_is_not_a_proof():
+    assert Solver().solve(UNSOLVABLE, 'depth').status == 'exhausted'
+    assert Solver(search='best-first').solve(UNSOLVABLE, 'area').status == 'exhausted'
+    assert Solver(search='ida').solve(UNSOLVABLE, 'area').status == 'unsolvable'
+    assert Solver(prune=True).solve(UNSOLVABLE, 'depth').status == 'unsolvable'
+
+def test_stopped_solve_writes_its_partial_solution(tmp_path):
+    output = tmp_path / 'moves.txt'
+    process = subprocess.run([sys.executable, os.path.join(ROOT, 'PegSolitaireSolver.py'), 'depth', os.path.join(BOARDS, 'german.txt'), str(output),
+                              '--max-nodes', '500'], capture_output=True, text=True)
+    assert process.returncode == EXIT_CODES['stopped']
+    result = Solver().solve(Board.fromFile(os.path.join(BOARDS, 'german.txt')), 'depth', Limits(maxNodes=500))
+    assert output.read_text().split('\n')[:-1] == result.partial
@@ -0,0 +1,69 @@
+import os
+import pytest
+from BitBoard import Board
+from Checkpoint import problemKey, saveCheckpoint, loadCheckpoint
+from PegSolitaireSolver import Solver, Limits, STRATEGIES, search
+from Pruning import Pruner
+from TranspositionTable import TranspositionTable
+from conftest import BOARDS
+
+def corpusBoard(name):
+    return Board.fromFile(os.path.join(BOARDS, name))
+
+'''
+This function searches a board for the given number of nodes and returns the state the search stopped in.
+'''
+
+def stoppedSearch(board, nodes):
+    geometry = board.geometry()
+    memory = TranspositionTable(1000, 'lru')
+    pruner = Pruner(geometry, board.pegs)
+    stack = []
+    partial = []
+    assert search(geometry, board.pegs, STRATEGIES['area'], [], memory, stack, nodes, pruner, partial=partial) == -1
+    return geometry, memory, pruner, stack, partial
+
+#The boards of german.txt have more than 64 cells, so they are saved in 2 words.
+@pytest.mark.parametrize('name', ['english.txt', 'german.txt'])
+def test_checkpoint_round_trip(name, tmp_path):
+    board = corpusBoard(name)
+    geometry, memory, pruner, stack, partial = stoppedSearch(board, 3000)
+    problem = problemKey(geometry, board.pegs, [('strategy', 'area')])
+    path = str(tmp_path / 'search.ck')
+    saveCheckpoint(path, problem, geometry, stack, memory, 3000, pruner.prunes, partial)
+    loaded = TranspositionTable(1000, 'lru')
+    frames, nodes, prunes, deepest = loadCheckpoint(path, problem, loaded)
+    assert frames == [(frame[0], frame[1]) for frame in stack]
+    assert nodes == 3000
+    assert prunes == pruner.prunes
+    assert deepest == partial and partial
+    assert list(loaded.table) == list(memory.table)
+    assert (loaded.hits, loaded.misses, loaded.evictions) == (memory.hits, memory.misses, memory.evictions)
+    with pytest.raises(ValueError):
+        loadCheckpoint(path, problemKey(geometry, board.pegs, [('strategy', 'depth')]), TranspositionTable())
+
+def test_resumed_solve_finds_the_same_solution(tmp_path):
+    board = corpusBoard('english.txt')
+    path = str(tmp_path / 'search.ck')
+    expected = Solver(prune=True).solve(board, 'area')
+    solver = Solver(prune=True, checkpoint=path, resume=True)
+    stopped = solver.solve(board, 'area', Limits(maxNodes=200))
+    assert stopped.status == 'stopped' and os.path.exists(path)
+    result = solver.solve(board, 'area')
+    assert result.status == 'solved'
+    assert result.moves == expected.moves
+    assert not os.path.exists(path)
+
+def test_resumed_solves_get_the_whole_node_limit(tmp_path):
+    board = corpusBoard('english.txt')
+    path = str(tmp_path / 'search.ck')
+    expected = Solver().solve(board, 'depth')
+    solver = Solver(checkpoint=path, resume=True)
+    results = [solver.solve(board, 'depth', Limits(maxNodes=2000)) for run in range(3)]
+    assert [result.status for result in results[:2]] == ['stopped', 'stopped']
+    #Every solve goes on from where the one before it stopped, so the boards it stored keep growing until the solution is found.
+    assert results[0].stats['misses'] < results[1].stats['misses'] < results[2].stats['misses']
+    while results[-1].status == 'stopped' and len(results) < 20:
+        results.append(solver.solve(board, 'depth', Limits(maxNodes=2000)))
+    assert results[-1].status == 'solved'
+    assert results[-1].moves == expected.moves
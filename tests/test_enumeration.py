@@ -0,0 +1,86 @@
+import os
+from functools import lru_cache
+import pytest
+import Enumeration
+from BitBoard import Board
+from Enumeration import Enumerator
+from conftest import BOARDS
+
+'''
+This function counts the reachable boards, the solutions and the solutions of each final hole of a problem by trying every jump one board at a time,
+the slow way the enumeration does not use.
+'''
+
+def bruteForce(board):
+    geometry = board.geometry()
+    levels = {}
+
+    @lru_cache(maxsize=None)
+    def solutions(pegs):
+        if pegs.bit_count() == 1:
+            return ((pegs.bit_length() - 1, 1),)
+        holes = {}
+        for fromOver, to, flip in geometry.jumps:
+            if pegs & fromOver == fromOver and not pegs & to:
+                for cell, count in solutions(pegs ^ flip):
+                    holes[cell] = holes.get(cell, 0) + count
+        return tuple(sorted(holes.items()))
+
+    seen = set()
+    stack = [board.pegs]
+    while stack:
+        pegs = stack.pop()
+        if pegs in seen:
+            continue
+        seen.add(pegs)
+        levels[pegs.bit_count()] = levels.get(pegs.bit_count(), 0) + 1
+        stack.extend(pegs ^ flip for fromOver, to, flip in geometry.jumps if pegs & fromOver == fromOver and not pegs & to)
+    return levels, dict(solutions(board.pegs))
+
+def enumerateFile(name, maxBoards=None, spillDir=None):
+    board = Board.fromFile(os.path.join(BOARDS, name))
+    return Enumerator(board.geometry(), board.pegs, maxBoards, spillDir).run()
+
+@pytest.mark.parametrize('name,reachable,solutions', [('cross.txt', 24, 4), ('pointer.txt', 1656, 2356)])
+def test_counts_match_a_brute_force_search(name, reachable, solutions):
+    enumerator = enumerateFile(name)
+    levels, holes = bruteForce(Board.fromFile(os.path.join(BOARDS, name)))
+    summary = enumerator.summary()
+    assert (summary['reachable'], summary['solutions']) == (reachable, solutions)
+    assert {pegs: boards for pegs, boards, seconds in enumerator.levels} == levels
+    assert enumerator.finalHoles == holes
+    assert summary['spilled'] == 0
+
+def withoutTimes(summary):
+    return dict(summary, levels=[(level['pegs'], level['boards']) for level in summary['levels']], spilled=None)
+
+@pytest.mark.parametrize('maxBoards', [100, 1000])
+def test_spilled_levels_give_the_same_counts(tmp_path, maxBoards):
+    memory = enumerateFile('triangular.txt').summary()
+    assert (memory['reachable'], memory['solutions']) == (25961, 5099862)
+    spilled = enumerateFile('triangular.txt', maxBoards, str(tmp_path)).summary()
+    assert spilled['spilled'] > 0
+    assert withoutTimes(spilled) == withoutTimes(memory)
+    #The partitions of a level are removed once the next level is built.
+    assert os.listdir(str(tmp_path)) == []
+
+'''
+An Enumerator that always guesses that the next level fits in a single partition, so the children that turn out to be too many are spilled while the
+level is built.
+'''
+
+class OnePartitionEnumerator(Enumerator):
+    def expandLevel(self, level, partitions, directory, depth):
+        return Enumerator.expandLevel(self, level, 1, directory, depth)
+
+def test_level_guessed_to_fit_is_spilled(tmp_path, monkeypatch):
+    monkeypatch.setattr(Enumeration, 'CHUNK', 64)
+    board = Board.fromFile(os.path.join(BOARDS, 'triangular.txt'))
+    enumerator = OnePartitionEnumerator(board.geometry(), board.pegs, 500, str(tmp_path)).run()
+    assert enumerator.spilled > 0
+    assert withoutTimes(enumerator.summary()) == withoutTimes(enumerateFile('triangular.txt').summary())
+
+def test_partition_holds_a_board():
+    board = Board.fromFile(os.path.join(BOARDS, 'cross.txt'))
+    with pytest.raises(ValueError):
+        Enumerator(board.geometry(), board.pegs, 0)
@@ -0,0 +1,31 @@
+import json
+import os
+import pytest
+from BitBoard import Board
+from ExternalSearch import CHECKPOINT
+from PegSolitaireSolver import Solver, Limits
+from SolutionVerifier import readProblem, verifySolution
+from conftest import BOARDS
+
+@pytest.mark.parametrize('name', ['cross.txt', 'pointer.txt'])
+def test_disk_search_solves(name, tmp_path):
+    path = os.path.join(BOARDS, name)
+    result = Solver(disk=str(tmp_path / 'levels')).solve(Board.fromFile(path), 'depth')
+    assert result.status == 'solved'
+    with open(path) as f:
+        assert verifySolution(readProblem(f), result.moves) == (True, None, None)
+
+def test_disk_search_proves_unsolvable(tmp_path):
+    board = Board(3, 5, 0x7fff, 0b11011)
+    assert Solver(disk=str(tmp_path / 'levels')).solve(board, 'depth').status == 'unsolvable'
+
+def test_resumed_runs_get_the_whole_node_limit(tmp_path):
+    directory = tmp_path / 'levels'
+    solver = Solver(disk=str(directory))
+    board = Board.fromFile(os.path.join(BOARDS, 'english.txt'))
+    levels = []
+    for run in range(3):
+        assert solver.solve(board, 'depth', Limits(maxNodes=2000)).status == 'stopped'
+        with open(directory / CHECKPOINT) as f:
+            levels.append(len(json.load(f)['levels']))
+    assert levels[0] < levels[1] < levels[2]
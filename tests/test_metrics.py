@@ -0,0 +1,104 @@
+import io
+import json
+import os
+import subprocess
+import sys
+import pytest
+import PegSolitaireSolver
+from BitBoard import Board, pegCount
+from PegSolitaireSolver import Solver, STRATEGIES, search
+from Metrics import SearchMetrics
+from TranspositionTable import TranspositionTable
+from conftest import BOARDS, ROOT
+
+#A 4x4 square with a hole next to a corner cannot be solved, so the search runs until it has no move left.
+UNSOLVABLE = Board(4, 4, 0xffff, 0xffff & ~(1 << 5))
+
+'''
+A TranspositionTable that counts the lookups of the boards with each number of pegs, which are the children the search generated from the boards with
+one peg more.
+'''
+
+class CountingTable(TranspositionTable):
+    def __init__(self):
+        TranspositionTable.__init__(self)
+        self.lookups = {}
+
+    def lookup(self, key):
+        self.lookups[pegCount(key)] = self.lookups.get(pegCount(key), 0) + 1
+        return TranspositionTable.lookup(self, key)
+
+@pytest.mark.parametrize('strategy', ['depth', 'area'])
+def test_counters_of_an_exhausted_search(strategy):
+    geometry = UNSOLVABLE.geometry()
+    start = pegCount(UNSOLVABLE.pegs)
+    #The search orders the moves of every board it expands once.
+    ordered = {}
+    def orderMoves(board, pegs, previous=None, legal=None):
+        ordered[start - pegCount(pegs)] = ordered.get(start - pegCount(pegs), 0) + 1
+        return STRATEGIES[strategy](board, pegs, previous, legal)
+    memory = CountingTable()
+    metrics = SearchMetrics()
+    assert search(geometry, UNSOLVABLE.pegs, orderMoves, [], memory, metrics=metrics) == 0
+    summary = metrics.summary(memory)
+    assert {depth['depth']: depth['expanded'] for depth in summary['depths']} == ordered
+    assert {depth['depth']: depth['generated'] for depth in summary['depths'] if depth['generated']} == \
+           {start - pegs - 1: lookups for pegs, lookups in memory.lookups.items()}
+    assert summary['nodesExpanded'] == sum(ordered.values()) == memory.misses + 1
+    assert summary['childrenGenerated'] == memory.hits + memory.misses
+    assert summary['duplicateHits'] == memory.hits
+    assert summary['maxDepth'] == max(ordered)
+    assert summary['orderingCalls'] == summary['nodesExpanded']
+    assert summary['memorySize'] == len(memory)
+    #The solver returns the same counters.
+    result = Solver(metrics=True).solve(UNSOLVABLE, strategy)
+    assert result.status == 'exhausted'
+    assert [(d['depth'], d['expanded'], d['generated']) for d in result.metrics['depths']] == \
+           [(d['depth'], d['expanded'], d['generated']) for d in summary['depths']]
+    assert result.metrics['duplicateHits'] == result.stats['hits']
+
+def test_counters_of_a_solved_search():
+    result = Solver(metrics=True).solve(Board.fromFile(os.path.join(BOARDS, 'pointer.txt')), 'depth')
+    assert result.status == 'solved'
+    metrics = result.metrics
+    assert sum(depth['expanded'] for depth in metrics['depths']) == metrics['nodesExpanded']
+    assert sum(depth['generated'] for depth in metrics['depths']) == metrics['childrenGenerated']
+    #The board that is solved is stored but not expanded, so the deepest frame is the one of the last move.
+    assert metrics['nodesExpanded'] == result.stats['misses']
+    assert metrics['maxDepth'] == len(result.moves) - 1
+    for depth in metrics['depths']:
+        assert depth['branching'] == (depth['generated'] / depth['expanded'] if depth['expanded'] else None)
+
+def test_sliced_search_counts_like_a_single_search(tmp_path, monkeypatch):
+    single = Solver(metrics=True).solve(UNSOLVABLE, 'depth').metrics
+    #The search of a checkpointed solve runs in slices of 100 boards, and every slice goes on with the counters of the ones before it.
+    monkeypatch.setattr(PegSolitaireSolver, 'CHECKPOINT_NODES', 100)
+    sliced = Solver(metrics=True, checkpoint=str(tmp_path / 'solve.ckpt')).solve(UNSOLVABLE, 'depth').metrics
+    assert single['nodesExpanded'] > 1000
+    for key in ('nodesExpanded', 'childrenGenerated', 'duplicateHits', 'maxDepth', 'orderingCalls'):
+        assert sliced[key] == single[key]
+    assert [(d['depth'], d['expanded'], d['generated']) for d in sliced['depths']] == [(d['depth'], d['expanded'], d['generated']) for d in single['depths']]
+
+def test_no_counters_without_metrics():
+    assert Solver().solve(UNSOLVABLE, 'depth').metrics is None
+
+def test_progress_lines():
+    stream = io.StringIO()
+    metrics = SearchMetrics(progressEvery=0, stream=stream)
+    metrics.grow(3)
+    metrics.expanded[3] += 5
+    metrics.tick(3, [])
+    assert stream.getvalue().startswith("[") and "5 nodes" in stream.getvalue() and "depth 3 (max 3)" in stream.getvalue()
+    quiet = io.StringIO()
+    SearchMetrics(stream=quiet).tick(3, [])
+    assert quiet.getvalue() == ""
+
+def test_cli_writes_the_counters(tmp_path):
+    output = tmp_path / 'solution.txt'
+    summary = tmp_path / 'metrics.json'
+    subprocess.run([sys.executable, os.path.join(ROOT, 'PegSolitaireSolver.py'), 'depth', os.path.join(BOARDS, 'cross.txt'), str(output),
+                    '--metrics', str(summary)], check=True, capture_output=True)
+    with open(summary) as f:
+        counters = json.load(f)
+    assert counters['status'] == 'solved'
+    assert counters['search']['nodesExpanded'] == counters['memory']['misses']
@@ -0,0 +1,23 @@
+import os
+from BitBoard import Board
+from MoveOrdering import MoveTable, trainBoard, saveTables, loadTables
+from conftest import BOARDS
+
+def corpusBoard(name):
+    return Board.fromFile(os.path.join(BOARDS, name))
+
+def test_move_ordering_round_trip(tmp_path):
+    tables = {}
+    for name in ['cross.txt', 'pointer.txt', 'english.txt']:
+        board = corpusBoard(name)
+        table = tables[board.layout()] = MoveTable(board.geometry())
+        assert trainBoard(board, table, ['depth', 'area'], 3, 20000) > 0
+        table.finish()
+    path = str(tmp_path / 'ordering.bin')
+    saveTables(path, tables)
+    loaded = loadTables(path)
+    assert sorted(loaded) == sorted(tables)
+    for layout, table in tables.items():
+        assert loaded[layout].counters() == table.counters()
+        assert loaded[layout].checksum == table.checksum
+        assert loaded[layout].killers == table.killers
@@ -0,0 +1,54 @@
+import multiprocessing
+import os
+import time
+import pytest
+from BitBoard import Board
+from PegSolitaireSolver import Solver, Limits
+from Portfolio import portfolio_solver, loadRanking, shapeKey
+from conftest import BOARDS
+
+'''
+A Solver whose rating strategy never finishes and whose manhattan strategy dies like a process killed by a signal, so the race has a known winner.
+'''
+
+class RaceSolver(Solver):
+    def solve(self, board, strategy='area', limits=None):
+        if strategy == 'rating':
+            time.sleep(60)
+        if strategy == 'manhattan':
+            os._exit(9)
+        return Solver.solve(self, board, strategy, limits)
+
+def crossBoard():
+    return Board.fromFile(os.path.join(BOARDS, 'cross.txt'))
+
+def test_winner_is_recorded_and_the_others_are_killed(tmp_path):
+    ranking = str(tmp_path / 'ranking.json')
+    board = crossBoard()
+    start = time.time()
+    result, winner, order = portfolio_solver(RaceSolver(), board, ['rating', 'depth'], ranking=ranking)
+    assert time.time() - start < 30
+    assert (result.status, winner, order) == ('solved', 'depth', ['rating', 'depth'])
+    assert not multiprocessing.active_children()
+    assert loadRanking(ranking) == {shapeKey(board): {'depth': 1}}
+    #The ranking starts the winner first in the next race.
+    result, winner, order = portfolio_solver(RaceSolver(), board, ['rating', 'depth'], ranking=ranking)
+    assert (winner, order) == ('depth', ['depth', 'rating'])
+    assert loadRanking(ranking) == {shapeKey(board): {'depth': 2}}
+
+def test_dead_process_does_not_stop_the_race():
+    result, winner, order = portfolio_solver(RaceSolver(), crossBoard(), ['manhattan', 'area'], stagger=0.5)
+    assert (result.status, winner) == ('solved', 'area')
+
+def test_race_fails_when_every_process_dies():
+    with pytest.raises(RuntimeError):
+        portfolio_solver(RaceSolver(), crossBoard(), ['manhattan'])
+
+def test_repeated_strategies_are_rejected():
+    board = Board.fromFile(os.path.join(BOARDS, 'asymmetrical.txt'))
+    with pytest.raises(ValueError):
+        portfolio_solver(Solver(), board, ['depth', 'depth'], Limits(maxNodes=50))
+
+def test_disk_search_is_rejected(tmp_path):
+    with pytest.raises(ValueError):
+        portfolio_solver(Solver(disk=str(tmp_path)), crossBoard(), ['depth', 'area'])
@@ -0,0 +1,50 @@
+import os
+import pytest
+from BitBoard import Board, pegCount
+from PegSolitaireSolver import Solver
+from Pruning import Pruner, PRUNE_RULES
+from SolutionVerifier import readProblem, verifySolution
+from conftest import BOARDS
+
+'''
+This function finds whether every board that can be reached from a starting board can be solved, by searching all of them.
+
+Output: Dictionary of the reachable boards (pegs --> True if a single peg can be left).
+'''
+
+def solvableBoards(geometry, pegs):
+    solvable = {}
+    def solve(pegs):
+        if pegs not in solvable:
+            solvable[pegs] = pegCount(pegs) == 1
+            for k in geometry.legalJumps(pegs):
+                if solve(pegs ^ geometry.jumps[k][2]):
+                    solvable[pegs] = True
+        return solvable[pegs]
+    solve(pegs)
+    return solvable
+
+@pytest.mark.parametrize('name', ['cross.txt', 'flag.txt', 'pointer.txt', 'triangular.txt'])
+def test_solvable_boards_are_never_pruned(name):
+    board = Board.fromFile(os.path.join(BOARDS, name))
+    geometry = board.geometry()
+    pruner = Pruner(geometry, board.pegs)
+    solvable = solvableBoards(geometry, board.pegs)
+    assert not [pegs for pegs, result in solvable.items() if result and pruner.prune(pegs)]
+    #The rules are sound but not complete: they cut some of the boards that cannot be solved.
+    unsolvable = [pegs for pegs, result in solvable.items() if not result]
+    assert sum(pruner.prune(pegs) for pegs in unsolvable) > 0
+    assert sum(pruner.prunes[rule] for rule in PRUNE_RULES) > 0
+
+def test_board_without_feasible_final_hole_is_pruned():
+    board = Board(3, 5, 0x7fff, 0b11011)
+    assert Pruner(board.geometry(), board.pegs).prune(board.pegs)
+
+@pytest.mark.parametrize('name', ['cross.txt', 'pointer.txt', 'english.txt'])
+@pytest.mark.parametrize('strategy', ['depth', 'area'])
+def test_pruned_solves_are_valid(name, strategy):
+    path = os.path.join(BOARDS, name)
+    result = Solver(prune=True).solve(Board.fromFile(path), strategy)
+    assert result.status == 'solved'
+    with open(path) as f:
+        assert verifySolution(readProblem(f), result.moves) == (True, None, None)
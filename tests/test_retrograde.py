@@ -0,0 +1,25 @@
+import os
+import pytest
+from BitBoard import Board
+from PegSolitaireSolver import Solver
+from SolutionVerifier import readProblem, verifySolution
+from conftest import BOARDS
+
+def lastHole(moves):
+    line, column = moves[-1].split()[2:]
+    return int(line) - 1, int(column) - 1
+
+@pytest.mark.parametrize('name', ['cross.txt', 'pointer.txt', 'english.txt'])
+def test_retrograde_search_solves(name):
+    path = os.path.join(BOARDS, name)
+    result = Solver(retrograde=4).solve(Board.fromFile(path), 'depth')
+    assert result.status == 'solved'
+    with open(path) as f:
+        assert verifySolution(readProblem(f), result.moves) == (True, None, None)
+
+def test_target_hole():
+    board = Board.fromFile(os.path.join(BOARDS, 'english.txt'))
+    #Only some holes can hold the last peg of the English board: the centre is one of them and (2, 2) is not.
+    result = Solver(retrograde=4, target=(3, 3)).solve(board, 'depth')
+    assert result.status == 'solved' and lastHole(result.moves) == (3, 3)
+    assert Solver(retrograde=4, target=(2, 2)).solve(board, 'depth').status == 'unsolvable'
@@ -0,0 +1,43 @@
+import os
+import pytest
+from BitBoard import Board, pegCount
+from PegSolitaireSolver import Solver, Limits
+from SolutionVerifier import readProblem, verifySolution
+from conftest import BOARDS
+
+#Small boards of the corpus that every search mode solves in a fraction of a second.
+PROBLEMS = ['cross.txt', 'pointer.txt']
+
+#The strategies each search mode orders its moves with. The heuristic searches need a heuristic, so they do not take depth.
+MODES = [('backtracking', strategy) for strategy in ('depth', 'area', 'manhattan', 'rating')] + \
+        [(search, strategy) for search in ('best-first', 'astar', 'ida') for strategy in ('area', 'manhattan', 'rating')]
+
+def solveAndVerify(name, solver, strategy):
+    path = os.path.join(BOARDS, name)
+    result = solver.solve(Board.fromFile(path), strategy)
+    assert result.status == 'solved'
+    with open(path) as f:
+        problem = readProblem(f)
+    assert verifySolution(problem, result.moves) == (True, None, None)
+    return result
+
+@pytest.mark.parametrize('name', PROBLEMS)
+@pytest.mark.parametrize('search,strategy', MODES)
+def test_search_modes(name, search, strategy):
+    solveAndVerify(name, Solver(search=search), strategy)
+
+@pytest.mark.parametrize('search', ['best-first', 'astar'])
+def test_frontier_cap_bounds_the_boards_stored(search):
+    board = Board.fromFile(os.path.join(BOARDS, 'german.txt'))
+    free = Solver(search=search).solve(board, 'area', Limits(maxNodes=30000))
+    capped = Solver(search=search, frontierCap=50).solve(board, 'area', Limits(maxNodes=30000))
+    #The queue holds at most 50 boards and the parents at most twice 50 times the pegs, plus the children of the last board that was expanded.
+    assert capped.stats['size'] <= 2 * 50 * pegCount(board.pegs) + len(board.geometry().jumps)
+    assert capped.stats['size'] < free.stats['size'] // 4
+
+def test_ida_memory_is_the_size_of_its_table():
+    board = Board.fromFile(os.path.join(BOARDS, 'pointer.txt'))
+    result = Solver(search='ida').solve(board, 'area', Limits(memoryCap=64))
+    assert result.status == 'solved'
+    assert result.stats['slots'] == 64 and result.stats['size'] <= 64
+    assert len(result.stats['iterations']) >= 1
@@ -0,0 +1,80 @@
+import multiprocessing
+import os
+import random
+import pytest
+from BitBoard import Board
+from PegSolitaireSolver import Solver
+from SolutionVerifier import readProblem, verifySolution
+from TranspositionTable import SharedTranspositionTable
+from conftest import BOARDS
+
+def randomKeys(count, bits, seed=1):
+    generator = random.Random(seed)
+    return list({generator.getrandbits(bits) | 1 for key in range(count)})
+
+@pytest.fixture
+def shared():
+    tables = []
+    def make(*args, **kwargs):
+        tables.append(SharedTranspositionTable(*args, **kwargs))
+        return tables[-1]
+    yield make
+    for table in tables:
+        table.close(unlink=True)
+
+@pytest.mark.parametrize('cells', [49, 81, 200], ids=['1 word', '2 words', '4 words'])
+def test_stored_keys_are_found(shared, cells):
+    table = shared(4096, cells)
+    keys = randomKeys(1000, cells)
+    for key in keys:
+        assert not table.lookup(key)
+        table.store(key)
+    assert all(table.lookup(key) for key in keys)
+    assert len(table) == len(keys) and table.overflows == 0
+
+def test_full_partitions_overflow_to_the_local_table(shared):
+    table = shared(64, 49, partitions=4)
+    keys = randomKeys(200, 49)
+    for key in keys:
+        table.store(key)
+    #Every stripe stops at 90% of its slots and the rest of its keys go to the overflow table, where they are still found.
+    assert all(table.slots[partition] == table.maxLoad for partition in range(table.partitions))
+    assert len(table) == table.partitions * table.maxLoad
+    assert table.overflows == len(keys) - len(table) == len(table.overflow)
+    assert all(table.lookup(key) for key in keys)
+    assert table.stats()['size'] == len(keys)
+
+def test_overflow_table_evicts_when_it_is_limited(shared):
+    table = shared(64, 49, overflowCap=10, partitions=4)
+    keys = randomKeys(200, 49)
+    for key in keys:
+        table.store(key)
+    assert len(table.overflow) == 10
+    assert table.stats()['evictions'] == table.overflows - 10
+
+def storeKeys(table, keys):
+    for key in keys:
+        table.store(key)
+
+def test_workers_share_their_keys(shared):
+    table = shared(1 << 14, 81, partitions=8)
+    keys = randomKeys(4000, 81)
+    #The workers store overlapping halves of the keys at the same time, so they race on the same stripes.
+    workers = [multiprocessing.Process(target=storeKeys, args=(table, keys[start:start + 3000])) for start in (0, 1000)]
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+    assert all(worker.exitcode == 0 for worker in workers)
+    #Each key was stored once, in the shared table, and is seen by this process too.
+    assert len(table) == len(keys)
+    assert all(table.lookup(key) for key in keys)
+
+@pytest.mark.parametrize('name', ['cross.txt', 'pointer.txt', 'english.txt'])
+@pytest.mark.parametrize('sharedTable', [None, 1 << 12], ids=['separate', 'shared'])
+def test_parallel_solves_are_valid(name, sharedTable):
+    path = os.path.join(BOARDS, name)
+    result = Solver(workers=2, frontierDepth=2, sharedTable=sharedTable).solve(Board.fromFile(path), 'depth')
+    assert result.status == 'solved'
+    with open(path) as f:
+        assert verifySolution(readProblem(f), result.moves) == (True, None, None)
@@ -0,0 +1,64 @@
+import os
+import pytest
+from BitBoard import Board, boardLines
+from PegSolitaireSolver import Solver
+from SolutionCache import SolutionCache
+from SolutionVerifier import readProblem, verifySolution
+from conftest import BOARDS
+
+'''
+This function returns the English board with its hole moved off the axes and the diagonals, so that it has eight different images, and its images under the
+symmetries of the layout.
+'''
+
+def orientedBoards():
+    board = Board.fromFile(os.path.join(BOARDS, 'english.txt'))
+    centre = 3*7 + 3
+    board = Board(board.lines, board.columns, board.holes, (board.pegs | 1 << centre) & ~(1 << (1*7 + 2)))
+    images = [board]
+    for name, permutation in board.geometry().symmetries:
+        images.append(Board(board.lines, board.columns, board.holes, sum(1 << permutation[cell] for cell in permutation if board.pegs >> cell & 1)))
+    return images
+
+def isValid(board, moves):
+    return verifySolution(readProblem(boardLines(board)), moves) == (True, None, None)
+
+def test_solution_is_found_for_every_orientation(tmp_path):
+    path = str(tmp_path / 'cache.db')
+    boards = orientedBoards()
+    assert len(set(boards)) == 8
+    first = Solver(symmetry=True, cache=SolutionCache(path)).solve(boards[0], 'depth')
+    assert first.status == 'solved' and isValid(boards[0], first.moves)
+    #A new cache object reads the positions back from the file, and every image of the board is answered from the stored solution.
+    solver = Solver(symmetry=True, cache=SolutionCache(path))
+    for board in boards:
+        result = solver.solve(board, 'depth')
+        assert result.status == 'solved' and result.stats['cacheHits'] >= 1
+        assert result.stats['misses'] == 0
+        assert isValid(board, result.moves)
+
+def test_later_board_of_a_solution_is_a_hit(tmp_path):
+    cache = SolutionCache(str(tmp_path / 'cache.db'))
+    board = orientedBoards()[0]
+    solver = Solver(cache=cache)
+    first = solver.solve(board, 'depth')
+    #The board after the first two moves of the solution was stored with the rest of the moves.
+    geometry = board.geometry()
+    jumpIds = {move: k for k, move in enumerate(geometry.jumpMoves)}
+    pegs = board.pegs
+    for move in first.moves[:2]:
+        pegs ^= geometry.jumps[jumpIds[move]][2]
+    later = Board(board.lines, board.columns, board.holes, pegs)
+    result = solver.solve(later, 'depth')
+    assert result.stats['cacheHits'] == 1
+    assert result.moves == first.moves[2:]
+
+def test_only_proofs_are_cached(tmp_path):
+    board = Board(3, 5, 0x7fff, 0b11011)
+    path = str(tmp_path / 'cache.db')
+    assert Solver(cache=SolutionCache(path)).solve(board, 'depth').status == 'exhausted'
+    assert len(SolutionCache(path)) == 0
+    assert Solver(prune=True, cache=SolutionCache(path)).solve(board, 'depth').status == 'unsolvable'
+    #The proof is used by a solver without the pruning rules too.
+    result = Solver(cache=SolutionCache(path)).solve(board, 'depth')
+    assert result.status == 'unsolvable' and result.stats['cacheHits'] == 1
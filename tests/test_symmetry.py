@@ -0,0 +1,47 @@
+import os
+import random
+import pytest
+from BitBoard import Board
+from PegSolitaireSolver import Solver
+from SolutionVerifier import readProblem, verifySolution
+from conftest import BOARDS
+
+'''
+This function applies a symmetry to a board one cell at a time, the slow way canonical does not use.
+'''
+
+def transform(permutation, pegs):
+    return sum(1 << image for cell, image in permutation.items() if pegs >> cell & 1)
+
+def randomBoards(geometry, count):
+    generator = random.Random(geometry.holes)
+    cells = geometry.pegCells(geometry.holes)
+    return [sum(1 << cell for cell in cells if generator.random() < 0.6) for board in range(count)]
+
+@pytest.mark.parametrize('name', ['english.txt', 'french.txt', 'german.txt', 'square6x6.txt'])
+def test_square_layouts_have_all_symmetries(name):
+    geometry = Board.fromFile(os.path.join(BOARDS, name)).geometry()
+    assert sorted(symmetry for symmetry, permutation in geometry.symmetries) == \
+           sorted(['mirror-lines', 'mirror-columns', 'rotate-180', 'transpose', 'anti-transpose', 'rotate-90', 'rotate-270'])
+
+@pytest.mark.parametrize('name', ['english.txt', 'french.txt', 'german.txt', 'diamond.txt', 'square6x6.txt', 'asymmetrical.txt'])
+def test_canonical_is_the_same_for_every_symmetry(name):
+    geometry = Board.fromFile(os.path.join(BOARDS, name)).geometry()
+    geometry.enableSymmetries()
+    for pegs in randomBoards(geometry, 200):
+        images = [pegs] + [transform(permutation, pegs) for symmetry, permutation in geometry.symmetries]
+        assert geometry.canonical(pegs) == min(images)
+        assert all(geometry.canonical(image) == min(images) for image in images)
+
+def test_canonical_without_symmetries_is_the_board():
+    geometry = Board.fromFile(os.path.join(BOARDS, 'english.txt')).geometry()
+    for pegs in randomBoards(geometry, 20):
+        assert geometry.canonical(pegs) == pegs
+
+@pytest.mark.parametrize('name', ['cross.txt', 'pointer.txt', 'english.txt'])
+def test_solutions_with_symmetries_are_valid(name):
+    path = os.path.join(BOARDS, name)
+    result = Solver(symmetry=True).solve(Board.fromFile(path), 'depth')
+    assert result.status == 'solved'
+    with open(path) as f:
+        assert verifySolution(readProblem(f), result.moves) == (True, None, None)